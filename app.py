@@ -1,132 +1,295 @@
-from flask import Flask, render_template, request
-from INF1002_Stock_Market_Trend_Analysis.src.analysis.data_fetcher import data_fetcher
-from INF1002_Stock_Market_Trend_Analysis.src.analysis.simple_moving_average import simple_moving_average
-from INF1002_Stock_Market_Trend_Analysis.src.analysis.daily_returns import daily_returns
-from INF1002_Stock_Market_Trend_Analysis.src.analysis.up_down_runs import calculate_directions, calculate_runs, analyze_runs
-from INF1002_Stock_Market_Trend_Analysis.src.analysis.max_profit import max_profit
-from INF1002_Stock_Market_Trend_Analysis.src.analysis.volatility import analyze_volatility
-from INF1002_Stock_Market_Trend_Analysis.src.visualization.create_price_sma_chart import create_price_sma_chart
-from INF1002_Stock_Market_Trend_Analysis.src.visualization.create_price_chart import create_price_chart
-from INF1002_Stock_Market_Trend_Analysis.src.visualization.create_run_statistics_chart import create_run_statistics_chart
-from INF1002_Stock_Market_Trend_Analysis.src.visualization.create_volatility_chart import create_volatility_chart
+import json
+import os
+import plotly
+from flask import Flask, Response, jsonify, request
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.price_providers import create_provider, set_provider
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.result_cache import get_result_cache
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.memo_cache import get_memo_cache, content_hash
+from INF1002_Stock_Market_Trend_Analysis.src.pipeline import (CHART_VERSION, CHARTS, analysis_figures, cached_analysis,
+                                                              data_key, fetch_data, range_data)
+from INF1002_Stock_Market_Trend_Analysis.src.visualization.downsampling import DEFAULT_POINT_BUDGET
+from INF1002_Stock_Market_Trend_Analysis.src.http_caching import compress_response, negotiate_encoding, is_not_modified
 
 app = Flask(__name__)
 
+# Price backend: 'yfinance' (default), 'local' (directory of CSV/Parquet files) or 'synthetic'
+app.config["PRICE_PROVIDER"] = os.environ.get("PRICE_PROVIDER", "yfinance")
+app.config["PRICE_DATA_DIR"] = os.environ.get("PRICE_DATA_DIR")
+set_provider(create_provider(app.config["PRICE_PROVIDER"], data_dir=app.config["PRICE_DATA_DIR"]))
+
+# How long browsers and proxies may reuse an analysis page or API response before revalidating
+app.config["PAGE_MAX_AGE"] = int(os.environ.get("PAGE_MAX_AGE", 60))
+
+# Part of every ETag, so they change when the page template, the Plotly version,
+# the chart output (CHART_VERSION) or the point budget (CHART_POINT_BUDGET) does
+with open(os.path.join(app.root_path, "templates", "index.html"), "rb") as template:
+    ETAG_SALT = content_hash(template.read(), plotly.__version__, CHART_VERSION, DEFAULT_POINT_BUDGET)
+
+
+def analysis_arguments(symbol, date_mode, period, start_date, end_date, sma_short, sma_medium, sma_long):
+    """
+    Validate the analysis form fields.
+
+    Returns:
+        dict: symbol, period or start_date/end_date, and sma_windows, ready for cached_analysis
+
+    Raises:
+        ValueError: With a message for the user when a field is missing or invalid
+    """
+    if not symbol:
+        raise ValueError("Stock symbol is required")
+
+    if date_mode == "period":
+        if not period:
+            raise ValueError("Period is required")
+    else:
+        if not start_date or not end_date:
+            raise ValueError("Both start and end dates are required")
+        if start_date >= end_date:
+            raise ValueError("Start date must be before end date")
+
+    if not sma_short or not sma_medium or not sma_long:
+        raise ValueError("All SMA windows are required")
+
+    sma_short_int = int(sma_short)
+    sma_medium_int = int(sma_medium)
+    sma_long_int = int(sma_long)
+
+    if sma_short_int <= 0 or sma_medium_int <= 0 or sma_long_int <= 0:
+        raise ValueError("SMA windows must be positive numbers")
+
+    if not (sma_short_int < sma_medium_int < sma_long_int):
+        raise ValueError("SMA windows must be in ascending order (Short < Medium < Long)")
+
+    sma_windows = (sma_short_int, sma_medium_int, sma_long_int)
+    if date_mode == "period":
+        return dict(symbol=symbol, period=period, sma_windows=sma_windows)
+    return dict(symbol=symbol, start_date=start_date, end_date=end_date, sma_windows=sma_windows)
+
+
+def request_arguments(values):
+    """
+    Read and validate the analysis fields of a request (form or query string).
+    """
+    return analysis_arguments(values.get("symbol", "").upper(), values.get("date_mode", "period"),
+                              values.get("period", "").lower(), values.get("start_date", ""),
+                              values.get("end_date", ""), values.get("sma_short", ""),
+                              values.get("sma_medium", ""), values.get("sma_long", ""))
+
+
+def request_etag(endpoint, values, version):
+    """
+    Strong ETag of an analysis response: the endpoint, every request field
+    and the version of the price data the response is built from.
+    """
+    return content_hash(ETAG_SALT, endpoint, sorted(values.items(multi=True)), version)
+
+
+def data_window(arguments):
+    # The fetch_data arguments of an analysis request
+    return dict(period=arguments.get('period'), start_date=arguments.get('start_date'),
+                end_date=arguments.get('end_date'))
+
+
+def cacheable(response, etag):
+    """
+    Mark a GET response as shareable by browsers and reverse proxies, with its ETag.
+    """
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config["PAGE_MAX_AGE"]
+    return response
+
+
+def not_modified(etag):
+    return cacheable(Response(status=304), etag)
+
+
+# The view steps below are shared with asgi.py, whose views differ only in
+# awaiting the price download
+
+# Form fields of the analysis page, with their defaults
+FORM_FIELDS = {"symbol": "", "date_mode": "period", "period": "", "start_date": "", "end_date": "",
+               "sma_short": "", "sma_medium": "", "sma_long": ""}
+
+
+def form_fields(values):
+    """
+    The analysis form fields of a request (form or query string), for
+    analysis_arguments and for filling the form in again.
+    """
+    fields = {name: values.get(name, default) for name, default in FORM_FIELDS.items()}
+    fields.update(symbol=fields["symbol"].upper(), period=fields["period"].lower())
+    return fields
+
+
+def page_charts(arguments, data):
+    """
+    The chart fragments of the analysis page for already fetched data, from
+    the result cache (see cached_analysis).
+    """
+    return cached_analysis(**arguments, data=data)
+
+
+def page_error(error):
+    # The message shown on the page: ValueErrors are the user's input, anything else is ours
+    if isinstance(error, ValueError):
+        return str(error)
+    print(f"Error: {str(error)}")
+    return f"An error occurred: {str(error)}"
+
+
+def index_page(fields, charts=None, error_message=None, etag=None):
+    """
+    Render the analysis page with the form filled in from fields. Rendered
+    from the Jinja environment directly, so asgi.py can use it outside a
+    Flask request.
+    """
+    charts = charts or {f"{name}_chart_html": None for name in CHARTS}
+    page = app.jinja_env.get_template("index.html").render(**charts, **fields, error_message=error_message)
+    response = Response(page, mimetype="text/html")
+    return cacheable(response, etag) if etag else response
+
+
+def api_etag(name, values, data):
+    # ETag of /api/analysis (name None) or /api/chart/<name>
+    return request_etag(f"chart/{name}" if name else "analysis", values, data_key(data))
+
+
+def api_response(arguments, data, name=None):
+    """
+    The figure JSON of /api/analysis (name None) or /api/chart/<name> for already fetched data.
+    """
+    if name is not None:
+        return Response(analysis_figures(**arguments, names=[name], data=data)[name], mimetype="application/json")
+    return figures_response(analysis_figures(**arguments, data=data), arguments['symbol'])
+
+
+def json_response(value, status=200):
+    return Response(json.dumps(value), status=status, mimetype="application/json")
+
+
+def error_response(error):
+    # ValueErrors are the user's input, anything else is ours
+    if isinstance(error, ValueError):
+        return json_response({"error": str(error)}, 400)
+    print(f"Error: {str(error)}")
+    return json_response({"error": f"An error occurred: {str(error)}"}, 500)
+
+
+def figures_response(figures, symbol):
+    # The figure JSON strings are spliced in as is rather than parsed and re-encoded
+    charts = ",".join(f"{json.dumps(name)}:{figure}" for name, figure in figures.items())
+    return Response(f'{{"symbol":{json.dumps(symbol)},"charts":{{{charts}}}}}', mimetype="application/json")
+
+
+@app.after_request
+def compress(response):
+    return compress_response(response, negotiate_encoding(request.accept_encodings))
+
+
 @app.route("/", methods=["GET", "POST"])
 def index():
-    price_sma_chart_html = None
-    price_chart_html = None
-    run_statistics_chart_html = None
-    volatility_chart_html = None
-    symbol = ""
-    period = ""
-    start_date = ""
-    end_date = ""
-    date_mode = "period"
-    sma_short = ""
-    sma_medium = ""
-    sma_long = ""
+    fields = dict(FORM_FIELDS)
+    charts = None
     error_message = None
+    etag = None
 
-    if request.method == "POST":
-        symbol = request.form.get("symbol", "").upper()
-        date_mode = request.form.get("date_mode", "period")
-        period = request.form.get("period", "").lower()
-        start_date = request.form.get("start_date", "")
-        end_date = request.form.get("end_date", "")
-        sma_short = request.form.get("sma_short", "")
-        sma_medium = request.form.get("sma_medium", "")
-        sma_long = request.form.get("sma_long", "")
+    # GET with a query string is a permalink to the same analysis as the POSTed form
+    if request.method == "POST" or "symbol" in request.args:
+        fields = form_fields(request.values)
 
         try:
-            if not symbol:
-                raise ValueError("Stock symbol is required")
-            
-            if date_mode == "period":
-                if not period:
-                    raise ValueError("Period is required")
-            else:
-                if not start_date or not end_date:
-                    raise ValueError("Both start and end dates are required")
-                if start_date >= end_date:
-                    raise ValueError("Start date must be before end date")
-            
-            if not sma_short or not sma_medium or not sma_long:
-                raise ValueError("All SMA windows are required")
-            
-            sma_short_int = int(sma_short)
-            sma_medium_int = int(sma_medium)
-            sma_long_int = int(sma_long)
-            
-            if sma_short_int <= 0 or sma_medium_int <= 0 or sma_long_int <= 0:
-                raise ValueError("SMA windows must be positive numbers")
-            
-            if not (sma_short_int < sma_medium_int < sma_long_int):
-                raise ValueError("SMA windows must be in ascending order (Short < Medium < Long)")
-            
-           
-            if date_mode == "period":
-                data = data_fetcher(symbol, period=period)
-            else:
-                data = data_fetcher(symbol, start_date=start_date, end_date=end_date)
-            
-            if data is None or data.empty:
-                raise ValueError(f"No data found for symbol {symbol}")
-            
-            
-            closing_prices = data["Close"].tolist()
-            dates = data.index.strftime("%Y-%m-%d").tolist()
-            returns = daily_returns(closing_prices)
-            directions = calculate_directions(returns)
-            runs = calculate_runs(directions)
-            run_stats = analyze_runs(runs)
-            max_profit_data = max_profit(data)
-            volatility = analyze_volatility(returns)
-            
-            max_window = max(sma_short_int, sma_medium_int, sma_long_int)
-            if max_window > len(closing_prices):
-                raise ValueError(f"Largest SMA window ({max_window}) cannot be larger than data length ({len(closing_prices)})")
-            
-            sma_short_values = simple_moving_average(closing_prices, sma_short_int)
-            sma_medium_values = simple_moving_average(closing_prices, sma_medium_int)
-            sma_long_values = simple_moving_average(closing_prices, sma_long_int)
-            
-            sma_short_padded = [None] * (sma_short_int - 1) + sma_short_values
-            sma_medium_padded = [None] * (sma_medium_int - 1) + sma_medium_values
-            sma_long_padded = [None] * (sma_long_int - 1) + sma_long_values
-            
-            sma_data = {
-                'short': {'values': sma_short_padded, 'period': sma_short_int},
-                'medium': {'values': sma_medium_padded, 'period': sma_medium_int},
-                'long': {'values': sma_long_padded, 'period': sma_long_int}
-            }
-            
-            price_chart_html = create_price_chart(dates, closing_prices, returns, runs, symbol, max_profit_data)
-            price_sma_chart_html = create_price_sma_chart(dates, closing_prices, sma_data, symbol)            
-            run_statistics_chart_html = create_run_statistics_chart(dates, runs, run_stats)
-            volatility_chart_html = create_volatility_chart(dates, returns, volatility)
-            
-            
-        except ValueError as ve:
-            error_message = str(ve)
+            arguments = analysis_arguments(**fields)
+
+            # Fetched once: the ETag and the charts are built from the same data
+            data = fetch_data(arguments['symbol'], **data_window(arguments))
+            if request.method == "GET":
+                etag = request_etag("index", request.args, data_key(data))
+                if is_not_modified(request.if_none_match, etag):
+                    return not_modified(etag)
+
+            charts = page_charts(arguments, data)
         except Exception as e:
-            error_message = f"An error occurred: {str(e)}"
-            print(f"Error: {str(e)}")
-
-    return render_template("index.html",
-                           price_sma_chart_html=price_sma_chart_html,
-                           price_chart_html=price_chart_html,
-                           run_statistics_chart_html=run_statistics_chart_html,
-                           volatility_chart_html=volatility_chart_html,
-                           symbol=symbol,
-                           period=period,
-                           start_date=start_date,
-                           end_date=end_date,
-                           date_mode=date_mode,
-                           sma_short=sma_short,
-                           sma_medium=sma_medium,
-                           sma_long=sma_long,
-                           error_message=error_message)
+            error_message = page_error(e)
+
+    return index_page(fields, charts, error_message, etag)
+
+
+def range_arguments(values):
+    """
+    Read the range_data arguments from the query string of a zoom/pan refetch.
+
+    Raises:
+        ValueError: If points or the SMA windows aren't integers
+    """
+    try:
+        points = int(values["points"]) if values.get("points") else None
+        sma_windows = tuple(int(window) for window in values["sma"].split(",")) if values.get("sma") else None
+    except ValueError:
+        raise ValueError("points and sma must be integers")
+
+    return {
+        'start': values.get("start"),
+        'end': values.get("end"),
+        'points': points,
+        'view': values.get("view") or None,
+        'since': values.get("since") or None,
+        'until': values.get("until") or None,
+        'sma_windows': sma_windows,
+    }
+
+
+@app.route("/api/range/<symbol>")
+def range_slice(symbol):
+    """
+    Closing prices for the visible x-range of a chart, at the resolution that
+    fits ?points= (default CHART_POINT_BUDGET), for zoom/pan refetches. With
+    ?view=runs or ?view=sma it also returns that chart's traces for the range.
+    """
+    try:
+        return jsonify(range_data(symbol.upper(), **range_arguments(request.args)))
+    except Exception as e:
+        return error_response(e)
+
+
+@app.route("/api/analysis")
+def analysis_api():
+    """
+    All four dashboard charts as Plotly figure JSON, for the page to draw with
+    Plotly.react. Takes the same fields as the form, as query parameters.
+    """
+    return api_view()
+
+
+@app.route("/api/chart/<name>")
+def chart_api(name):
+    """
+    One dashboard chart as Plotly figure JSON, so charts can be loaded lazily.
+    """
+    if name not in CHARTS:
+        return json_response({"error": f"Unknown chart: {name}"}, 404)
+
+    return api_view(name)
+
+
+def api_view(name=None):
+    # /api/analysis and /api/chart/<name>
+    try:
+        arguments = request_arguments(request.args)
+        data = fetch_data(arguments['symbol'], **data_window(arguments))
+        etag = api_etag(name, request.args, data)
+        if is_not_modified(request.if_none_match, etag):
+            return not_modified(etag)
+
+        return cacheable(api_response(arguments, data, name), etag)
+    except Exception as e:
+        return error_response(e)
+
+
+@app.route("/cache/stats")
+def cache_stats():
+    return jsonify(dict(get_result_cache().stats(), memo=get_memo_cache().stats()))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,226 @@
+"""
+ASGI entry point serving the same pages and API as app.py without blocking
+on upstream downloads.
+
+Price downloads are awaited (the yfinance provider talks to the Yahoo chart
+API over asyncio streams, see yahoo_chart.py), and the CPU-bound analysis
+and chart rendering run on a thread pool, so one process keeps hundreds of
+requests in flight while Yahoo responds. Run it with any ASGI server, e.g.:
+    uvicorn INF1002_Stock_Market_Trend_Analysis.asgi:app --port 5000
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import parse_qsl, unquote
+
+from werkzeug.datastructures import Headers, MultiDict
+from werkzeug.http import parse_accept_header, parse_etags
+
+from INF1002_Stock_Market_Trend_Analysis.app import (FORM_FIELDS, analysis_arguments, request_arguments,
+                                                     range_arguments, request_etag, cacheable, not_modified,
+                                                     data_window, form_fields, page_charts, page_error, index_page,
+                                                     api_etag, api_response, json_response, error_response)
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.result_cache import get_result_cache
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.memo_cache import get_memo_cache
+from INF1002_Stock_Market_Trend_Analysis.src.http_caching import compress_response, negotiate_encoding, is_not_modified
+from INF1002_Stock_Market_Trend_Analysis.src.pipeline import (CHARTS, data_key, fetch_data_async, range_data_async,
+                                                              shutdown_chart_executor)
+
+# Threads running analysis and rendering; downloads don't occupy them
+CPU_WORKERS = int(os.environ.get("ASGI_CPU_WORKERS", min(32, (os.cpu_count() or 1) + 4)))
+
+# Largest request body accepted (the form is a few hundred bytes)
+MAX_BODY_BYTES = 64 * 1024
+
+_executor = None
+
+
+def get_executor():
+    """
+    Return the thread pool for CPU-bound work, created on first use.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=CPU_WORKERS, thread_name_prefix="asgi-cpu")
+    return _executor
+
+
+async def run_cpu(function, *args, **kwargs):
+    """
+    Run a CPU-bound function on the executor and await its result.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), partial(function, *args, **kwargs))
+
+
+class Request:
+    """
+    The parts of an ASGI HTTP request the views use.
+    """
+
+    def __init__(self, scope, body=b""):
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.args = MultiDict(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True))
+        self.headers = Headers([(name.decode("latin-1"), value.decode("latin-1"))
+                                for name, value in scope.get("headers", [])])
+        self.form = MultiDict(parse_qsl(body.decode("utf-8"), keep_blank_values=True)) if body else MultiDict()
+        self.if_none_match = parse_etags(self.headers.get("If-None-Match"))
+        self.accept_encodings = parse_accept_header(self.headers.get("Accept-Encoding"))
+
+    @property
+    def values(self):
+        return self.form if self.method == "POST" else self.args
+
+
+async def index(request):
+    """
+    The analysis page, for GET permalinks and form POSTs, as in app.index.
+    """
+    fields = dict(FORM_FIELDS)
+    charts = None
+    error_message = None
+    etag = None
+
+    if request.method == "POST" or "symbol" in request.args:
+        fields = form_fields(request.values)
+
+        try:
+            arguments = analysis_arguments(**fields)
+            data = await fetch_data_async(arguments['symbol'], **data_window(arguments))
+            if request.method == "GET":
+                etag = request_etag("index", request.args, data_key(data))
+                if is_not_modified(request.if_none_match, etag):
+                    return not_modified(etag)
+
+            charts = await run_cpu(page_charts, arguments, data)
+        except Exception as e:
+            error_message = page_error(e)
+
+    return index_page(fields, charts, error_message, etag)
+
+
+async def analysis_api(request, name=None):
+    """
+    /api/analysis and /api/chart/<name>, as in app.api_view.
+    """
+    if name is not None and name not in CHARTS:
+        return json_response({"error": f"Unknown chart: {name}"}, 404)
+
+    try:
+        arguments = request_arguments(request.args)
+        data = await fetch_data_async(arguments['symbol'], **data_window(arguments))
+        etag = api_etag(name, request.args, data)
+        if is_not_modified(request.if_none_match, etag):
+            return not_modified(etag)
+
+        return cacheable(await run_cpu(api_response, arguments, data, name), etag)
+    except Exception as e:
+        return error_response(e)
+
+
+async def range_api(request, symbol):
+    """
+    /api/range/<symbol>, as in app.range_slice.
+    """
+    try:
+        return json_response(await range_data_async(symbol.upper(), **range_arguments(request.args),
+                                                    executor=get_executor()))
+    except Exception as e:
+        return error_response(e)
+
+
+async def cache_stats(request):
+    return json_response(dict(get_result_cache().stats(), memo=await run_cpu(get_memo_cache().stats)))
+
+
+async def dispatch(request):
+    """
+    Route a request to its view.
+
+    Returns:
+        Response
+    """
+    path = request.path
+    if path == "/":
+        if request.method not in ("GET", "HEAD", "POST"):
+            return json_response({"error": "Method not allowed"}, 405)
+        return await index(request)
+
+    if request.method not in ("GET", "HEAD"):
+        return json_response({"error": "Method not allowed"}, 405)
+
+    if path == "/api/analysis":
+        return await analysis_api(request)
+    if path.startswith("/api/chart/"):
+        return await analysis_api(request, unquote(path[len("/api/chart/"):]))
+    if path.startswith("/api/range/"):
+        return await range_api(request, unquote(path[len("/api/range/"):]))
+    if path == "/cache/stats":
+        return await cache_stats(request)
+
+    return json_response({"error": "Not found"}, 404)
+
+
+async def _read_body(receive):
+    body = b""
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        body += message.get("body", b"")
+        if len(body) > MAX_BODY_BYTES:
+            raise ValueError("Request body too large")
+        if not message.get("more_body"):
+            return body
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            shutdown_chart_executor()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    """
+    The ASGI 3 application.
+    """
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    try:
+        body = await _read_body(receive)
+    except ValueError as ve:
+        body, response = b"", json_response({"error": str(ve)}, 413)
+    else:
+        if body is None:
+            return
+        response = None
+
+    request = Request(scope, body)
+    if response is None:
+        try:
+            response = await dispatch(request)
+        except Exception as e:
+            response = error_response(e)
+
+    compress_response(response, negotiate_encoding(request.accept_encodings))
+
+    await send({
+        "type": "http.response.start",
+        "status": response.status_code,
+        "headers": [(name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in response.headers.items()],
+    })
+    await send({"type": "http.response.body", "body": b"" if request.method == "HEAD" else response.get_data()})
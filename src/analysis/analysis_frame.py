@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+
+class AnalysisFrame:
+    """
+    Compact, array-backed price history passed through the analysis pipeline.
+
+    Holds closing prices as one float64 (or float32) array, timestamps as
+    int64 nanoseconds since the epoch and a NaN mask, instead of the Python
+    lists of floats, None and date strings the pipeline used to build. Dates
+    are formatted once, on first use, and shared by every consumer.
+
+    np.asarray(frame) returns the closing prices, so array-based analysis
+    functions (daily_returns_array, moving_averages, ...) accept a frame as is.
+    """
+
+    __slots__ = ('symbol', 'timestamps', 'close', 'missing', 'tz', '_dates')
+
+    def __init__(self, timestamps, close, symbol=None, tz=None, dtype=np.float64):
+        """
+        Args:
+            timestamps: int64 epoch nanoseconds (UTC), one per bar
+            close: Closing prices, one per bar (None/NaN for missing)
+            symbol: Optional ticker symbol
+            tz: Timezone the bars are dated in (e.g. 'America/New_York'), None for naive dates
+            dtype: np.float64 (default) or np.float32 for the prices
+        """
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.close = np.asarray(close, dtype=dtype)
+        if len(self.timestamps) != len(self.close):
+            raise ValueError("Timestamps and closing prices must have the same length")
+
+        self.symbol = symbol
+        self.tz = tz
+        self.missing = np.isnan(self.close)
+        self._dates = None
+
+    @classmethod
+    def from_dataframe(cls, data, symbol=None, dtype=np.float64):
+        """
+        Build a frame from a DataFrame with 'Close' prices and datetime index.
+
+        Returns:
+            AnalysisFrame: Frame sharing no memory with the DataFrame
+        """
+        index = pd.DatetimeIndex(data.index)
+        tz = None if index.tz is None else str(index.tz)
+
+        return cls(index.as_unit("ns").asi8.copy(), data['Close'].to_numpy(dtype=dtype, copy=True),
+                   symbol=symbol, tz=tz, dtype=dtype)
+
+    def __len__(self):
+        return len(self.close)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None or np.dtype(dtype) == self.close.dtype:
+            return self.close.copy() if copy else self.close
+        return self.close.astype(dtype)
+
+    def __repr__(self):
+        span = f"{self.dates[0]} to {self.dates[-1]}" if len(self) else "empty"
+        return f"AnalysisFrame({self.symbol or '?'}, {len(self)} bars, {span}, {self.close.dtype})"
+
+    @property
+    def index(self):
+        """
+        The bar timestamps as a pd.DatetimeIndex in the frame's timezone.
+        """
+        index = pd.DatetimeIndex(pd.to_datetime(self.timestamps, unit="ns", utc=True))
+        return index.tz_convert(self.tz) if self.tz is not None else index.tz_localize(None)
+
+    @property
+    def dates(self):
+        """
+        The bar dates as a NumPy array of 'YYYY-MM-DD' strings, formatted once.
+        """
+        if self._dates is None:
+            # Local wall-clock times truncated to days, in one vectorized conversion
+            local = self.index.tz_localize(None).as_unit("ns").asi8 if self.tz is not None else self.timestamps
+            self._dates = local.astype("datetime64[ns]").astype("datetime64[D]").astype("U10")
+        return self._dates
+
+    def slice(self, first, last):
+        """
+        Return the bars at positions first..last (inclusive) as a new frame.
+        """
+        frame = AnalysisFrame(self.timestamps[first:last + 1], self.close[first:last + 1],
+                              symbol=self.symbol, tz=self.tz, dtype=self.close.dtype)
+        if self._dates is not None:
+            frame._dates = self._dates[first:last + 1]
+        return frame
+
+    def to_dataframe(self):
+        """
+        Convert back to a DataFrame with a 'Close' column and datetime index.
+        """
+        return pd.DataFrame({'Close': self.close}, index=self.index)
+
+    @property
+    def nbytes(self):
+        """
+        Bytes held by the frame's arrays (including formatted dates, if any).
+        """
+        arrays = (self.timestamps, self.close, self.missing) + ((self._dates,) if self._dates is not None else ())
+        return sum(array.nbytes for array in arrays)
@@ -0,0 +1,115 @@
+import numpy as np
+
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.simple_moving_average import moving_averages
+
+
+def sma_grid_backtest(closing_prices, short_windows, long_windows, cost=0.0):
+    """
+    Backtest the SMA crossover strategy for every (short, long) window pair.
+
+    The strategy holds the stock while the short SMA is above the long SMA and
+    holds cash otherwise. The position is decided on each day's close and
+    earns the next day's return, so there is no look-ahead. Every SMA comes
+    from one cumulative sum (moving_averages), and all long windows are
+    evaluated together with broadcast array operations, one short window at
+    a time to keep memory at O(len(long_windows) * n).
+
+    Time Complexity: O(S*L*n) array work for S short and L long windows over n days
+
+    Args:
+        closing_prices: List or array of closing prices (without missing values)
+        short_windows: Iterable of short SMA window sizes (e.g. range(5, 51))
+        long_windows: Iterable of long SMA window sizes (e.g. range(20, 251))
+        cost: Transaction cost as a fraction of the position, charged on every buy and sell
+
+    Returns:
+        dict: 'short_windows' and 'long_windows' arrays, and heatmap-ready
+              (len(short_windows), len(long_windows)) matrices 'total_return'
+              (%), 'max_drawdown' (%) and 'trades' (number of buys); pairs with
+              short >= long are NaN. 'buy_and_hold' is the total return (%) of
+              holding over the whole period, for comparison.
+    """
+    prices = np.asarray(closing_prices, dtype=np.float64)
+    short_windows = np.asarray(list(short_windows), dtype=np.int64)
+    long_windows = np.asarray(list(long_windows), dtype=np.int64)
+
+    if len(prices) < 2:
+        raise ValueError("At least two prices are required for a backtest")
+    if np.isnan(prices).any():
+        raise ValueError("Prices must not contain missing values")
+    if len(short_windows) == 0 or len(long_windows) == 0:
+        raise ValueError("Window lists must not be empty")
+    if short_windows.min() <= 0 or long_windows.min() <= 0:
+        raise ValueError("Window size must be a positive number")
+
+    windows = np.union1d(short_windows, long_windows)
+    if windows.max() > len(prices):
+        raise ValueError(f"Largest SMA window ({windows.max()}) cannot be larger than data length ({len(prices)})")
+
+    smas = moving_averages(prices, windows)
+    long_smas = np.vstack([smas[window] for window in long_windows])
+
+    # Return earned on day t by a position taken on the close of day t - 1
+    next_returns = prices[1:] / prices[:-1] - 1
+
+    shape = (len(short_windows), len(long_windows))
+    total_return = np.full(shape, np.nan)
+    max_drawdown = np.full(shape, np.nan)
+    trades = np.full(shape, np.nan)
+
+    for row, short_window in enumerate(short_windows):
+        # Long while short > long; NaN comparisons (windows still filling) are False
+        positions = (smas[short_window] > long_smas).astype(np.float64)
+        changes = np.diff(positions, axis=1, prepend=0.0)
+
+        # Costs are paid out of the capital at the close the position changes
+        growth = (1 - cost * np.abs(changes[:, :-1])) * (1 + positions[:, :-1] * next_returns)
+        equity = np.cumprod(growth, axis=1)
+
+        # Drawdown from the running peak, counting the starting capital of 1 as a peak
+        peaks = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+        drawdowns = 1 - equity / peaks
+
+        valid = short_window < long_windows
+        total_return[row, valid] = (equity[valid, -1] - 1) * 100
+        max_drawdown[row, valid] = drawdowns[valid].max(axis=1) * 100
+        trades[row, valid] = (changes[valid] > 0).sum(axis=1)
+
+    return {
+        'short_windows': short_windows,
+        'long_windows': long_windows,
+        'total_return': total_return,
+        'max_drawdown': max_drawdown,
+        'trades': trades,
+        'buy_and_hold': float((prices[-1] / prices[0] - 1) * 100)
+    }
+
+
+def best_windows(results, metric='total_return'):
+    """
+    Pick the best window pair from sma_grid_backtest results.
+
+    Args:
+        results: Dict from sma_grid_backtest
+        metric: 'total_return' (highest wins) or 'max_drawdown' (lowest wins)
+
+    Returns:
+        dict: short_window, long_window and the three metrics for that pair
+
+    Raises:
+        ValueError: If the grid has no valid (short < long) pair
+    """
+    values = results[metric]
+    if np.isnan(values).all():
+        raise ValueError("No valid window pair in the grid")
+
+    flat = np.nanargmin(values) if metric == 'max_drawdown' else np.nanargmax(values)
+    row, column = np.unravel_index(flat, values.shape)
+
+    return {
+        'short_window': int(results['short_windows'][row]),
+        'long_window': int(results['long_windows'][column]),
+        'total_return': round(float(results['total_return'][row, column]), 2),
+        'max_drawdown': round(float(results['max_drawdown'][row, column]), 2),
+        'trades': int(results['trades'][row, column])
+    }
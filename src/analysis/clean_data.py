@@ -0,0 +1,25 @@
+def clean_data(data):    
+    """
+    Validate raw price history and drop incomplete rows.
+    
+    Args:
+        data: DataFrame of raw price history with a 'Close' column
+        
+    Returns:
+        pd.DataFrame: Cleaned historical stock data
+        
+    Raises:
+        ValueError: If there is no usable closing price data
+    """
+    if data is None or data.empty:
+        raise ValueError("No data for analysis")
+   
+    if 'Close' not in data.columns:
+        raise ValueError("No Closing price data")
+   
+    cleaned_data = data.dropna()
+   
+    if len(cleaned_data) < 2:
+        raise ValueError("Insufficient data for analysis (less than 2 data points)")
+   
+    return cleaned_data
@@ -0,0 +1,54 @@
+import numpy as np
+
+# Direction codes of a crossover: the faster average crossing above or below the slower one
+BULLISH = 1
+BEARISH = -1
+
+
+def find_crossovers(averages, pairs=None):
+    """
+    Find every crossover between pairs of moving averages from the sign of their difference.
+
+    A bullish crossover at day i means fast[i-1] <= slow[i-1] and fast[i] > slow[i],
+    a bearish one fast[i-1] >= slow[i-1] and fast[i] < slow[i]. Days where either
+    average is missing (NaN) on day i or i-1 never produce a crossover.
+
+    Time Complexity: O(P*n) array operations for P pairs over n days
+
+    Args:
+        averages: Sequence of N equally long, NaN-padded moving average arrays
+                  (or a 2-D array with one average per row)
+        pairs: Sequence of (fast, slow) row positions to compare, defaults to
+               every pair (i, j) with i < j
+
+    Returns:
+        dict: Parallel arrays ordered by pair (in the order given) then by day:
+              'index' (int64 day), 'fast' and 'slow' (int64 rows of the pair),
+              'direction' (int8, BULLISH or BEARISH), 'value' (float64, the fast
+              average on the crossover day)
+    """
+    averages = np.asarray(averages, dtype=np.float64)
+    if averages.ndim != 2:
+        raise ValueError("Moving averages must be equally long 1-D arrays")
+
+    if pairs is None:
+        pairs = [(fast, slow) for fast in range(len(averages)) for slow in range(fast + 1, len(averages))]
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+
+    # One row of differences per pair; comparisons with NaN are False, so missing days drop out
+    difference = averages[pairs[:, 0]] - averages[pairs[:, 1]]
+    previous, current = difference[:, :-1], difference[:, 1:]
+    bullish = (previous <= 0) & (current > 0)
+    bearish = (previous >= 0) & (current < 0)
+
+    pair_rows, days = np.nonzero(bullish | bearish)
+    days = days + 1
+    fast = pairs[pair_rows, 0]
+
+    return {
+        'index': days.astype(np.int64),
+        'fast': fast,
+        'slow': pairs[pair_rows, 1],
+        'direction': np.where(bullish[pair_rows, days - 1], BULLISH, BEARISH).astype(np.int8),
+        'value': averages[fast, days]
+    }
@@ -1,38 +1,96 @@
-import pandas as pd
+import numpy as np
 
 def daily_returns(closing_prices):
     """
     Calculate the daily percentage returns based on closing prices.
+    Thin adapter over daily_returns_array that keeps the list output.
    
     Args:
         closing_prices: list of closing prices
        
     Returns:
-        list: List containing percentage changes as numeric values
+        list: List containing percentage changes as numeric values,
+              None where there is no previous close or data is missing
     """
     
-    percent_changes = []
+    percent_changes = round_returns(daily_returns_array(closing_prices))
+    
+    # Swap NaN for None so existing callers keep their None checks
+    result = percent_changes.astype(object)
+    result[np.isnan(percent_changes)] = None
    
-    for i in range(len(closing_prices)):
-        if i == 0:
-            # First row has no previous day to compare with
-            percent_changes.append(None)
+    return result.tolist()
+
+
+def daily_returns_array(closing_prices, log=False, axis=-1):
+    """
+    Calculate daily returns in a single vectorized pass.
+    
+    Args:
+        closing_prices: list, NumPy array or pandas Series of closing prices
+        log: Return log returns instead of percentage changes
+        axis: Axis of the days, for arrays holding several series
+        
+    Returns:
+        np.ndarray: float64 array the same shape as closing_prices, in percent
+                    (or natural log units when log=True), with NaN for the first
+                    day, missing prices and a zero previous close
+    """
+    
+    # None becomes NaN in the float conversion; days last for any number of series
+    prices = np.moveaxis(np.asarray(closing_prices, dtype=np.float64), axis, -1)
+    returns = np.full(prices.shape, np.nan)
+    
+    if prices.shape[-1] < 2:
+        return np.moveaxis(returns, -1, axis)
+    
+    prev_close = prices[..., :-1]
+    current_close = prices[..., 1:]
+    
+    # NaN inputs propagate on their own, only a zero previous close needs masking
+    valid = prev_close != 0
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if log:
+            changes = np.log(current_close / prev_close)
         else:
-            prev_close = closing_prices[i - 1]  # Get the previous day's close
-            current_close = closing_prices[i]  # Get the current day's close
-           
-            # Handle cases where Close might be None or NaN
-            if pd.notna(prev_close) and pd.notna(current_close) and prev_close != 0:
-                percent_change = ((current_close - prev_close) / prev_close) * 100
-                percent_changes.append(round(percent_change, 2))
-            else:
-                percent_changes.append(None)
-   
-    return percent_changes
+            changes = (current_close - prev_close) / prev_close * 100
+    
+    returns[..., 1:] = np.where(valid, changes, np.nan)
+    
+    return np.moveaxis(returns, -1, axis)
+
+
+def round_returns(returns, decimals=2):
+    """
+    Round an array of returns exactly like Python's round(value, decimals).
+    
+    np.round scales by 10**decimals before rounding, which can land a value
+    on the other side of a tie (-33.275 rounds to -33.28 instead of -33.27).
+    Only values whose scaled form is that close to a tie are re-rounded in
+    Python, so the result matches round() at NumPy speed.
+    
+    Args:
+        returns: Array of returns (NaN stays NaN)
+        decimals: Number of decimal places
+        
+    Returns:
+        np.ndarray: float64 array of rounded returns
+    """
+    
+    returns = np.asarray(returns, dtype=np.float64)
+    rounded = np.round(returns, decimals)
+    
+    scaled = returns * 10 ** decimals
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        rounded.flat[i] = round(float(returns.flat[i]), decimals)
+    
+    return rounded
 
 
 if __name__ == "__main__":
-    import yfinance as yf
+    from INF1002_Stock_Market_Trend_Analysis.src.analysis.data_fetcher import data_fetcher
     stock = "AAPL"
     start_date = "2015-01-01"
     end_date = "2025-08-31"
@@ -40,7 +98,7 @@ if __name__ == "__main__":
 
 
     # Grab the stock data
-    stock_data = yf.Ticker(stock).history('3y')
+    stock_data = data_fetcher(stock, period='3y')
 
     # Calculate simple moving average
     # stock_data["SMA"] = (stock_data["Close"].rolling(window=num_periods).mean()).round(2)
@@ -1,45 +1,90 @@
-import yfinance as yf
+import numpy as np
 
-def data_fetcher(ticker, period=None, start_date=None, end_date=None):
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.memo_cache import content_hash
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.price_providers import get_provider
+
+def data_fetcher(ticker, period=None, start_date=None, end_date=None, provider=None):
     """
-    Fetches historical stock data using yfinance and cleans it, takes
-    either time period or start and end dates
+    Fetches historical stock data from the configured price provider and
+    cleans it, takes either time period or start and end dates. The default
+    provider is yfinance read through the local price cache, see
+    price_providers for the offline backends.
     
     Args:
         ticker: Stock ticker symbol (str)
         period: Data period (e.g., '1y', '3mo') (str)
         start_date: Start date for data (str, 'YYYY-MM-DD')
         end_date: End date for data (str, 'YYYY-MM-DD')
+        provider: PriceProvider to use instead of the configured one
         
     Returns:
         pd.DataFrame: Cleaned historical stock data
     """
     
-    ticker = ticker.upper()
+    provider = provider or get_provider()
+    
+    return provider.history(ticker, period=period, start_date=start_date, end_date=end_date)
+
+
+async def data_fetcher_async(ticker, period=None, start_date=None, end_date=None, provider=None):
+    """
+    Awaitable version of data_fetcher for the async app: the yfinance
+    provider downloads without blocking the event loop, other providers
+    run in the default executor.
+    
+    Returns:
+        pd.DataFrame: Cleaned historical stock data
+    """
+    
+    provider = provider or get_provider()
+    
+    return await provider.history_async(ticker, period=period, start_date=start_date, end_date=end_date)
+
+
+def source_version(ticker, provider=None):
+    """
+    Cheap identifier of the provider's current data for a ticker, so caches
+    derived from the full history can be checked without loading it.
+    
+    Args:
+        ticker: Stock ticker symbol (str)
+        provider: PriceProvider to use instead of the configured one
+        
+    Returns:
+        str or None: Version string, None when the provider can't tell
+    """
+    
+    provider = provider or get_provider()
     
-    if start_date and end_date:
-        stock_data = yf.Ticker(ticker).history(start=start_date, end=end_date)
-    elif period:
-        period = period.lower()
-        stock_data = yf.Ticker(ticker).history(period=period)
-    else:
-        raise ValueError("Either period or both start_date and end_date must be provided")
+    return provider.version(ticker.upper())
+
+
+async def source_version_async(ticker, provider=None):
+    """
+    Awaitable version of source_version, refreshing without blocking the event loop.
     
-    cleaned_data = clean_data(stock_data)
+    Returns:
+        str or None: Version string, None when the provider can't tell
+    """
     
-    return cleaned_data
+    provider = provider or get_provider()
+    
+    return await provider.version_async(ticker.upper())
 
 
-def clean_data(data):    
+def data_version(data):
+    """
+    Short identifier of a price history that changes whenever bars are added
+    or any bar is revised, used to key derived caches.
+    
+    Args:
+        data: DataFrame with 'Close' prices and datetime index
+        
+    Returns:
+        str: Version string (empty history gives "0")
+    """
     if data is None or data.empty:
-        raise ValueError("No data for analysis")
-   
-    if 'Close' not in data.columns:
-        raise ValueError("No Closing price data")
-   
-    cleaned_data = data.dropna()
-   
-    if len(cleaned_data) < 2:
-        raise ValueError("Insufficient data for analysis (less than 2 data points)")
-   
-    return cleaned_data
\ No newline at end of file
+        return "0"
+    
+    # Hashing the raw bytes of both arrays takes microseconds even for decades of bars
+    return content_hash(data.index.as_unit("ns").asi8, data['Close'].to_numpy(dtype=np.float64))
@@ -0,0 +1,72 @@
+import numpy as np
+
+
+def histogram(values, bins=30):
+    """
+    Bin values into equal-width bins, ready to draw as bars.
+
+    Args:
+        values: List or array of values (None/NaN are ignored)
+        bins: Number of bins
+
+    Returns:
+        dict: 'centers', 'widths' and 'counts' arrays (one entry per bin) and
+              the bin 'edges'; all empty when there are no values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+
+    if len(values) == 0:
+        empty = np.array([], dtype=np.float64)
+        return {'centers': empty, 'widths': empty, 'counts': np.array([], dtype=np.int64), 'edges': empty}
+
+    counts, edges = np.histogram(values, bins=bins)
+
+    return {
+        'centers': (edges[:-1] + edges[1:]) / 2,
+        'widths': np.diff(edges),
+        'counts': counts,
+        'edges': edges
+    }
+
+
+def box_stats(values):
+    """
+    Compute the statistics of a Tukey box plot, matching what plotly derives
+    client-side with its default (linear) quartile method and boxmean='sd'.
+
+    Args:
+        values: List or array of values (None/NaN are ignored)
+
+    Returns:
+        dict: q1, median, q3, lowerfence, upperfence, mean, sd (population),
+              count, and 'outliers' (distinct values beyond the fences with
+              how often each occurs); None when there are no values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+
+    if len(values) == 0:
+        return None
+
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+
+    # Whiskers end at the most extreme values within 1.5 IQR of the box
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    lowerfence, upperfence = inside.min(), inside.max()
+
+    outlier_values, outlier_counts = np.unique(values[(values < lowerfence) | (values > upperfence)],
+                                               return_counts=True)
+
+    return {
+        'q1': float(q1),
+        'median': float(median),
+        'q3': float(q3),
+        'lowerfence': float(lowerfence),
+        'upperfence': float(upperfence),
+        'mean': float(values.mean()),
+        'sd': float(values.std()),
+        'count': int(len(values)),
+        'outliers': {'values': outlier_values, 'counts': outlier_counts}
+    }
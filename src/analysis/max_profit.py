@@ -1,69 +1,176 @@
 import yfinance as yf
 import datetime as dt
+import numpy as np
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.analysis_frame import AnalysisFrame
 
 def max_profit(data):
     """
     Trading Algorithm - Max Profit Calculator
-    
+
     Finds the maximum profit from a single buy-sell transaction.
-    Uses Kadane's algorithm variant with O(n) time complexity.
-    
+    Uses a vectorized running minimum (see max_profit_indices).
+
     Time Complexity: O(n) where n is the number of data points
-    Space Complexity: O(1) - only stores scalar variables
-    
+    Space Complexity: O(n) - a few temporary arrays
+
     Args:
-        data: DataFrame with 'Close' prices and datetime index
-        
+        data: AnalysisFrame, or DataFrame with 'Close' prices and datetime index
+
     Returns:
         dict: Contains max_profit, buy_date, buy_price, sell_date, sell_price
-        
+
     Raises:
         ValueError: If no profit opportunity exists
     """
-    # Extract closing prices from the DataFrame
-    close_prices = data['Close']
-    
-    # Initialize tracking variables
-    min_price = float('inf')  # Set to infinity initially to check for min
-    max_profit = 0.0  # Track the best profit opportunity found
-    buy_time = sell_time = None  # Initialize buy and sell times
-    min_index = None # Track index of minimum price
-    
-    # O(n) - Single pass through all prices
-    for i, price in enumerate(close_prices):
-        # Update minimum price and its index if we find a new low
-        if price < min_price:
-            min_price = price
-            min_index = i
-        
-        # Calculate potential profit if we bought at min_price and sold at current price
-        profit = price - min_price
-        
-        # Update our best trade if this profit exceeds previous maximum
-        if profit > max_profit:
-            max_profit = profit
-            buy_time = min_index  # Buy at the minimum price point
-            sell_time = i  # Sell at current price point
-    
+    # Extract closing prices from the frame or DataFrame
+    close_prices = _close_prices(data)
+
+    buy_time, sell_time, max_profit = max_profit_indices(close_prices)
+
     # Validate that a profitable trade opportunity exists
     if max_profit > 0 and buy_time is not None and sell_time is not None:
+        return _trade_details(data, buy_time, sell_time, max_profit)
+    else:
+        # Raise error if no profitable trade was found (e.g., prices only declined)
+        raise ValueError(f"No profit opportunity.")
+
+
+def max_profit_indices(prices):
+    """
+    Find the best single buy-sell pair with a cumulative minimum and argmax.
+
+    Ties resolve like a left-to-right scan: the earliest sell day with the
+    maximum profit, bought at the first occurrence of the lowest price before it.
+    Missing (NaN) prices are skipped.
+
+    Args:
+        prices: Array of closing prices
+
+    Returns:
+        tuple: (buy_index, sell_index, profit), indices are None when no
+               trade makes a profit
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    if len(prices) < 2:
+        return None, None, 0.0
+
+    # Lowest price seen so far at each day, NaN prices don't lower it
+    running_min = np.fmin.accumulate(prices)
+    profits = prices - running_min
+    profits[np.isnan(profits)] = -np.inf
+
+    sell_time = int(np.argmax(profits))
+    profit = float(profits[sell_time])
+    if profit <= 0:
+        return None, None, 0.0
+
+    buy_time = int(np.nanargmin(prices[:sell_time + 1]))
+
+    return buy_time, sell_time, profit
+
+
+def max_profit_trades(data, k):
+    """
+    Find the best at-most-k non-overlapping buy-sell trades.
+
+    Args:
+        data: AnalysisFrame, or DataFrame with 'Close' prices and datetime index
+        k: Maximum number of transactions
+
+    Returns:
+        list: Trade dicts in date order, each with the same keys as max_profit;
+              empty when no trade makes a profit
+    """
+    close_prices = _close_prices(data)
+
+    return [_trade_details(data, buy_time, sell_time, profit)
+            for buy_time, sell_time, profit in max_profit_k_indices(close_prices, k)]
+
+
+def max_profit_k_indices(prices, k):
+    """
+    At-most-k-transactions dynamic program, O(n*k) time over arrays.
+
+    For each transaction count t, the best cash after buying by day i is a
+    running maximum of (best cash after t-1 sales before day i) - price[i],
+    and the best cash after selling by day i is a running maximum of that plus
+    price[i], so every layer of the DP is two np.maximum.accumulate calls.
+    The trades are then recovered by walking the layers backwards. A trade
+    must be sold before the next one is bought.
+
+    Args:
+        prices: Array of closing prices (without missing values)
+        k: Maximum number of transactions
+
+    Returns:
+        list: (buy_index, sell_index, profit) tuples in date order
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    k = int(k)
+    if k <= 0:
+        raise ValueError("Number of transactions must be a positive number")
+
+    n = len(prices)
+    if n < 2:
+        return []
+
+    # More than n // 2 transactions can never be used
+    k = min(k, n // 2)
+
+    sold = np.zeros((k + 1, n))
+    bought = np.empty((k + 1, n))
+    for t in range(1, k + 1):
+        previous_sold = np.empty(n)
+        previous_sold[0] = 0.0
+        previous_sold[1:] = sold[t - 1, :-1]
+        bought[t] = np.maximum.accumulate(previous_sold - prices)
+        sold[t] = np.maximum.accumulate(bought[t] + prices)
+
+    trades = []
+    t, end = k, n - 1
+    while t > 0 and end > 0:
+        value = sold[t, end]
+        if value <= sold[t - 1, end]:
+            # Transaction t adds nothing within [0, end]
+            t -= 1
+            continue
+
+        # First day the t-th sale reaches its final value, then the buy that funds it
+        sell_time = int(np.argmax(sold[t, :end + 1] == value))
+        buy_value = bought[t, sell_time]
+        buy_time = int(np.argmax(bought[t, :sell_time + 1] == buy_value))
+
+        trades.append((buy_time, sell_time, float(prices[sell_time] - prices[buy_time])))
+        t, end = t - 1, buy_time - 1
+
+    return trades[::-1]
+
+
+def _close_prices(data):
+    if isinstance(data, AnalysisFrame):
+        return np.asarray(data, dtype=np.float64)
+    return data['Close'].to_numpy(dtype=np.float64)
+
+
+def _trade_details(data, buy_time, sell_time, profit):
+    if isinstance(data, AnalysisFrame):
+        # Dates are already formatted once for the whole frame
+        buy_date, buy_price = str(data.dates[buy_time]), np.float64(data.close[buy_time])
+        sell_date, sell_price = str(data.dates[sell_time]), np.float64(data.close[sell_time])
+    else:
         # Extract and format buy transaction details
         buy_date = data.index[buy_time].strftime("%Y-%m-%d")
         buy_price = data["Close"].iloc[buy_time]
-        
+
         # Extract and format sell transaction details
         sell_date = data.index[sell_time].strftime("%Y-%m-%d")
         sell_price = data["Close"].iloc[sell_time]
-        
-        # Return formatted results with all values rounded to 2 decimal places
-        return {
-            "max_profit": round(max_profit, 2),
-            "buy_date": buy_date,
-            "buy_price": buy_price.round(2),
-            "sell_date": sell_date,
-            "sell_price": sell_price.round(2)
-        }
-    else:
-        # Raise error if no profitable trade was found (e.g., prices only declined)
-        raise ValueError(f"No profit opportunity.")
-    
\ No newline at end of file
+
+    # Return formatted results with all values rounded to 2 decimal places
+    return {
+        "max_profit": round(profit, 2),
+        "buy_date": buy_date,
+        "buy_price": buy_price.round(2),
+        "sell_date": sell_date,
+        "sell_price": sell_price.round(2)
+    }
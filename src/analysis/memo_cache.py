@@ -0,0 +1,243 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# Default location of the memo database, next to the price cache; override with MEMO_CACHE_PATH
+DEFAULT_MEMO_PATH = os.environ.get(
+    "MEMO_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                 "cache", "memo.sqlite3")
+)
+
+# Upper bound on the stored results, least recently used entries are evicted first
+DEFAULT_MEMO_MAX_BYTES = int(os.environ.get("MEMO_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# How long another process may take to finish a computation before we stop waiting for it
+DEFAULT_CLAIM_SECONDS = 60.0
+
+
+def content_hash(*parts):
+    """
+    Fast blake2b digest of arrays and plain parameters.
+
+    Arrays are hashed by dtype, shape and raw bytes, everything else by repr,
+    so equal price series give the same key however they were fetched.
+
+    Returns:
+        str: 32-character hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, np.ndarray) or hasattr(part, '__array__'):
+            array = np.ascontiguousarray(part)
+            digest.update(f"{array.dtype.str}{array.shape}".encode())
+            # Object arrays hold pointers, so hash their values instead
+            digest.update(repr(array.tolist()).encode() if array.dtype.hasobject else memoryview(array).cast("B"))
+        else:
+            digest.update(repr(part).encode())
+        # Separator, so ('ab', 'c') and ('a', 'bc') differ
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class MemoCache:
+    """
+    Size-bounded, SQLite-backed memo of pickled results keyed by content hash.
+
+    The database file is shared by every process on the machine (Flask
+    workers, batch workers), so a result computed by one is reused by all.
+    A process that starts a computation first claims the key; others asking
+    for the same key meanwhile wait for its result instead of repeating the
+    work, both across processes (by polling the claim) and within a process.
+    """
+
+    def __init__(self, path=None, max_bytes=None, claim_seconds=DEFAULT_CLAIM_SECONDS):
+        self.path = path or DEFAULT_MEMO_PATH
+        self.max_bytes = DEFAULT_MEMO_MAX_BYTES if max_bytes is None else int(max_bytes)
+        self.claim_seconds = claim_seconds
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS memo ("
+                "key TEXT PRIMARY KEY, value BLOB, size INTEGER NOT NULL DEFAULT 0, "
+                "claimed_at REAL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS memo_accessed ON memo (accessed_at)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key, default=None):
+        """
+        Return the stored value for key, or default if there is none.
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM memo WHERE key = ? AND value IS NOT NULL", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            conn.execute("UPDATE memo SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return pickle.loads(row[0])
+
+    def set(self, key, value):
+        """
+        Store value under key, then evict least recently used entries until
+        the total size fits in max_bytes.
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            # Larger than the whole cache, keep the previous state
+            self._release(key)
+            return
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO memo (key, value, size, claimed_at, accessed_at) VALUES (?, ?, ?, NULL, ?)",
+                (key, blob, len(blob), time.time())
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM memo").fetchone()[0]
+            while total > self.max_bytes:
+                row = conn.execute(
+                    "SELECT key, size FROM memo WHERE value IS NOT NULL AND key != ? "
+                    "ORDER BY accessed_at LIMIT 1", (key,)
+                ).fetchone()
+                if row is None:
+                    break
+                conn.execute("DELETE FROM memo WHERE key = ?", (row[0],))
+                total -= row[1]
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the stored value for key, computing and storing it on a miss.
+
+        Args:
+            key: Cache key, normally from content_hash()
+            compute: Zero-argument function producing a picklable value
+
+        Returns:
+            The stored or freshly computed value
+        """
+        if self.max_bytes <= 0:
+            return compute()
+
+        # One computation per key in this process, the claim covers other processes
+        with self._key_lock(key):
+            while True:
+                row = self._lookup(key)
+                if row is not None and row[0] is not None:
+                    self.hits += 1
+                    return pickle.loads(row[0])
+                if self._claim(key):
+                    break
+                time.sleep(0.05)
+
+            self.misses += 1
+            try:
+                value = compute()
+            except BaseException:
+                self._release(key)
+                raise
+            self.set(key, value)
+            return value
+
+    @contextmanager
+    def _key_lock(self, key):
+        with self._locks_lock:
+            lock, users = self._locks.get(key, (None, 0))
+            lock = lock or threading.Lock()
+            self._locks[key] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._locks_lock:
+                lock, users = self._locks[key]
+                if users == 1:
+                    del self._locks[key]
+                else:
+                    self._locks[key] = (lock, users - 1)
+
+    def _lookup(self, key):
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM memo WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[0] is not None:
+                conn.execute("UPDATE memo SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return row
+
+    def _claim(self, key):
+        # Take the key unless another process claimed it recently and is still computing
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO memo (key, value, size, claimed_at, accessed_at) VALUES (?, NULL, 0, ?, ?)",
+                (key, now, now)
+            )
+            claimed = conn.execute(
+                "UPDATE memo SET claimed_at = ? WHERE key = ? AND value IS NULL AND (claimed_at = ? OR claimed_at < ?)",
+                (now, key, now, now - self.claim_seconds)
+            ).rowcount
+        return claimed == 1
+
+    def _release(self, key):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM memo WHERE key = ? AND value IS NULL", (key,))
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM memo")
+
+    def stats(self):
+        """
+        Return the entry count, stored bytes and this process's counters.
+        """
+        with self._connect() as conn:
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM memo WHERE value IS NOT NULL"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+_memo_cache = None
+
+
+def get_memo_cache():
+    """
+    Return the process-wide MemoCache, configured from MEMO_CACHE_PATH and
+    MEMO_CACHE_MAX_BYTES (0 disables memoization) on first use.
+    """
+    global _memo_cache
+    if _memo_cache is None:
+        _memo_cache = MemoCache()
+    return _memo_cache
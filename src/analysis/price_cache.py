@@ -0,0 +1,429 @@
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from functools import partial
+
+import pandas as pd
+import yfinance as yf
+
+# Default location of the on-disk cache, can be overridden with PRICE_CACHE_PATH
+DEFAULT_CACHE_PATH = os.environ.get(
+    "PRICE_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                 "cache", "prices.sqlite3")
+)
+
+# How long a cached series is considered fresh before the tail is re-fetched
+DEFAULT_REFRESH_SECONDS = int(os.environ.get("PRICE_CACHE_REFRESH_SECONDS", 15 * 60))
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"]
+SQL_COLUMNS = ["open", "high", "low", "close", "volume", "dividends", "stock_splits"]
+
+PERIOD_PATTERN = re.compile(r"^(\d+)(d|wk|mo|y)$")
+
+# Columns whose non-zero values re-adjust every earlier price
+EVENT_COLUMNS = ["Dividends", "Stock Splits"]
+
+logger = logging.getLogger(__name__)
+
+
+def yfinance_fetch(ticker, **kwargs):
+    """
+    Default fetch function, downloads raw history from yfinance.
+
+    Args:
+        ticker: Stock ticker symbol (str)
+        **kwargs: Passed through to yf.Ticker.history (period, start, end)
+
+    Returns:
+        pd.DataFrame: Raw OHLCV history
+    """
+    return yf.Ticker(ticker).history(**kwargs)
+
+
+def slice_history(data, period=None, start_date=None, end_date=None):
+    """
+    Slice a full price history down to a period or an explicit date range.
+
+    Periods follow the yfinance spelling ('5d', '1mo', '1y', 'ytd', 'max').
+    Day periods count trading days, longer periods count calendar time back
+    from today. Like yfinance, end_date is exclusive.
+
+    Args:
+        data: DataFrame with a datetime index
+        period: Data period (e.g., '1y', '3mo') (str)
+        start_date: Start date for data (str, 'YYYY-MM-DD')
+        end_date: End date for data (str, 'YYYY-MM-DD')
+
+    Returns:
+        pd.DataFrame: The requested slice of data
+    """
+    if data.empty:
+        return data
+
+    tz = data.index.tz
+
+    if start_date and end_date:
+        start = _localize(pd.Timestamp(start_date), tz)
+        end = _localize(pd.Timestamp(end_date), tz)
+        return data[(data.index >= start) & (data.index < end)]
+
+    if not period:
+        raise ValueError("Either period or both start_date and end_date must be provided")
+
+    period = period.lower()
+    if period == "max":
+        return data
+
+    now = pd.Timestamp.now(tz=tz)
+    if period == "ytd":
+        return data[data.index >= now.normalize().replace(month=1, day=1)]
+
+    match = PERIOD_PATTERN.match(period)
+    if not match:
+        raise ValueError(f"Invalid period '{period}'")
+
+    count, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        return data.iloc[-count:]
+    elif unit == "wk":
+        start = now - pd.DateOffset(weeks=count)
+    elif unit == "mo":
+        start = now - pd.DateOffset(months=count)
+    else:
+        start = now - pd.DateOffset(years=count)
+
+    return data[data.index >= start.normalize()]
+
+
+def _localize(timestamp, tz):
+    # Interpret naive dates in the exchange timezone, like yfinance does
+    if tz is None:
+        return timestamp.tz_localize(None) if timestamp.tzinfo else timestamp
+    if timestamp.tzinfo is None:
+        return timestamp.tz_localize(tz)
+    return timestamp.tz_convert(tz)
+
+
+class PriceCache:
+    """
+    SQLite-backed store of each ticker's full daily history.
+
+    The first request for a ticker downloads its whole history, later requests
+    only download the bars after the last cached one, and only once the cached
+    copy is older than refresh_seconds. Every period or date range is answered
+    as a slice of the same cached series.
+    """
+
+    def __init__(self, path=None, fetch=None, refresh_seconds=None):
+        self.path = path or DEFAULT_CACHE_PATH
+        self.fetch = fetch or yfinance_fetch
+        self.refresh_seconds = DEFAULT_REFRESH_SECONDS if refresh_seconds is None else refresh_seconds
+        self._refreshing = {}
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS bars ("
+                "ticker TEXT NOT NULL, ts INTEGER NOT NULL, "
+                + ", ".join(f"{column} REAL" for column in SQL_COLUMNS) +
+                ", PRIMARY KEY (ticker, ts))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tickers ("
+                "ticker TEXT PRIMARY KEY, tz TEXT, fetched_at REAL NOT NULL, "
+                "first_ts INTEGER, last_ts INTEGER)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def history(self, ticker, period=None, start_date=None, end_date=None):
+        """
+        Return the cached history of a ticker for a period or date range,
+        fetching whatever is missing first.
+
+        Args:
+            ticker: Stock ticker symbol (str)
+            period: Data period (e.g., '1y', '3mo') (str)
+            start_date: Start date for data (str, 'YYYY-MM-DD')
+            end_date: End date for data (str, 'YYYY-MM-DD')
+
+        Returns:
+            pd.DataFrame: Raw (uncleaned) history for the requested window
+        """
+        ticker = ticker.upper()
+        self.refresh(ticker)
+
+        return self._slice(ticker, period=period, start_date=start_date, end_date=end_date)
+
+    async def history_async(self, ticker, fetch_async, period=None, start_date=None, end_date=None):
+        """
+        Same as history, but awaits the download with fetch_async (e.g.
+        yahoo_chart.fetch_chart) and runs the SQLite work in the default
+        executor, so the event loop never blocks.
+
+        Returns:
+            pd.DataFrame: Raw (uncleaned) history for the requested window
+        """
+        ticker = ticker.upper()
+        await self.refresh_async(ticker, fetch_async)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self._slice, ticker, period=period,
+                                                        start_date=start_date, end_date=end_date))
+
+    def _slice(self, ticker, period=None, start_date=None, end_date=None):
+        meta = self._meta(ticker)
+        if meta is None:
+            return pd.DataFrame(columns=PRICE_COLUMNS)
+
+        if start_date and end_date:
+            tz = meta["tz"] or None
+            start = _localize(pd.Timestamp(start_date), tz)
+            end = _localize(pd.Timestamp(end_date), tz)
+            return self._read(ticker, meta["tz"], _to_epoch_ns(start), _to_epoch_ns(end))
+
+        return slice_history(self._read(ticker, meta["tz"]), period=period)
+
+    def refresh(self, ticker, force=False):
+        """
+        Bring the cached series for a ticker up to date.
+
+        Args:
+            ticker: Stock ticker symbol (str)
+            force: Fetch the tail even if the cached copy is still fresh
+
+        Returns:
+            int: Number of bars written to the cache
+        """
+        ticker = ticker.upper()
+        arguments = self._refresh_arguments(ticker, force)
+        if arguments is None:
+            return 0
+
+        try:
+            fetched = self.fetch(ticker, **arguments)
+            replace = "start" in arguments and self._has_new_events(ticker, fetched)
+            if replace:
+                # Prices are split and dividend adjusted, so a new event changes every earlier bar
+                fetched = self.fetch(ticker, period="max")
+        except Exception as e:
+            if "period" in arguments:
+                raise
+            # Serve the stale copy rather than failing the request
+            logger.warning("Price cache refresh failed for %s: %s", ticker, e)
+            return 0
+
+        return self._write(ticker, fetched, replace=replace)
+
+    async def refresh_async(self, ticker, fetch_async, force=False):
+        """
+        Same as refresh, but awaits the download with fetch_async. Concurrent
+        refreshes of one ticker on the same event loop share a single download.
+
+        Returns:
+            int: Number of bars written to the cache
+        """
+        ticker = ticker.upper()
+        loop = asyncio.get_running_loop()
+        key = (id(loop), ticker)
+
+        pending = self._refreshing.get(key)
+        if pending is None:
+            pending = self._refreshing[key] = loop.create_task(self._refresh_async(ticker, fetch_async, force))
+            pending.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+        return await asyncio.shield(pending)
+
+    async def _refresh_async(self, ticker, fetch_async, force):
+        loop = asyncio.get_running_loop()
+        arguments = await loop.run_in_executor(None, self._refresh_arguments, ticker, force)
+        if arguments is None:
+            return 0
+
+        try:
+            fetched = await fetch_async(ticker, **arguments)
+            replace = "start" in arguments and await loop.run_in_executor(None, self._has_new_events,
+                                                                          ticker, fetched)
+            if replace:
+                fetched = await fetch_async(ticker, period="max")
+        except Exception as e:
+            if "period" in arguments:
+                raise
+            logger.warning("Price cache refresh failed for %s: %s", ticker, e)
+            return 0
+
+        return await loop.run_in_executor(None, partial(self._write, ticker, fetched, replace=replace))
+
+    def _refresh_arguments(self, ticker, force=False):
+        # Fetch arguments that bring the cached series up to date, None if it is fresh
+        meta = self._meta(ticker)
+
+        if meta is None:
+            return {"period": "max"}
+        if force or time.time() - meta["fetched_at"] >= self.refresh_seconds:
+            # Re-fetch from the last cached bar, it may have been a partial day
+            last_bar = pd.Timestamp(meta["last_ts"], unit="ns", tz="UTC")
+            if meta["tz"]:
+                last_bar = last_bar.tz_convert(meta["tz"])
+            return {"start": last_bar.strftime("%Y-%m-%d")}
+        return None
+
+    def version(self, ticker):
+        """
+        Identifier of the cached series of a ticker, None if it isn't cached.
+        Every write changes it, so it covers revised bars as well as new ones.
+        """
+        meta = self._meta(ticker.upper())
+        if meta is None:
+            return None
+        return f"{meta['first_ts']}-{meta['last_ts']}-{meta['fetched_at']!r}"
+
+    def last_bar(self, ticker):
+        """
+        Return the timestamp of the last cached bar for a ticker, or None.
+        """
+        meta = self._meta(ticker.upper())
+        if meta is None or meta["last_ts"] is None:
+            return None
+        return pd.Timestamp(meta["last_ts"], unit="ns", tz="UTC")
+
+    def _has_new_events(self, ticker, data):
+        # Whether a fetched tail holds a dividend or split the cached bars don't have yet
+        if data is None or data.empty:
+            return False
+
+        events = data.reindex(columns=EVENT_COLUMNS).astype("float64").fillna(0.0)
+        events = events[(events != 0.0).any(axis=1)]
+        if events.empty:
+            return False
+
+        timestamps = [int(ts) for ts in _to_epoch_ns(pd.DatetimeIndex(events.index))]
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT ts, dividends, stock_splits FROM bars "
+                f"WHERE ticker = ? AND ts IN ({', '.join('?' for _ in timestamps)})",
+                (ticker, *timestamps)
+            ).fetchall()
+        cached = {ts: (dividends or 0.0, splits or 0.0) for ts, dividends, splits in rows}
+
+        for ts, (dividends, splits) in zip(timestamps, events.to_numpy()):
+            if cached.get(ts, (0.0, 0.0)) != (dividends, splits):
+                return True
+        return False
+
+    def _meta(self, ticker):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT tz, fetched_at, first_ts, last_ts FROM tickers WHERE ticker = ?",
+                (ticker,)
+            ).fetchone()
+
+        if row is None:
+            return None
+        return {"tz": row[0], "fetched_at": row[1], "first_ts": row[2], "last_ts": row[3]}
+
+    def _write(self, ticker, data, replace=False):
+        # replace drops the ticker's cached bars first, for a re-adjusted full history
+        now = time.time()
+
+        if data is None or data.empty:
+            # Still record the attempt so an existing series isn't re-fetched on every request
+            with self._connect() as conn:
+                conn.execute("UPDATE tickers SET fetched_at = ? WHERE ticker = ?", (now, ticker))
+            return 0
+
+        index = pd.DatetimeIndex(data.index)
+        tz = str(index.tz) if index.tz is not None else ""
+        timestamps = _to_epoch_ns(index)
+
+        columns = []
+        for column in PRICE_COLUMNS:
+            if column in data.columns:
+                columns.append(data[column].astype("float64").tolist())
+            else:
+                columns.append([None] * len(data))
+
+        rows = [(ticker, int(ts), *values) for ts, *values in zip(timestamps, *columns)]
+
+        with self._connect() as conn:
+            if replace:
+                conn.execute("DELETE FROM bars WHERE ticker = ?", (ticker,))
+            conn.executemany(
+                f"INSERT OR REPLACE INTO bars (ticker, ts, {', '.join(SQL_COLUMNS)}) "
+                f"VALUES (?, ?, {', '.join('?' for _ in SQL_COLUMNS)})",
+                rows
+            )
+            conn.execute(
+                "INSERT INTO tickers (ticker, tz, fetched_at, first_ts, last_ts) "
+                "SELECT ?, ?, ?, MIN(ts), MAX(ts) FROM bars WHERE ticker = ? "
+                "ON CONFLICT(ticker) DO UPDATE SET tz = excluded.tz, "
+                "fetched_at = excluded.fetched_at, first_ts = excluded.first_ts, "
+                "last_ts = excluded.last_ts",
+                (ticker, tz, now, ticker)
+            )
+
+        return len(rows)
+
+    def _read(self, ticker, tz, start_ns=None, end_ns=None):
+        query = f"SELECT ts, {', '.join(SQL_COLUMNS)} FROM bars WHERE ticker = ?"
+        params = [ticker]
+
+        if start_ns is not None:
+            query += " AND ts >= ?"
+            params.append(start_ns)
+        if end_ns is not None:
+            query += " AND ts < ?"
+            params.append(end_ns)
+
+        query += " ORDER BY ts"
+
+        with self._connect() as conn:
+            data = pd.read_sql_query(query, conn, params=params)
+
+        index = pd.to_datetime(data.pop("ts"), unit="ns", utc=True)
+        index = index.dt.tz_convert(tz) if tz else index.dt.tz_localize(None)
+
+        data.index = pd.DatetimeIndex(index, name="Date")
+        data.columns = PRICE_COLUMNS
+
+        # Drop columns the source never provided so clean_data doesn't drop every row
+        return data.dropna(axis=1, how="all")
+
+
+def _to_epoch_ns(timestamps):
+    if isinstance(timestamps, pd.Timestamp):
+        if timestamps.tzinfo is not None:
+            timestamps = timestamps.tz_convert("UTC")
+        return timestamps.as_unit("ns").value
+    if timestamps.tz is not None:
+        timestamps = timestamps.tz_convert("UTC")
+    return timestamps.as_unit("ns").asi8
+
+
+_price_cache = None
+
+
+def get_price_cache():
+    """
+    Return the process-wide PriceCache, creating it on first use.
+    """
+    global _price_cache
+    if _price_cache is None:
+        _price_cache = PriceCache()
+    return _price_cache
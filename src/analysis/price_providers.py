@@ -0,0 +1,324 @@
+import asyncio
+import os
+import zlib
+from abc import ABC, abstractmethod
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.clean_data import clean_data
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.price_cache import get_price_cache, slice_history, yfinance_fetch
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.yahoo_chart import fetch_chart
+
+
+class PriceProvider(ABC):
+    """
+    Base class for price data backends.
+
+    Subclasses implement load() to return raw OHLCV history with a datetime
+    index, history() validates the arguments and cleans the result so every
+    backend hands the analysis the same DataFrame shape.
+    """
+
+    name = None
+
+    def history(self, ticker, period=None, start_date=None, end_date=None):
+        """
+        Return cleaned price history for a period or an explicit date range.
+
+        Args:
+            ticker: Stock ticker symbol (str)
+            period: Data period (e.g., '1y', '3mo') (str)
+            start_date: Start date for data (str, 'YYYY-MM-DD')
+            end_date: End date for data (str, 'YYYY-MM-DD')
+
+        Returns:
+            pd.DataFrame: Cleaned historical stock data
+        """
+        period, start_date, end_date = _window(period, start_date, end_date)
+        raw_data = self.load(ticker.upper(), period=period, start_date=start_date, end_date=end_date)
+
+        return clean_data(raw_data)
+
+    async def history_async(self, ticker, period=None, start_date=None, end_date=None):
+        """
+        Awaitable version of history for the async app. Backends without
+        non-blocking I/O run history in the default executor.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.history, ticker, period=period,
+                                                        start_date=start_date, end_date=end_date))
+
+    def version(self, ticker):
+        """
+        Cheap identifier of the ticker's current data that changes whenever
+        it does, or None when the backend can't tell without loading it.
+        """
+        return None
+
+    async def version_async(self, ticker):
+        """
+        Awaitable version for the async app, run in the default executor.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.version, ticker)
+
+    @abstractmethod
+    def load(self, ticker, period=None, start_date=None, end_date=None):
+        """
+        Return raw OHLCV history for the window validated by history().
+
+        Returns:
+            pd.DataFrame: Raw history with a datetime index
+        """
+
+
+def _window(period, start_date, end_date):
+    # Validate and normalize the requested window: a date range wins over a period
+    if not (start_date and end_date) and not period:
+        raise ValueError("Either period or both start_date and end_date must be provided")
+
+    if start_date and end_date:
+        return None, start_date, end_date
+    return period.lower(), None, None
+
+
+class YFinanceProvider(PriceProvider):
+    """
+    Downloads prices from Yahoo Finance, by default through the on-disk price cache.
+    """
+
+    name = "yfinance"
+
+    def __init__(self, use_cache=True, cache=None):
+        self.use_cache = use_cache
+        self.cache = cache
+
+    def load(self, ticker, period=None, start_date=None, end_date=None):
+        if self.use_cache:
+            cache = self.cache or get_price_cache()
+            return cache.history(ticker, period=period, start_date=start_date, end_date=end_date)
+
+        if start_date and end_date:
+            return yfinance_fetch(ticker, start=start_date, end=end_date)
+        return yfinance_fetch(ticker, period=period)
+
+    def version(self, ticker):
+        # The price cache knows its bars after bringing them up to date, without reading them
+        if not self.use_cache:
+            return None
+        cache = self.cache or get_price_cache()
+        cache.refresh(ticker)
+        return cache.version(ticker)
+
+    async def version_async(self, ticker):
+        if not self.use_cache:
+            return None
+        cache = self.cache or get_price_cache()
+        await cache.refresh_async(ticker, fetch_chart)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, cache.version, ticker)
+
+    async def history_async(self, ticker, period=None, start_date=None, end_date=None):
+        """
+        Awaits the download from the Yahoo chart API (the endpoint yfinance
+        uses) over asyncio streams instead of blocking in yfinance.
+        """
+        period, start_date, end_date = _window(period, start_date, end_date)
+        ticker = ticker.upper()
+
+        if self.use_cache:
+            cache = self.cache or get_price_cache()
+            raw_data = await cache.history_async(ticker, fetch_chart, period=period,
+                                                 start_date=start_date, end_date=end_date)
+        elif start_date and end_date:
+            raw_data = await fetch_chart(ticker, start=start_date, end=end_date)
+        else:
+            raw_data = await fetch_chart(ticker, period=period)
+
+        return clean_data(raw_data)
+
+
+class LocalFileProvider(PriceProvider):
+    """
+    Reads prices from a directory of per-ticker files named <TICKER>.csv or
+    <TICKER>.parquet. Files need a 'Date' column (or a datetime index) and a
+    'Close' column, other OHLCV columns are kept as they are.
+    """
+
+    name = "local"
+
+    def __init__(self, directory):
+        if not directory:
+            raise ValueError("A data directory is required for the local price provider")
+        self.directory = directory
+        self._frames = {}
+
+    def load(self, ticker, period=None, start_date=None, end_date=None):
+        return slice_history(self._read(ticker), period=period, start_date=start_date, end_date=end_date)
+
+    def version(self, ticker):
+        path = self._path(ticker)
+        if path is None:
+            raise ValueError(f"No local price file for symbol {ticker}")
+        stat = os.stat(path)
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def _read(self, ticker):
+        path = self._path(ticker)
+        if path is None:
+            raise ValueError(f"No local price file for symbol {ticker}")
+
+        # Re-read only when the file changes on disk
+        modified = os.path.getmtime(path)
+        cached = self._frames.get(ticker)
+        if cached is not None and cached[0] == (path, modified):
+            return cached[1]
+
+        if path.endswith(".parquet"):
+            data = pd.read_parquet(path)
+        else:
+            data = pd.read_csv(path)
+
+        if "Date" in data.columns:
+            data = data.set_index("Date")
+        data.index = _parse_dates(data.index)
+        data = data.sort_index()
+
+        self._frames[ticker] = ((path, modified), data)
+        return data
+
+    def _path(self, ticker):
+        for extension in (".parquet", ".csv"):
+            path = os.path.join(self.directory, ticker + extension)
+            if os.path.exists(path):
+                return path
+        return None
+
+
+def _parse_dates(values):
+    try:
+        index = pd.DatetimeIndex(pd.to_datetime(values))
+    except (ValueError, TypeError):
+        # Mixed UTC offsets (e.g. across DST in yfinance CSV exports) only parse as UTC
+        index = pd.DatetimeIndex(pd.to_datetime(values, utc=True))
+    return index.rename("Date")
+
+
+class SyntheticProvider(PriceProvider):
+    """
+    Generates daily prices as geometric Brownian motion. Each ticker gets its
+    own reproducible series derived from the seed and the ticker name.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, seed=0, days=2520, start_price=100.0, drift=0.08, volatility=0.25):
+        self.seed = seed
+        self.days = days
+        self.start_price = start_price
+        self.drift = drift
+        self.volatility = volatility
+        self._frames = {}
+
+    def load(self, ticker, period=None, start_date=None, end_date=None):
+        data = self._frames.get(ticker)
+        if data is None:
+            data = self._frames[ticker] = self.generate(ticker)
+        return slice_history(data, period=period, start_date=start_date, end_date=end_date)
+
+    def version(self, ticker):
+        # A ticker's series only depends on the parameters and the day it ends on
+        if ticker in self._frames:
+            return f"{self.seed}-{self.days}-{self._frames[ticker].index[-1]:%Y-%m-%d}"
+        return f"{self.seed}-{self.days}-{pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=1)[0]:%Y-%m-%d}"
+
+    def generate(self, ticker):
+        """
+        Generate the full synthetic history of a ticker, ending today.
+
+        Args:
+            ticker: Stock ticker symbol (str)
+
+        Returns:
+            pd.DataFrame: OHLCV history on business days
+        """
+        rng = np.random.default_rng([self.seed, zlib.crc32(ticker.encode())])
+        dates = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=self.days, name="Date")
+
+        # Daily log returns of a GBM with annual drift and volatility
+        dt = 1 / 252
+        shocks = rng.standard_normal(self.days)
+        log_returns = (self.drift - 0.5 * self.volatility ** 2) * dt + self.volatility * np.sqrt(dt) * shocks
+        log_returns[0] = 0.0
+        close = self.start_price * np.exp(np.cumsum(log_returns))
+
+        opens = np.empty_like(close)
+        opens[0] = self.start_price
+        opens[1:] = close[:-1]
+        spread = np.abs(rng.standard_normal(self.days)) * self.volatility * np.sqrt(dt) * close / 2
+
+        return pd.DataFrame({
+            "Open": opens,
+            "High": np.maximum(opens, close) + spread,
+            "Low": np.minimum(opens, close) - spread,
+            "Close": close,
+            "Volume": rng.integers(1_000_000, 10_000_000, self.days).astype(float),
+        }, index=dates)
+
+
+PROVIDERS = {
+    YFinanceProvider.name: YFinanceProvider,
+    LocalFileProvider.name: LocalFileProvider,
+    SyntheticProvider.name: SyntheticProvider,
+}
+
+
+def create_provider(name=None, data_dir=None, seed=None):
+    """
+    Build a price provider from configuration values.
+
+    Args:
+        name: Provider name, one of 'yfinance', 'local' or 'synthetic'
+              (defaults to the PRICE_PROVIDER environment variable, then 'yfinance')
+        data_dir: Directory of price files for the local provider
+                  (defaults to PRICE_DATA_DIR)
+        seed: Random seed for the synthetic provider (defaults to PRICE_SYNTHETIC_SEED)
+
+    Returns:
+        PriceProvider: The configured provider
+    """
+    name = (name or os.environ.get("PRICE_PROVIDER") or YFinanceProvider.name).lower()
+
+    if name == LocalFileProvider.name:
+        return LocalFileProvider(data_dir or os.environ.get("PRICE_DATA_DIR"))
+    elif name == SyntheticProvider.name:
+        if seed is None:
+            seed = int(os.environ.get("PRICE_SYNTHETIC_SEED", 0))
+        return SyntheticProvider(seed=seed)
+    elif name == YFinanceProvider.name:
+        return YFinanceProvider()
+
+    raise ValueError(f"Unknown price provider '{name}', expected one of: {', '.join(PROVIDERS)}")
+
+
+_provider = None
+
+
+def get_provider():
+    """
+    Return the process-wide price provider, created from the environment on first use.
+    """
+    global _provider
+    if _provider is None:
+        _provider = create_provider()
+    return _provider
+
+
+def set_provider(provider):
+    """
+    Replace the process-wide price provider, e.g. from the Flask app config.
+    """
+    global _provider
+    _provider = provider
@@ -0,0 +1,301 @@
+import numpy as np
+import pandas as pd
+
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.daily_returns import daily_returns_array, round_returns
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.result_cache import ResultCache
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.volatility import (TRADING_DAYS, analyze_volatility,
+                                                                         categorize_volatility, near_boundary)
+
+
+class SparseTable:
+    """
+    Range minimum or maximum queries in O(1) after an O(n log n) build.
+    """
+
+    def __init__(self, values, op=np.maximum):
+        self.op = op
+        self.levels = [np.asarray(values, dtype=np.float64)]
+
+        # Level k holds the result over the 2**k values starting at each index
+        span = 1
+        while 2 * span <= len(self.levels[0]):
+            previous = self.levels[-1]
+            self.levels.append(op(previous[:-span], previous[span:]))
+            span *= 2
+
+    def query(self, left, right):
+        """
+        Return the min/max of values[left:right + 1].
+        """
+        level = (right - left + 1).bit_length() - 1
+        table = self.levels[level]
+        return self.op(table[left], table[right - (1 << level) + 1])
+
+
+# Segment tree node fields, one array per field
+_FIELDS = ("min", "argmin", "max", "argmax", "best", "buy", "sell")
+_EMPTY = (np.inf, -1, -np.inf, -1, 0.0, -1, -1)
+
+
+def _merge(a, b):
+    """
+    Combine the max-profit summaries of two adjacent ranges (a before b).
+
+    Works on scalars or, element-wise, on arrays. Ties resolve like the
+    max_profit scan: earliest sell day, then first occurrence of the lowest buy.
+    """
+    a_min, a_argmin, a_max, a_argmax, a_best, a_buy, a_sell = a
+    b_min, b_argmin, b_max, b_argmax, b_best, b_buy, b_sell = b
+
+    # Best trade selling in b, either bought in a (cross) or within b
+    with np.errstate(invalid="ignore"):
+        cross = b_max - a_min
+    use_b = (b_best > cross) | ((b_best == cross) & (b_sell < b_argmax))
+    right_best = np.where(use_b, b_best, cross)
+    right_buy = np.where(use_b, b_buy, a_argmin)
+    right_sell = np.where(use_b, b_sell, b_argmax)
+
+    use_a = a_best >= right_best
+    best = np.where(use_a, a_best, right_best)
+    buy = np.where(use_a, a_buy, right_buy)
+    sell = np.where(use_a, a_sell, right_sell)
+
+    profitable = best > 0
+    left_min = a_min <= b_min
+    left_max = a_max >= b_max
+
+    return (
+        np.where(left_min, a_min, b_min),
+        np.where(left_min, a_argmin, b_argmin),
+        np.where(left_max, a_max, b_max),
+        np.where(left_max, a_argmax, b_argmax),
+        np.where(profitable, best, 0.0),
+        np.where(profitable, buy, -1),
+        np.where(profitable, sell, -1),
+    )
+
+
+class MaxProfitSegmentTree:
+    """
+    Segment tree answering single-trade max profit over any index range in O(log n).
+    Each node stores its min, max, best profit and the indices behind them.
+    """
+
+    def __init__(self, prices):
+        prices = np.asarray(prices, dtype=np.float64)
+        n = len(prices)
+        self.n = n
+        self.size = 1 << max(n - 1, 0).bit_length()
+
+        size = self.size
+        self.nodes = {field: np.full(2 * size, empty) for field, empty in zip(_FIELDS, _EMPTY)}
+
+        # Leaves; missing prices behave like padding and are never bought or sold
+        valid = ~np.isnan(prices)
+        positions = np.arange(n)
+        self.nodes["min"][size:size + n] = np.where(valid, prices, np.inf)
+        self.nodes["max"][size:size + n] = np.where(valid, prices, -np.inf)
+        self.nodes["argmin"][size:size + n] = positions
+        self.nodes["argmax"][size:size + n] = positions
+
+        # Internal nodes, one vectorized merge per level
+        level_start = size // 2
+        while level_start >= 1:
+            parents = np.arange(level_start, 2 * level_start)
+            merged = _merge(self._node(2 * parents), self._node(2 * parents + 1))
+            for field, values in zip(_FIELDS, merged):
+                self.nodes[field][parents] = values
+            level_start //= 2
+
+    def _node(self, index):
+        return tuple(self.nodes[field][index] for field in _FIELDS)
+
+    def query(self, left, right):
+        """
+        Return (buy_index, sell_index, profit) for prices[left:right + 1],
+        indices are None when no trade makes a profit.
+        """
+        left_summary, right_summary = _EMPTY, _EMPTY
+        lo, hi = left + self.size, right + self.size + 1
+
+        while lo < hi:
+            if lo & 1:
+                left_summary = _merge(left_summary, self._node(lo))
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                right_summary = _merge(self._node(hi), right_summary)
+            lo //= 2
+            hi //= 2
+
+        summary = _merge(left_summary, right_summary)
+        best, buy, sell = float(summary[4]), int(summary[5]), int(summary[6])
+
+        if best <= 0:
+            return None, None, 0.0
+        return buy, sell, best
+
+
+class PriceRangeIndex:
+    """
+    Precomputed index over one price series that answers analyze_volatility-
+    and max_profit-equivalent queries for any sub-range without rescanning:
+
+    - prefix sums of returns and squared returns give mean and variance in O(1)
+    - sparse tables give the largest gain and loss in O(1)
+    - a segment tree gives the single-trade max profit in O(log n)
+
+    Results equal analyze_volatility and max_profit exactly. The prefix-sum
+    variance differs from the two-pass one only in the last bits, which can
+    matter next to a rounding tie or category boundary, so only there the
+    window's returns are rescanned with analyze_volatility.
+    """
+
+    def __init__(self, data):
+        self.index = pd.DatetimeIndex(data.index)
+        self.timestamps = self.index.as_unit("ns").asi8
+        self.prices = data['Close'].to_numpy(dtype=np.float64)
+
+        # Rounded like daily_returns, so sub-range statistics match analyze_volatility
+        self.returns = round_returns(daily_returns_array(self.prices))
+        valid = ~np.isnan(self.returns)
+
+        # Centre on the overall mean to keep the sum-of-squares formula precise
+        self.centre = float(np.mean(self.returns[valid])) if valid.any() else 0.0
+        centred = np.where(valid, self.returns - self.centre, 0.0)
+
+        self.count_prefix = np.concatenate(([0], np.cumsum(valid)))
+        self.sum_prefix = np.concatenate(([0.0], np.cumsum(centred)))
+        self.square_prefix = np.concatenate(([0.0], np.cumsum(centred ** 2)))
+
+        self.gain_table = SparseTable(np.where(valid, self.returns, -np.inf), np.maximum)
+        self.loss_table = SparseTable(np.where(valid, self.returns, np.inf), np.minimum)
+        self.price_min_table = SparseTable(np.where(np.isnan(self.prices), np.inf, self.prices), np.minimum)
+        self.price_max_table = SparseTable(np.where(np.isnan(self.prices), -np.inf, self.prices), np.maximum)
+
+        self.profit_tree = MaxProfitSegmentTree(self.prices)
+
+    def __len__(self):
+        return len(self.prices)
+
+    def locate(self, start_date=None, end_date=None):
+        """
+        Convert a date window to inclusive positions, with the same rules as
+        slice_history (end_date is exclusive, naive dates are in the series timezone).
+
+        Returns:
+            tuple: (first, last) positions, last < first when the window is empty
+        """
+        first = 0 if start_date is None else int(self.index.searchsorted(self._timestamp(start_date), side="left"))
+        last = len(self) - 1 if end_date is None else int(self.index.searchsorted(self._timestamp(end_date), side="left")) - 1
+        return first, last
+
+    def _timestamp(self, value):
+        timestamp = pd.Timestamp(value)
+        if self.index.tz is not None:
+            return timestamp.tz_localize(self.index.tz) if timestamp.tzinfo is None else timestamp.tz_convert(self.index.tz)
+        return timestamp.tz_localize(None) if timestamp.tzinfo is not None else timestamp
+
+    def positions(self, frame):
+        """
+        Locate an AnalysisFrame in the indexed history.
+
+        Returns:
+            tuple or None: (first, last) positions when the frame's bars are
+                           exactly those of the history there, else None
+        """
+        count = len(frame)
+        first = int(np.searchsorted(self.timestamps, frame.timestamps[0])) if count else 0
+        last = first + count - 1
+        if count == 0 or last >= len(self):
+            return None
+
+        # Same dates and same prices, otherwise the history has been revised since
+        if not np.array_equal(self.timestamps[first:last + 1], frame.timestamps):
+            return None
+        if not np.array_equal(self.prices[first:last + 1], frame.close, equal_nan=True):
+            return None
+        return first, last
+
+    def price_range(self, first, last):
+        """
+        Return the (lowest, highest) price in positions first..last.
+        """
+        return self.price_min_table.query(first, last), self.price_max_table.query(first, last)
+
+    def volatility(self, start_date=None, end_date=None):
+        """
+        Same result as analyze_volatility(daily_returns(prices in the window)).
+        """
+        first, last = self.locate(start_date, end_date)
+        return self.volatility_between(first, last)
+
+    def volatility_between(self, first, last):
+        # Returns inside the window are those of positions first + 1 .. last
+        lo, hi = first + 1, last + 1
+        if hi <= lo:
+            return None
+
+        count = int(self.count_prefix[hi] - self.count_prefix[lo])
+        if count == 0:
+            return None
+
+        centred_mean = (self.sum_prefix[hi] - self.sum_prefix[lo]) / count
+        variance = (self.square_prefix[hi] - self.square_prefix[lo]) / count - centred_mean ** 2
+        avg_return = centred_mean + self.centre
+        avg_return = float(avg_return)
+        daily_vol = float(np.sqrt(max(variance, 0.0)))
+        annual_vol = daily_vol * (TRADING_DAYS ** 0.5)
+
+        if near_boundary(avg_return, daily_vol, annual_vol):
+            # Rare: rescan the window so the rounding matches the two-pass formula
+            return analyze_volatility(self.returns[lo:hi])
+
+        return {
+            'daily_volatility': round(daily_vol, 2),
+            'annualized_volatility': round(annual_vol, 1),
+            'avg_daily_return': round(avg_return, 2),
+            'max_gain': round(float(self.gain_table.query(lo, hi - 1)), 2),
+            'max_loss': round(float(self.loss_table.query(lo, hi - 1)), 2),
+            'volatility_level': categorize_volatility(annual_vol)
+        }
+
+    def max_profit(self, start_date=None, end_date=None):
+        """
+        Same result as max_profit(data in the window).
+
+        Raises:
+            ValueError: If no profit opportunity exists
+        """
+        first, last = self.locate(start_date, end_date)
+        return self.max_profit_between(first, last)
+
+    def max_profit_between(self, first, last):
+        buy_time, sell_time, profit = (None, None, 0.0) if last <= first else self.profit_tree.query(first, last)
+
+        if buy_time is None:
+            raise ValueError(f"No profit opportunity.")
+
+        return {
+            "max_profit": round(profit, 2),
+            "buy_date": self.index[buy_time].strftime("%Y-%m-%d"),
+            "buy_price": self.prices[buy_time].round(2),
+            "sell_date": self.index[sell_time].strftime("%Y-%m-%d"),
+            "sell_price": self.prices[sell_time].round(2)
+        }
+
+
+# Built indices per series, keyed by symbol and data version
+_index_cache = ResultCache(maxsize=32, ttl=3600)
+
+
+def get_range_index(symbol, version, load):
+    """
+    Return the PriceRangeIndex for a symbol's history, building it once per data version.
+
+    Args:
+        symbol: Stock ticker symbol
+        version: Identifier of the history (source_version or data_version)
+        load: Zero-argument function returning the full history, only called on a miss
+    """
+    return _index_cache.get_or_compute((symbol.upper(), version), lambda: PriceRangeIndex(load()))
@@ -0,0 +1,159 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Flight:
+    """
+    A computation in progress that other callers for the same key wait on.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResultCache:
+    """
+    Bounded in-memory cache with TTL expiry, LRU eviction and single-flight
+    computation: concurrent callers asking for the same missing key share one
+    call of the compute function instead of each running their own.
+    """
+
+    def __init__(self, maxsize=128, ttl=300):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive number")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value), oldest first
+        self._flights = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for key, computing and storing it on a miss.
+
+        Args:
+            key: Hashable cache key, see make_key()
+            compute: Zero-argument function producing the value
+
+        Returns:
+            The cached or freshly computed value
+
+        Raises:
+            Whatever compute raises; errors are shared with waiting callers but never cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.expirations += 1
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            self._store(key, flight.value)
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.event.set()
+
+        return flight.value
+
+    def _store(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Return the cache counters as a dict.
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+def make_key(symbol, period=None, start_date=None, end_date=None, sma_windows=()):
+    """
+    Normalize request parameters into a cache key, so equivalent requests
+    (e.g. 'aapl' and 'AAPL ') share one entry.
+
+    Args:
+        symbol: Stock ticker symbol (str)
+        period: Data period (e.g., '1y', '3mo') (str)
+        start_date: Start date for data (str, 'YYYY-MM-DD')
+        end_date: End date for data (str, 'YYYY-MM-DD')
+        sma_windows: SMA window sizes
+
+    Returns:
+        tuple: Hashable cache key
+    """
+    symbol = symbol.strip().upper()
+    windows = tuple(int(window) for window in sma_windows)
+
+    if start_date and end_date:
+        return (symbol, None, start_date, end_date, windows)
+    return (symbol, (period or "").strip().lower(), None, None, windows)
+
+
+_result_cache = None
+
+
+def get_result_cache():
+    """
+    Return the process-wide ResultCache, sized from RESULT_CACHE_SIZE and
+    RESULT_CACHE_TTL (seconds) on first use.
+    """
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ResultCache(
+            maxsize=int(os.environ.get("RESULT_CACHE_SIZE", 128)),
+            ttl=float(os.environ.get("RESULT_CACHE_TTL", 300))
+        )
+    return _result_cache
@@ -1,25 +1,75 @@
+import numpy as np
+
 def simple_moving_average(closing_prices, window_size):
     """
     Calculate the Simple Moving Average (SMA) for a given window size.
-    
+
     Args:
         closing_prices: List of closing prices
         window_size: Integer representing the number of periods for the moving average
-        
+
+    Returns:
+        List of SMA values, one per complete window (no padding)
+    """
+
+    # Drop the NaN padding so the list starts at the first complete window
+    return sma_array(closing_prices, window_size)[window_size - 1:].tolist()
+
+
+def sma_array(closing_prices, window_size, axis=-1):
+    """
+    Calculate the SMA for one window size in O(n) using a cumulative sum.
+
+    Args:
+        closing_prices: List, NumPy array or pandas Series of closing prices
+        window_size: Integer representing the number of periods for the moving average
+        axis: Axis of the days, for arrays holding several series
+
     Returns:
-        List of SMA values
+        np.ndarray: float64 array aligned with closing_prices, NaN for the first
+                    window_size - 1 entries and for windows containing missing prices
     """
 
-    sma = []
-    
-    # Loop through the data to calculate the moving average
-    for i in range(len(closing_prices) - window_size + 1):
-        window = closing_prices[i:i + window_size]  # Get the slice for the current window
-        window_average = sum(window) / window_size  # Calculate the average for this window
-        sma.append(window_average)  # Append the average to the sma list
-    
-    return sma
-    
-    #sma = data["Close"].rolling(window=window_size).mean() # another way to find SMA
-    
-    #return sma
\ No newline at end of file
+    return moving_averages(closing_prices, [window_size], axis=axis)[window_size]
+
+
+def moving_averages(closing_prices, window_sizes, axis=-1):
+    """
+    Calculate SMAs for any number of window sizes from a single cumulative sum.
+    Each window then costs one vectorized subtraction, whatever its size.
+
+    Args:
+        closing_prices: List, NumPy array or pandas Series of closing prices
+        window_sizes: Iterable of window sizes
+        axis: Axis of the days, for arrays holding several series (e.g. one row per ticker)
+
+    Returns:
+        dict: window size -> NaN-padded float64 array aligned with closing_prices
+    """
+
+    # Days last, so the slicing below works for any number of series
+    prices = np.moveaxis(np.asarray(closing_prices, dtype=np.float64), axis, -1)
+    n = prices.shape[-1]
+
+    missing = np.isnan(prices)
+
+    # Leading zero so the sum of prices[i:j] is cumulative[j] - cumulative[i]
+    cumulative = np.zeros(prices.shape[:-1] + (n + 1,))
+    np.cumsum(np.where(missing, 0.0, prices), axis=-1, out=cumulative[..., 1:])
+    missing_count = np.zeros(prices.shape[:-1] + (n + 1,), dtype=np.int64)
+    np.cumsum(missing, axis=-1, out=missing_count[..., 1:])
+
+    averages = {}
+    for window_size in window_sizes:
+        window_size = int(window_size)
+        if window_size <= 0:
+            raise ValueError("Window size must be a positive number")
+
+        sma = np.full(prices.shape, np.nan)
+        if window_size <= n:
+            window_sums = cumulative[..., window_size:] - cumulative[..., :-window_size]
+            window_missing = missing_count[..., window_size:] - missing_count[..., :-window_size]
+            sma[..., window_size - 1:] = np.where(window_missing == 0, window_sums / window_size, np.nan)
+        averages[window_size] = np.moveaxis(sma, -1, axis)
+
+    return averages
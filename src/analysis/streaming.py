@@ -0,0 +1,272 @@
+from array import array
+from collections import deque
+
+import numpy as np
+
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.up_down_runs import DIRECTION_NAMES
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.volatility import (TRADING_DAYS, analyze_volatility,
+                                                                         categorize_volatility, near_boundary)
+
+
+class StreamingAnalyzer:
+    """
+    Incremental version of the analysis chain for live bar updates.
+
+    Each call to update() appends one closing price and refreshes every metric
+    in O(1) amortized time (O(number of SMA windows)), instead of recomputing
+    returns, SMAs, runs and max profit over the full history.
+    Results match the batch functions: SMAs use the same cumulative-sum
+    differences as moving_averages and returns are rounded like daily_returns.
+    Volatility uses Welford's one-pass mean and variance. Where a figure lands
+    next to a rounding or category boundary, the one-pass and two-pass results
+    could round differently, so only then is analyze_volatility run over the
+    logged returns (whole hundredths, 4 bytes each).
+    """
+
+    def __init__(self, sma_windows=(20, 50, 200)):
+        self.sma_windows = tuple(int(window) for window in sma_windows)
+        if any(window <= 0 for window in self.sma_windows):
+            raise ValueError("Window size must be a positive number")
+
+        self.count = 0
+        self.last_close = None
+        self.last_date = None
+
+        # SMA state: running cumulative sums, with the last (window + 1) kept per window
+        self._cumulative = 0.0
+        self._missing = 0
+        self._history = {window: deque([(0.0, 0)], maxlen=window + 1) for window in self.sma_windows}
+
+        # Volatility state: Welford count, mean and sum of squared deviations,
+        # extremes, and the returns in hundredths for the exact fallback
+        self._return_count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._max_return = -float('inf')
+        self._min_return = float('inf')
+        self._return_log = array('i')
+        self._volatility = None
+
+        # Run state: completed runs per direction plus the run in progress
+        self._run_direction = None
+        self._run_length = 0
+        self._run_totals = {1: 0, -1: 0, 0: 0}
+        self._run_counts = {1: 0, -1: 0, 0: 0}
+        self._run_max = {1: 0, -1: 0, 0: 0}
+
+        # Max profit state
+        self._min_price = float('inf')
+        self._min_date = None
+        self._best_profit = 0.0
+        self._best_trade = None
+
+    @classmethod
+    def from_history(cls, data, sma_windows=(20, 50, 200)):
+        """
+        Build an analyzer primed with an existing history.
+
+        Args:
+            data: DataFrame with 'Close' prices and datetime index
+            sma_windows: SMA window sizes to track
+
+        Returns:
+            StreamingAnalyzer: Analyzer ready for live updates
+        """
+        analyzer = cls(sma_windows)
+        for date, close in zip(data.index, data['Close'].to_numpy()):
+            analyzer.update(close, date)
+        return analyzer
+
+    def update(self, close, date=None):
+        """
+        Append one bar and update every metric.
+
+        Args:
+            close: Closing price of the new bar
+            date: Bar date (datetime-like or 'YYYY-MM-DD' string)
+
+        Returns:
+            float or None: The new daily return, None if it is missing
+        """
+        close = np.float64(np.nan if close is None else close)
+        if hasattr(date, 'strftime'):
+            date = date.strftime("%Y-%m-%d")
+
+        daily_return = None
+        if self.last_close is not None and not np.isnan(self.last_close) \
+                and not np.isnan(close) and self.last_close != 0:
+            daily_return = round(float((close - self.last_close) / self.last_close * 100), 2)
+
+        self._update_sma(close)
+        if daily_return is not None:
+            self._update_volatility(daily_return)
+            self._update_runs(daily_return)
+        self._update_max_profit(close, date)
+
+        self.count += 1
+        self.last_close = close
+        self.last_date = date
+
+        return daily_return
+
+    def _update_sma(self, close):
+        if np.isnan(close):
+            self._missing += 1
+        else:
+            self._cumulative += close
+
+        for window in self.sma_windows:
+            self._history[window].append((self._cumulative, self._missing))
+
+    def _update_volatility(self, daily_return):
+        self._return_count += 1
+        delta = daily_return - self._mean
+        self._mean += delta / self._return_count
+        self._m2 += delta * (daily_return - self._mean)
+        self._max_return = max(self._max_return, daily_return)
+        self._min_return = min(self._min_return, daily_return)
+        self._return_log.append(round(daily_return * 100))
+        self._volatility = None
+
+    def _update_runs(self, daily_return):
+        direction = 1 if daily_return > 0 else -1 if daily_return < 0 else 0
+
+        if direction == self._run_direction:
+            self._run_length += 1
+            return
+
+        if self._run_direction is not None:
+            self._close_run()
+        self._run_direction = direction
+        self._run_length = 1
+
+    def _close_run(self):
+        direction, length = self._run_direction, self._run_length
+        self._run_totals[direction] += length
+        self._run_counts[direction] += 1
+        self._run_max[direction] = max(self._run_max[direction], length)
+
+    def _update_max_profit(self, close, date):
+        # Same strict comparisons as max_profit, so ties resolve to the earliest dates
+        if close < self._min_price:
+            self._min_price = close
+            self._min_date = date
+
+        # Python floats like the batch loop, so the rounding of the profit matches too
+        profit = float(close) - float(self._min_price)
+        if profit > self._best_profit:
+            self._best_profit = profit
+            self._best_trade = (self._min_date, self._min_price, date, close)
+
+    def sma(self):
+        """
+        Return the latest SMA value per window, NaN until a window is complete.
+        """
+        values = {}
+        for window, history in self._history.items():
+            if len(history) <= window:
+                values[window] = np.nan
+                continue
+            (start_sum, start_missing), (end_sum, end_missing) = history[0], history[-1]
+            values[window] = (end_sum - start_sum) / window if end_missing == start_missing else np.nan
+        return values
+
+    def volatility(self):
+        """
+        Return the same statistics as analyze_volatility, or None without returns.
+        """
+        if self._return_count == 0:
+            return None
+
+        if self._volatility is None:
+            avg_return = self._mean
+            daily_vol = (self._m2 / self._return_count) ** 0.5
+            annual_vol = daily_vol * (TRADING_DAYS ** 0.5)
+
+            if near_boundary(avg_return, daily_vol, annual_vol):
+                # Rare: recompute with the batch two-pass formula so the rounding matches
+                returns = np.frombuffer(self._return_log, dtype=np.int32) / 100
+                self._volatility = analyze_volatility(returns)
+            else:
+                self._volatility = {
+                    'daily_volatility': round(daily_vol, 2),
+                    'annualized_volatility': round(annual_vol, 1),
+                    'avg_daily_return': round(avg_return, 2),
+                    'max_gain': round(self._max_return, 2),
+                    'max_loss': round(self._min_return, 2),
+                    'volatility_level': categorize_volatility(annual_vol)
+                }
+        return dict(self._volatility)
+
+    def run_stats(self):
+        """
+        Return the same statistics as analyze_runs.
+
+        Raises:
+            ValueError: If no returns have been seen yet
+        """
+        if self._run_direction is None:
+            raise ValueError("No run data provided")
+
+        # The run in progress counts towards the averages, as in analyze_runs
+        totals = dict(self._run_totals)
+        counts = dict(self._run_counts)
+        maxima = dict(self._run_max)
+        totals[self._run_direction] += self._run_length
+        counts[self._run_direction] += 1
+        maxima[self._run_direction] = max(maxima[self._run_direction], self._run_length)
+
+        avg_upward = totals[1] / counts[1] if counts[1] else 0
+        avg_downward = totals[-1] / counts[-1] if counts[-1] else 0
+
+        return {
+            "avg_upward_run": round(avg_upward, 1),
+            "avg_downward_run": round(avg_downward, 1),
+            "max_upward_run": maxima[1],
+            "max_downward_run": maxima[-1],
+            "current_run": self._run_length,
+            "current_run_type": DIRECTION_NAMES[self._run_direction]
+        }
+
+    def max_profit(self):
+        """
+        Return the same result as max_profit.
+
+        Raises:
+            ValueError: If no profit opportunity exists
+        """
+        if self._best_profit > 0 and self._best_trade is not None:
+            buy_date, buy_price, sell_date, sell_price = self._best_trade
+            return {
+                "max_profit": round(self._best_profit, 2),
+                "buy_date": buy_date,
+                "buy_price": buy_price.round(2),
+                "sell_date": sell_date,
+                "sell_price": sell_price.round(2)
+            }
+        raise ValueError("No profit opportunity.")
+
+    def results(self):
+        """
+        Return every metric at once; entries that aren't available yet are None.
+        """
+        try:
+            run_stats = self.run_stats()
+        except ValueError:
+            run_stats = None
+
+        try:
+            max_profit = self.max_profit()
+        except ValueError:
+            max_profit = None
+
+        return {
+            'count': self.count,
+            'last_date': self.last_date,
+            'last_close': self.last_close,
+            'sma': self.sma(),
+            'volatility': self.volatility(),
+            'run_stats': run_stats,
+            'max_profit': max_profit
+        }
+
@@ -0,0 +1,281 @@
+import numpy as np
+import pandas as pd
+
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.daily_returns import daily_returns_array, round_returns
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.simple_moving_average import sma_array
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.up_down_runs import DIRECTION_NAMES
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.volatility import TRADING_DAYS
+
+# Batch versions of the single-ticker analysis functions. Every function takes
+# an aligned 2-D float array with one row per ticker and one column per day
+# (NaN where a ticker has no price) and handles the whole universe in one
+# vectorized call.
+
+
+def close_matrix(histories):
+    """
+    Align the closing prices of several tickers on a shared date index.
+
+    Args:
+        histories: Dict of ticker -> DataFrame with 'Close' prices and datetime index
+
+    Returns:
+        tuple: (tickers list, pd.DatetimeIndex of dates, float64 array of shape
+               (len(tickers), len(dates)) with NaN where a ticker has no bar)
+    """
+    if not histories:
+        raise ValueError("No tickers to align")
+
+    closes = pd.concat({ticker: data['Close'] for ticker, data in histories.items()}, axis=1).sort_index()
+
+    return list(closes.columns), pd.DatetimeIndex(closes.index), closes.to_numpy(dtype=np.float64).T
+
+
+def batch_daily_returns(closes):
+    """
+    Daily percentage returns of every row, computed and rounded like daily_returns.
+
+    Returns:
+        np.ndarray: Same shape as closes, NaN for the first day, missing
+                    prices and a zero previous close
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    if closes.ndim != 2:
+        raise ValueError("Closing prices must have one row per ticker")
+
+    return round_returns(daily_returns_array(closes, axis=1))
+
+
+def batch_sma(closes, window_size):
+    """
+    Simple moving average of every row, computed by sma_array along the days.
+
+    Returns:
+        np.ndarray: Same shape as closes, NaN until the window is full and
+                    wherever it contains a missing price
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    if closes.ndim != 2:
+        raise ValueError("Closing prices must have one row per ticker")
+
+    return sma_array(closes, window_size, axis=1)
+
+
+def batch_volatility(returns):
+    """
+    Volatility statistics of every row, equal to analyze_volatility.
+
+    Each row's returns are moved to the front of the row, and rows with the
+    same number of returns are averaged together. The sums then run over the
+    same values in the same order as in analyze_volatility, so the results are
+    identical, not just close.
+
+    Returns:
+        dict: Arrays (one value per row) daily_volatility, annualized_volatility,
+              avg_daily_return, max_gain, max_loss (NaN for rows without
+              returns) and volatility_level (object array of labels, None
+              for rows without returns)
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    valid = ~np.isnan(returns)
+    count = valid.sum(axis=1)
+    has_returns = count > 0
+
+    compact = np.take_along_axis(returns, np.argsort(~valid, axis=1, kind="stable"), axis=1)
+    avg_return = np.full(len(returns), np.nan)
+    variance = np.full(len(returns), np.nan)
+    for length in np.unique(count[has_returns]):
+        selected = count == length
+        group = np.ascontiguousarray(compact[selected, :length])
+        means = group.mean(axis=1)
+        avg_return[selected] = means
+        variance[selected] = ((group - means[:, None]) ** 2).mean(axis=1)
+    daily_vol = variance ** 0.5
+    annual_vol = daily_vol * (TRADING_DAYS ** 0.5)
+
+    max_gain = np.where(valid, returns, -np.inf).max(axis=1, initial=-np.inf)
+    max_loss = np.where(valid, returns, np.inf).min(axis=1, initial=np.inf)
+
+    levels = np.select([annual_vol < 20, annual_vol < 35],
+                       ["Low Volatility - Stable Stock", "Moderate Volatility - Normal Risk"],
+                       "High Volatility - Risky Stock").astype(object)
+    levels[~has_returns] = None
+
+    # Python round() semantics, like analyze_volatility
+    return {
+        'daily_volatility': round_returns(daily_vol, 2),
+        'annualized_volatility': round_returns(annual_vol, 1),
+        'avg_daily_return': round_returns(avg_return, 2),
+        'max_gain': round_returns(np.where(has_returns, max_gain, np.nan), 2),
+        'max_loss': round_returns(np.where(has_returns, max_loss, np.nan), 2),
+        'volatility_level': levels
+    }
+
+
+def batch_run_stats(returns):
+    """
+    Run statistics of every row, matching analyze_runs over the row's
+    non-missing returns.
+
+    All rows are run-length encoded together: the non-missing direction codes
+    are laid end to end, and a new run starts wherever the direction or the
+    row changes. Per-row totals then come from bincount and maximum.at.
+
+    Returns:
+        dict: Arrays (one value per row) avg_upward_run, avg_downward_run,
+              max_upward_run, max_downward_run, current_run (0 for rows
+              without returns) and current_run_type (object array, None for
+              rows without returns)
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    rows = returns.shape[0]
+    valid = ~np.isnan(returns)
+
+    # Row-major order keeps each row's days together and in date order
+    row_ids = np.nonzero(valid)[0]
+    codes = np.sign(returns[valid]).astype(np.int8)
+
+    zeros = np.zeros(rows, dtype=np.int64)
+    result = {
+        'avg_upward_run': np.zeros(rows),
+        'avg_downward_run': np.zeros(rows),
+        'max_upward_run': zeros.copy(),
+        'max_downward_run': zeros.copy(),
+        'current_run': zeros.copy(),
+        'current_run_type': np.full(rows, None, dtype=object)
+    }
+    if len(codes) == 0:
+        return result
+
+    run_starts = np.concatenate(([0], np.flatnonzero((np.diff(codes) != 0) | (np.diff(row_ids) != 0)) + 1))
+    run_lengths = np.diff(np.append(run_starts, len(codes)))
+    run_rows = row_ids[run_starts]
+    run_directions = codes[run_starts]
+
+    for direction, name in ((1, 'upward'), (-1, 'downward')):
+        selected = run_directions == direction
+        totals = np.bincount(run_rows[selected], weights=run_lengths[selected], minlength=rows)
+        counts = np.bincount(run_rows[selected], minlength=rows)
+        maxima = zeros.copy()
+        np.maximum.at(maxima, run_rows[selected], run_lengths[selected])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result[f'avg_{name}_run'] = np.where(counts > 0, round_returns(totals / counts, 1), 0.0)
+        result[f'max_{name}_run'] = maxima
+
+    # The last run of each row is its current run
+    last_runs = np.flatnonzero(np.append(run_rows[1:] != run_rows[:-1], True))
+    result['current_run'][run_rows[last_runs]] = run_lengths[last_runs]
+    names = np.array([DIRECTION_NAMES[-1], DIRECTION_NAMES[0], DIRECTION_NAMES[1]], dtype=object)
+    result['current_run_type'][run_rows[last_runs]] = names[run_directions[last_runs] + 1]
+
+    return result
+
+
+def batch_max_profit(closes):
+    """
+    Best single buy-sell trade of every row, with the same tie-breaking as
+    max_profit_indices (earliest sell day, first occurrence of the lowest buy).
+
+    Returns:
+        dict: Arrays (one value per row) max_profit (0.0 without a profitable
+              trade), buy_index and sell_index (-1 without a profitable trade)
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    rows, days = closes.shape
+    if days < 2:
+        return {'max_profit': np.zeros(rows), 'buy_index': np.full(rows, -1), 'sell_index': np.full(rows, -1)}
+
+    # Lowest price so far, and the day it was first reached; NaN prices don't lower it
+    running_min = np.fmin.accumulate(closes, axis=1)
+    previous_min = np.concatenate((np.full((rows, 1), np.inf), running_min[:, :-1]), axis=1)
+    new_low = closes < previous_min
+    low_day = np.maximum.accumulate(np.where(new_low, np.arange(days), 0), axis=1)
+
+    profits = closes - running_min
+    profits[np.isnan(profits)] = -np.inf
+
+    sell_index = np.argmax(profits, axis=1)
+    profit = profits[np.arange(rows), sell_index]
+    buy_index = low_day[np.arange(rows), sell_index]
+
+    profitable = profit > 0
+    return {
+        'max_profit': np.where(profitable, profit, 0.0),
+        'buy_index': np.where(profitable, buy_index, -1),
+        'sell_index': np.where(profitable, sell_index, -1)
+    }
+
+
+def screen_universe(closes, tickers, dates=None, sma_windows=(20, 50, 200)):
+    """
+    Compute the screening table for a whole universe at once.
+
+    Args:
+        closes: 2-D array from close_matrix, one row per ticker
+        tickers: Ticker symbols, one per row
+        dates: Optional DatetimeIndex of the columns, used for the trade dates
+        sma_windows: SMA windows whose latest value is reported
+
+    Returns:
+        pd.DataFrame: One row per ticker (indexed by ticker) with the last
+                      close, latest SMAs, volatility, run and max-profit statistics
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    if closes.ndim != 2 or closes.shape[0] != len(tickers):
+        raise ValueError("Closing prices must have one row per ticker")
+
+    returns = batch_daily_returns(closes)
+
+    # Last non-missing close of every row
+    has_close = ~np.isnan(closes)
+    last_day = closes.shape[1] - 1 - np.argmax(has_close[:, ::-1], axis=1)
+    last_close = np.where(has_close.any(axis=1), closes[np.arange(len(closes)), last_day], np.nan)
+
+    table = pd.DataFrame({'last_close': round_returns(last_close, 2)}, index=pd.Index(tickers, name='ticker'))
+
+    for window in sma_windows:
+        table[f'sma_{window}'] = round_returns(batch_sma(closes, window)[:, -1], 2)
+
+    for name, values in batch_volatility(returns).items():
+        table[name] = values
+
+    run_stats = batch_run_stats(returns)
+    for name, values in run_stats.items():
+        table[name] = values
+    table['current_up_run'] = np.where(run_stats['current_run_type'] == 'up', run_stats['current_run'], 0)
+
+    trades = batch_max_profit(closes)
+    table['max_profit'] = round_returns(trades['max_profit'], 2)
+    if dates is not None:
+        day_labels = np.asarray(pd.DatetimeIndex(dates).strftime("%Y-%m-%d"), dtype=object)
+        profitable = trades['sell_index'] >= 0
+        table['buy_date'] = np.where(profitable, day_labels[trades['buy_index']], None)
+        table['sell_date'] = np.where(profitable, day_labels[trades['sell_index']], None)
+
+    return table
+
+
+def rank_universe(table, by, ascending=False, top=None):
+    """
+    Rank a screening table by one column, e.g. 'annualized_volatility' or
+    'current_up_run'. Rows where the column is missing are dropped.
+
+    Args:
+        table: DataFrame from screen_universe
+        by: Column to rank by
+        ascending: Rank the smallest values first instead of the largest
+        top: Keep only the first `top` rows
+
+    Returns:
+        pd.DataFrame: Sorted table with a 1-based 'rank' column first
+    """
+    if by not in table.columns:
+        raise ValueError(f"Unknown screening column: {by}")
+
+    ranked = table.dropna(subset=[by]).sort_values(by, ascending=ascending, kind="stable")
+    if top is not None:
+        ranked = ranked.head(int(top))
+
+    ranked.insert(0, 'rank', np.arange(1, len(ranked) + 1))
+    return ranked
@@ -1,6 +1,11 @@
 import yfinance as yf
+import numpy as np
 import pandas as pd
 
+# Compact int8 encoding of run directions (the sign of the return)
+DIRECTION_CODES = {'up': 1, 'down': -1, 'flat': 0}
+DIRECTION_NAMES = {1: 'up', -1: 'down', 0: 'flat'}
+
 
 def calculate_directions(returns):
     """
@@ -63,6 +68,77 @@ def calculate_runs(directions):
     return runs
 
 
+def direction_codes(returns):
+    """
+    Encode daily returns as an int8 array of directions: 1 up, -1 down, 0 flat.
+    Missing returns are dropped, like calculate_directions does.
+    
+    Args:
+        returns: List or array of daily percentage changes (None/NaN for missing data)
+        
+    Returns:
+        np.ndarray: int8 array of direction codes
+    """
+    
+    if len(returns) == 0:
+        raise ValueError("No data for analysis")
+    
+    values = np.asarray(returns, dtype=np.float64)
+    
+    return np.sign(values[~np.isnan(values)]).astype(np.int8)
+
+
+def calculate_run_arrays(codes):
+    """
+    Run-length encode direction codes without building a Python object per run.
+    
+    Args:
+        codes: int8 array from direction_codes
+    
+    Returns:
+        tuple: Parallel arrays (run_directions, run_lengths, run_starts), where
+               run_starts indexes the first element of each run in codes
+    """
+    
+    codes = np.asarray(codes)
+    if len(codes) == 0:
+        raise ValueError("No data for analysis")
+    
+    # A new run starts wherever the direction changes
+    run_starts = np.concatenate(([0], np.flatnonzero(np.diff(codes)) + 1))
+    run_lengths = np.diff(np.append(run_starts, len(codes)))
+    run_directions = codes[run_starts]
+    
+    return run_directions, run_lengths, run_starts
+
+
+def run_tuples(run_directions, run_lengths):
+    """
+    Convert run arrays back to the list of (direction, streak_length) tuples
+    that calculate_runs returns.
+    """
+    
+    return [(DIRECTION_NAMES[int(code)], int(length)) for code, length in zip(run_directions, run_lengths)]
+
+
+def as_run_arrays(runs):
+    """
+    Accept either the arrays of calculate_run_arrays or the list of
+    (direction, streak_length) tuples of calculate_runs, and return arrays.
+    
+    Returns:
+        tuple: (run_directions, run_lengths, run_starts)
+    """
+    
+    if isinstance(runs, tuple) and len(runs) == 3 and isinstance(runs[0], np.ndarray):
+        return runs
+    
+    run_directions = np.array([DIRECTION_CODES[direction] for direction, _ in runs], dtype=np.int8)
+    run_lengths = np.array([streak for _, streak in runs], dtype=np.int64)
+    run_starts = np.concatenate(([0], np.cumsum(run_lengths)[:-1])).astype(np.int64)
+    return run_directions, run_lengths, run_starts
+
+
 def analyze_runs(runs):
     """
     Produce run statistics including average and maximum run lengths.
@@ -77,19 +153,38 @@ def analyze_runs(runs):
     if not runs:
         raise ValueError("No run data provided")
     
-    upward_runs = [streak for direction, streak in runs if direction == 'up']
-    downward_runs = [streak for direction, streak in runs if direction == 'down']
+    directions, streaks = zip(*runs)
+    run_directions = np.array([DIRECTION_CODES[direction] for direction in directions], dtype=np.int8)
+    
+    return analyze_run_arrays(run_directions, np.array(streaks))
+
+
+def analyze_run_arrays(run_directions, run_lengths):
+    """
+    Produce run statistics straight from the arrays of calculate_run_arrays.
+    
+    Args:
+        run_directions: Array of run direction codes
+        run_lengths: Array of run lengths
+    
+    Returns:
+        dict: Contains average and maximum run lengths, current run details
+    """
+    
+    if len(run_lengths) == 0:
+        raise ValueError("No run data provided")
     
-    avg_upward = sum(upward_runs) / len(upward_runs) if upward_runs else 0
-    avg_downward = sum(downward_runs) / len(downward_runs) if downward_runs else 0
+    upward_runs = run_lengths[run_directions == 1]
+    downward_runs = run_lengths[run_directions == -1]
     
-    current_direction, current_streak = runs[-1]
+    avg_upward = upward_runs.sum() / len(upward_runs) if len(upward_runs) else 0
+    avg_downward = downward_runs.sum() / len(downward_runs) if len(downward_runs) else 0
     
     return {
-        "avg_upward_run": round(avg_upward, 1),
-        "avg_downward_run":round(avg_downward, 1),
-        "max_upward_run": max(upward_runs) if upward_runs else 0,
-        "max_downward_run": max(downward_runs) if downward_runs else 0,
-        "current_run": current_streak,
-        "current_run_type": current_direction
-    }
\ No newline at end of file
+        "avg_upward_run": round(float(avg_upward), 1),
+        "avg_downward_run": round(float(avg_downward), 1),
+        "max_upward_run": int(upward_runs.max()) if len(upward_runs) else 0,
+        "max_downward_run": int(downward_runs.max()) if len(downward_runs) else 0,
+        "current_run": int(run_lengths[-1]),
+        "current_run_type": DIRECTION_NAMES[int(run_directions[-1])]
+    }
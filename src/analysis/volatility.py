@@ -1,36 +1,152 @@
+import numpy as np
+import pandas as pd
+
+# Trading days per year, used to annualize daily volatility
+TRADING_DAYS = 252
+
+# RiskMetrics decay factor for daily data
+RISKMETRICS_DECAY = 0.94
+
+# How close (in units of the last rounded digit) a one-pass figure may come to a
+# rounding tie or a category boundary before the two-pass result is computed
+BOUNDARY_TOLERANCE = 1e-6
+
+# Annualized volatility where categorize_volatility changes category
+CATEGORY_BOUNDARIES = (20, 35)
+
+
 def analyze_volatility(returns):
     """
     Analyze volatility from your daily returns function
     
     Args:
-        returns: List of daily returns (with None for first day)
+        returns: List of daily returns (with None for first day), or an
+                 array with NaN for missing returns
         
     Returns:
         dict: Key volatility statistics
     """
     
-    clean_returns = [r for r in returns if r is not None]
+    # None becomes NaN in the float conversion
+    values = np.asarray(returns, dtype=np.float64)
+    clean_returns = values[~np.isnan(values)]
     
-    if not clean_returns:
+    if len(clean_returns) == 0:
         return None
     
-    avg_return = sum(clean_returns) / len(clean_returns)
+    avg_return = float(clean_returns.mean())
     
-    squared_diffs = [(r - avg_return) ** 2 for r in clean_returns]
-    variance = sum(squared_diffs) / len(squared_diffs)
+    squared_diffs = (clean_returns - avg_return) ** 2
+    variance = float(squared_diffs.mean())
     daily_vol = variance ** 0.5
     
-    annual_vol = daily_vol * (252 ** 0.5)
+    annual_vol = daily_vol * (TRADING_DAYS ** 0.5)
     
     return {
         'daily_volatility': round(daily_vol, 2),
         'annualized_volatility': round(annual_vol, 1),
         'avg_daily_return': round(avg_return, 2),
-        'max_gain': round(max(clean_returns), 2),
-        'max_loss': round(min(clean_returns), 2),
+        'max_gain': round(float(clean_returns.max()), 2),
+        'max_loss': round(float(clean_returns.min()), 2),
         'volatility_level': categorize_volatility(annual_vol)
     }
 
+def rolling_volatility(returns, window):
+    """
+    Annualized rolling volatility (population standard deviation, like
+    analyze_volatility) over a trailing window, in one vectorized pass.
+    
+    Args:
+        returns: List or array of daily returns in percent (None/NaN for missing)
+        window: Number of returns per window
+        
+    Returns:
+        np.ndarray: Annualized volatility in percent, aligned with returns;
+                    NaN until the window is full and wherever it contains missing data
+    """
+    
+    values = np.asarray(returns, dtype=np.float64)
+    window = int(window)
+    if window <= 0:
+        raise ValueError("Window size must be a positive number")
+    
+    n = len(values)
+    result = np.full(n, np.nan)
+    if window > n:
+        return result
+    
+    missing = np.isnan(values)
+    if missing.all():
+        return result
+    
+    # Centre first so the sum-of-squares formula doesn't lose precision
+    centred = np.where(missing, 0.0, values - np.nanmean(values))
+    
+    sums = np.concatenate(([0.0], np.cumsum(centred)))
+    squares = np.concatenate(([0.0], np.cumsum(centred ** 2)))
+    missing_count = np.concatenate(([0], np.cumsum(missing)))
+    
+    window_mean = (sums[window:] - sums[:-window]) / window
+    window_var = (squares[window:] - squares[:-window]) / window - window_mean ** 2
+    window_missing = missing_count[window:] - missing_count[:-window]
+    
+    daily_vol = np.sqrt(np.maximum(window_var, 0.0))
+    result[window - 1:] = np.where(window_missing == 0, daily_vol * np.sqrt(TRADING_DAYS), np.nan)
+    
+    return result
+
+
+def ewma_volatility(returns, decay=RISKMETRICS_DECAY):
+    """
+    Annualized RiskMetrics-style EWMA volatility:
+    variance_t = decay * variance_(t-1) + (1 - decay) * return_t ** 2
+    
+    Args:
+        returns: List or array of daily returns in percent (None/NaN for missing)
+        decay: Decay factor lambda, between 0 and 1
+        
+    Returns:
+        np.ndarray: Annualized volatility in percent, aligned with returns;
+                    missing returns carry the previous estimate forward
+    """
+    
+    if not 0 < decay < 1:
+        raise ValueError("Decay must be between 0 and 1")
+    
+    squared = pd.Series(np.asarray(returns, dtype=np.float64) ** 2)
+    
+    # Zero-mean variance recursion, seeded with the first squared return
+    variance = squared.ewm(alpha=1 - decay, adjust=False).mean().to_numpy()
+    
+    return np.sqrt(variance) * np.sqrt(TRADING_DAYS)
+
+
+def volatility_series(returns, windows=(20, 60, 252), decay=RISKMETRICS_DECAY):
+    """
+    Build the rolling and EWMA volatility time series for charting.
+    Windows longer than the data are skipped.
+    
+    Args:
+        returns: List or array of daily returns in percent
+        windows: Rolling window sizes
+        decay: EWMA decay factor
+        
+    Returns:
+        dict: Label (e.g. '20d', 'EWMA (0.94)') -> annualized volatility array
+    """
+    
+    values = np.asarray(returns, dtype=np.float64)
+    available = np.count_nonzero(~np.isnan(values))
+    
+    series = {}
+    for window in windows:
+        if window <= available:
+            series[f'{window}d'] = rolling_volatility(values, window)
+    series[f'EWMA ({decay})'] = ewma_volatility(values, decay)
+    
+    return series
+
+
 def categorize_volatility(annual_vol):
     """
     Categorize volatility level based on annualized volatility
@@ -47,4 +163,27 @@ def categorize_volatility(annual_vol):
     elif annual_vol < 35:
         return "Moderate Volatility - Normal Risk"
     else:
-        return "High Volatility - Risky Stock"
\ No newline at end of file
+        return "High Volatility - Risky Stock"
+
+
+def near_boundary(avg_return, daily_vol, annual_vol):
+    """
+    Check whether volatility figures from a one-pass formula (running or
+    prefix sums) lie so close to a rounding tie or a category boundary that
+    the two-pass figures of analyze_volatility could round or categorize
+    differently. Away from boundaries both give the same result.
+    
+    Args:
+        avg_return: Mean daily return in percent
+        daily_vol: Daily volatility in percent
+        annual_vol: Annualized volatility in percent
+    
+    Returns:
+        bool: True when analyze_volatility should be run to get the exact result
+    """
+    
+    for value, decimals in ((avg_return, 2), (daily_vol, 2), (annual_vol, 1)):
+        scaled = value * 10 ** decimals
+        if abs(scaled - np.floor(scaled) - 0.5) < BOUNDARY_TOLERANCE:
+            return True
+    return any(abs(annual_vol - boundary) < BOUNDARY_TOLERANCE for boundary in CATEGORY_BOUNDARIES)
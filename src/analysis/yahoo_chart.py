@@ -0,0 +1,210 @@
+import asyncio
+import gzip
+import json
+import os
+import ssl
+from urllib.parse import urlencode, urlsplit, quote
+
+import numpy as np
+import pandas as pd
+
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.price_cache import PRICE_COLUMNS
+
+# Yahoo Finance chart endpoint (the one yfinance downloads history from), override with YAHOO_CHART_URL
+YAHOO_CHART_URL = os.environ.get("YAHOO_CHART_URL", "https://query1.finance.yahoo.com/v8/finance/chart/")
+
+# Seconds a whole chart request may take
+DEFAULT_TIMEOUT = float(os.environ.get("YAHOO_FETCH_TIMEOUT", 20))
+
+# Yahoo rejects requests without a browser-like User-Agent
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+
+_ssl_context = None
+
+
+class HTTPError(Exception):
+    """
+    A non-2xx HTTP response, with its status code and body.
+    """
+
+    def __init__(self, status, body=b""):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.body = body
+
+
+async def http_get(url, timeout=None, headers=None):
+    """
+    Minimal non-blocking HTTP/1.1 GET over asyncio streams (one connection
+    per request, gzip and chunked responses supported).
+
+    Args:
+        url: http:// or https:// URL
+        timeout: Seconds for the whole exchange, defaults to DEFAULT_TIMEOUT
+        headers: Optional extra request headers
+
+    Returns:
+        tuple: (status code, dict of lower-case response headers, body bytes)
+    """
+    global _ssl_context
+    parts = urlsplit(url)
+    https = parts.scheme == "https"
+    if https and _ssl_context is None:
+        _ssl_context = ssl.create_default_context()
+
+    target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    request_headers = {"Host": parts.netloc, "User-Agent": USER_AGENT, "Accept": "application/json",
+                       "Accept-Encoding": "gzip", "Connection": "close", **(headers or {})}
+    request = f"GET {target} HTTP/1.1\r\n" + "".join(f"{name}: {value}\r\n" for name, value in request_headers.items())
+
+    async def exchange():
+        reader, writer = await asyncio.open_connection(parts.hostname, parts.port or (443 if https else 80),
+                                                       ssl=_ssl_context if https else None)
+        try:
+            writer.write((request + "\r\n").encode("latin-1"))
+            await writer.drain()
+            return await _read_response(reader)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+
+    return await asyncio.wait_for(exchange(), DEFAULT_TIMEOUT if timeout is None else timeout)
+
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    try:
+        status = int(status_line.split()[1])
+    except (IndexError, ValueError):
+        raise ConnectionError(f"Malformed HTTP status line: {status_line!r}")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        body = b"".join(chunks)
+    elif "content-length" in headers:
+        body = await reader.readexactly(int(headers["content-length"]))
+    else:
+        body = await reader.read()
+
+    if headers.get("content-encoding", "").lower() == "gzip":
+        body = gzip.decompress(body)
+
+    return status, headers, body
+
+
+def chart_url(ticker, period=None, start=None, end=None, base_url=None):
+    """
+    Build the daily chart URL for a period or a date range, mirroring the
+    yfinance history() arguments (end is exclusive).
+    """
+    query = {"interval": "1d", "events": "div,splits", "includePrePost": "false"}
+    if start:
+        end = pd.Timestamp(end, tz="UTC") if end else pd.Timestamp.now(tz="UTC")
+        query["period1"] = int(pd.Timestamp(start, tz="UTC").timestamp())
+        query["period2"] = int(end.timestamp())
+    else:
+        query["range"] = period or "max"
+
+    return (base_url or YAHOO_CHART_URL) + quote(ticker, safe="") + "?" + urlencode(query)
+
+
+def parse_chart(payload):
+    """
+    Convert a chart API response into OHLCV history shaped like yfinance's
+    history(): bars dated at midnight in the exchange timezone, prices
+    adjusted for splits and dividends, plus Dividends and Stock Splits columns.
+
+    Args:
+        payload: Decoded chart JSON
+
+    Returns:
+        pd.DataFrame: Raw history (empty when the symbol has no data)
+    """
+    results = (payload.get("chart") or {}).get("result") or []
+    if not results or not results[0].get("timestamp"):
+        return pd.DataFrame(columns=PRICE_COLUMNS)
+
+    result = results[0]
+    tz = (result.get("meta") or {}).get("exchangeTimezoneName")
+    index = pd.to_datetime(np.asarray(result["timestamp"], dtype=np.int64), unit="s", utc=True)
+    if tz:
+        index = index.tz_convert(tz)
+    index = pd.DatetimeIndex(index.normalize(), name="Date")
+
+    quote_data = result["indicators"]["quote"][0]
+    data = pd.DataFrame({
+        column: np.array(quote_data.get(column.lower()) or [None] * len(index), dtype=np.float64)
+        for column in ("Open", "High", "Low", "Close", "Volume")
+    }, index=index)
+
+    # Adjust like yfinance's default auto_adjust=True
+    adjusted = ((result["indicators"].get("adjclose") or [{}])[0]).get("adjclose")
+    if adjusted:
+        ratio = np.array(adjusted, dtype=np.float64) / data["Close"].to_numpy()
+        for column in ("Open", "High", "Low", "Close"):
+            data[column] = data[column].to_numpy() * ratio
+
+    events = result.get("events") or {}
+    data["Dividends"] = _event_column(events.get("dividends"), index, tz, lambda event: event["amount"])
+    data["Stock Splits"] = _event_column(events.get("splits"), index, tz,
+                                         lambda event: event["numerator"] / event["denominator"])
+
+    # Like yfinance (keepna=False): whole volumes, and no bars without any data
+    data["Volume"] = data["Volume"].fillna(0).astype(np.int64)
+    empty = (data.isna() | (data == 0)).all(axis=1)
+    data = data[~empty.to_numpy()]
+
+    # The live bar can appear twice, keep the latest copy
+    return data[~data.index.duplicated(keep="last")]
+
+
+def _event_column(events, index, tz, value):
+    column = pd.Series(0.0, index=index)
+    for event in (events or {}).values():
+        day = pd.Timestamp(event["date"], unit="s", tz="UTC")
+        day = (day.tz_convert(tz) if tz else day).normalize()
+        if day in column.index:
+            column[day] = value(event)
+    return column.to_numpy()
+
+
+async def fetch_chart(ticker, period=None, start=None, end=None, base_url=None, timeout=None):
+    """
+    Download a ticker's daily history from the Yahoo chart API without
+    blocking the event loop. Takes the same arguments as yfinance_fetch, so
+    it can stand in for it in the async price cache path.
+
+    Returns:
+        pd.DataFrame: Raw OHLCV history, empty for an unknown symbol
+
+    Raises:
+        HTTPError: For error responses other than an unknown symbol
+    """
+    status, _, body = await http_get(chart_url(ticker, period=period, start=start, end=end, base_url=base_url),
+                                     timeout=timeout)
+
+    if status == 404:
+        return pd.DataFrame(columns=PRICE_COLUMNS)
+    if status != 200:
+        raise HTTPError(status, body)
+
+    # Decoding a long history takes milliseconds, keep it off the event loop
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, lambda: parse_chart(json.loads(body)))
@@ -0,0 +1,318 @@
+"""
+Command-line batch analysis over many tickers.
+
+Runs the same fetch and analysis chain as the web app for every ticker in a
+process pool, writes one result file per ticker and records progress in a
+JSONL checkpoint, so an interrupted run picks up where it stopped.
+
+Example:
+    python -m INF1002_Stock_Market_Trend_Analysis.src.batch_runner AAPL MSFT --period 5y --output-dir results
+    python -m INF1002_Stock_Market_Trend_Analysis.src.batch_runner --tickers-file sp500.txt \\
+        --start 2015-01-01 --end 2025-01-01 --format parquet --workers 8
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.price_providers import create_provider, set_provider
+from INF1002_Stock_Market_Trend_Analysis.src.pipeline import fetch_data, analyze_data
+
+# Name of the progress file written next to the results
+CHECKPOINT_NAME = "checkpoint.jsonl"
+
+# Result file formats
+FORMATS = ("json", "parquet")
+
+
+def init_worker(provider_name=None, data_dir=None):
+    """
+    Configure the price provider in a worker process, like app.py does at startup.
+    """
+    if provider_name:
+        set_provider(create_provider(provider_name, data_dir=data_dir))
+
+
+def analyze_ticker(symbol, period=None, start_date=None, end_date=None, sma_windows=(20, 50, 200)):
+    """
+    Fetch and analyze one ticker, timing each stage.
+
+    Args:
+        symbol: Stock ticker symbol
+        period: Data period (e.g. '1y'), used when no date range is given
+        start_date: Start date of the range ('YYYY-MM-DD')
+        end_date: End date of the range ('YYYY-MM-DD', exclusive)
+        sma_windows: Tuple of (short, medium, long) SMA window sizes
+
+    Returns:
+        dict: symbol, status ('ok' or 'error'), error message, per-stage
+              timings in seconds, summary statistics and the daily series
+    """
+    timings = {}
+    try:
+        started = time.perf_counter()
+        data = fetch_data(symbol, period=period, start_date=start_date, end_date=end_date)
+        timings['fetch'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        analysis = analyze_data(data, sma_windows)
+        timings['analyze'] = time.perf_counter() - started
+    except Exception as e:
+        return {'symbol': symbol, 'status': 'error', 'error': str(e), 'timings': timings}
+
+    sma_data = analysis['sma_data']
+    series = {
+        'date': analysis['dates'],
+        'close': analysis['closing_prices'],
+        'daily_return': analysis['returns'],
+    }
+    for key in ('short', 'medium', 'long'):
+        series[f"sma_{sma_data[key]['period']}"] = sma_data[key]['values']
+
+    summary = {
+        'rows': len(analysis['dates']),
+        'first_date': analysis['dates'][0],
+        'last_date': analysis['dates'][-1],
+        'last_close': analysis['closing_prices'][-1],
+        'sma': {sma_data[key]['period']: sma_data[key]['values'][-1] for key in ('short', 'medium', 'long')},
+        'max_profit': analysis['max_profit'],
+        'trades': analysis['trades'],
+        'volatility': analysis['volatility'],
+        'run_stats': analysis['run_stats'],
+    }
+
+    return {'symbol': symbol, 'status': 'ok', 'error': None, 'timings': timings,
+            'summary': summary, 'series': series}
+
+
+def _json_default(value):
+    # NumPy scalars and arrays as plain Python values, NaN stays NaN
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_values(values):
+    # Missing values as null rather than the non-standard NaN token
+    values = np.asarray(values)
+    if values.dtype.kind != 'f':
+        return values.tolist()
+    result = values.astype(object)
+    result[np.isnan(values)] = None
+    return result.tolist()
+
+
+def write_result(result, output_dir, file_format="json"):
+    """
+    Write one ticker's result to <output_dir>/<SYMBOL>.json or .parquet.
+
+    JSON files hold the summary and the daily series; Parquet files hold the
+    daily series as a table, with the summary stored as JSON in the file's
+    key-value metadata.
+
+    Returns:
+        str: Path of the written file
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown output format: {file_format}")
+
+    path = os.path.join(output_dir, f"{result['symbol']}.{file_format}")
+
+    if file_format == "json":
+        with open(path, "w") as f:
+            series = {name: _json_values(values) for name, values in result['series'].items()}
+            json.dump({'symbol': result['symbol'], 'summary': result['summary'], 'series': series},
+                      f, default=_json_default)
+    else:
+        table = pd.DataFrame(result['series'])
+        table['date'] = pd.to_datetime(table['date'])
+        table['daily_return'] = pd.to_numeric(table['daily_return'])
+        table.attrs['summary'] = json.dumps(result['summary'], default=_json_default)
+        table.to_parquet(path, index=False)
+
+    return path
+
+
+def read_checkpoint(path):
+    """
+    Return the checkpoint records of a previous run, keyed by symbol (the last
+    record wins). A partly written last line from an interrupted run is ignored.
+    """
+    records = {}
+    if not os.path.exists(path):
+        return records
+
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[record['symbol']] = record
+
+    return records
+
+
+def run_batch(tickers, output_dir, period=None, start_date=None, end_date=None, sma_windows=(20, 50, 200),
+              file_format="json", workers=None, provider_name=None, data_dir=None, resume=True, log=print):
+    """
+    Analyze many tickers in a process pool and write one result file each.
+
+    Tickers already completed in the output directory's checkpoint are
+    skipped when resume is set; failed tickers are retried.
+
+    Args:
+        tickers: Iterable of ticker symbols
+        output_dir: Directory for the result files and the checkpoint
+        period, start_date, end_date, sma_windows: Analysis inputs as in analyze_ticker
+        file_format: 'json' or 'parquet'
+        workers: Number of worker processes (None for one per CPU, 0 to run in this process)
+        provider_name: Price provider for the workers (None keeps the configured one)
+        data_dir: Directory for the 'local' provider
+        resume: Skip tickers the checkpoint records as done
+        log: Function called with progress messages
+
+    Returns:
+        dict: completed, failed and skipped counts, elapsed seconds,
+              throughput in tickers per second and total seconds per stage
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown output format: {file_format}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint_path = os.path.join(output_dir, CHECKPOINT_NAME)
+
+    tickers = list(dict.fromkeys(ticker.strip().upper() for ticker in tickers if ticker.strip()))
+    done = {symbol for symbol, record in read_checkpoint(checkpoint_path).items()
+            if record['status'] == 'ok'} if resume else set()
+    pending = [ticker for ticker in tickers if ticker not in done]
+
+    report = {'completed': 0, 'failed': 0, 'skipped': len(tickers) - len(pending),
+              'stages': {'fetch': 0.0, 'analyze': 0.0, 'write': 0.0}}
+    if report['skipped']:
+        log(f"Resuming: {report['skipped']} of {len(tickers)} tickers already done")
+
+    arguments = dict(period=period, start_date=start_date, end_date=end_date, sma_windows=tuple(sma_windows))
+    started = time.perf_counter()
+
+    # Start on a fresh line if an interrupted run left half a record behind
+    partial_line = False
+    if resume and os.path.exists(checkpoint_path) and os.path.getsize(checkpoint_path) > 0:
+        with open(checkpoint_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            partial_line = f.read(1) != b"\n"
+
+    with open(checkpoint_path, "a" if resume else "w") as checkpoint:
+        if partial_line:
+            checkpoint.write("\n")
+        for number, result in enumerate(_results(pending, arguments, workers, provider_name, data_dir), start=1):
+            if result['status'] == 'ok':
+                write_started = time.perf_counter()
+                try:
+                    result['path'] = write_result(result, output_dir, file_format)
+                except Exception as e:
+                    result.update(status='error', error=f"Write failed: {e}")
+                result['timings']['write'] = time.perf_counter() - write_started
+
+            for stage, seconds in result['timings'].items():
+                report['stages'][stage] += seconds
+
+            if result['status'] == 'ok':
+                report['completed'] += 1
+            else:
+                report['failed'] += 1
+                log(f"{result['symbol']}: {result['error']}")
+
+            # One line per ticker, flushed so progress survives an interruption
+            record = {key: result.get(key) for key in ('symbol', 'status', 'error', 'timings', 'path', 'summary')}
+            checkpoint.write(json.dumps(record, default=_json_default) + "\n")
+            checkpoint.flush()
+
+            elapsed = time.perf_counter() - started
+            log(f"[{number}/{len(pending)}] {result['symbol']} {result['status']} "
+                f"({number / elapsed:.2f} tickers/sec)")
+
+    report['elapsed'] = time.perf_counter() - started
+    processed = report['completed'] + report['failed']
+    report['throughput'] = processed / report['elapsed'] if report['elapsed'] > 0 else 0.0
+
+    return report
+
+
+def _results(tickers, arguments, workers, provider_name, data_dir):
+    # Yield analyze_ticker results as they complete
+    if workers == 0:
+        init_worker(provider_name, data_dir)
+        for ticker in tickers:
+            yield analyze_ticker(ticker, **arguments)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(provider_name, data_dir)) as executor:
+        futures = [executor.submit(analyze_ticker, ticker, **arguments) for ticker in tickers]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the stock analysis for many tickers.")
+    parser.add_argument("tickers", nargs="*", help="Ticker symbols")
+    parser.add_argument("--tickers-file", help="File with one ticker per line (# starts a comment)")
+    parser.add_argument("--period", default="1y", help="Data period, e.g. 1y or 6mo (default: 1y)")
+    parser.add_argument("--start", help="Start date YYYY-MM-DD (with --end, instead of --period)")
+    parser.add_argument("--end", help="End date YYYY-MM-DD")
+    parser.add_argument("--sma", nargs=3, type=int, default=[20, 50, 200], metavar=("SHORT", "MEDIUM", "LONG"),
+                        help="SMA windows (default: 20 50 200)")
+    parser.add_argument("--output-dir", default="batch_results", help="Directory for results and checkpoint")
+    parser.add_argument("--format", choices=FORMATS, default="json", help="Result file format")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: one per CPU, 0 runs in this process)")
+    parser.add_argument("--provider", default=os.environ.get("PRICE_PROVIDER"),
+                        help="Price provider: yfinance, local or synthetic (default: PRICE_PROVIDER)")
+    parser.add_argument("--data-dir", default=os.environ.get("PRICE_DATA_DIR"),
+                        help="Directory for the local provider")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    tickers = list(args.tickers)
+    if args.tickers_file:
+        with open(args.tickers_file) as f:
+            tickers += [line.split("#")[0].strip() for line in f]
+    tickers = [ticker for ticker in tickers if ticker]
+    if not tickers:
+        print("No tickers given", file=sys.stderr)
+        return 2
+
+    if bool(args.start) != bool(args.end):
+        print("Both --start and --end are required for a date range", file=sys.stderr)
+        return 2
+
+    short, medium, long = args.sma
+    if not (0 < short < medium < long):
+        print("SMA windows must be positive and in ascending order", file=sys.stderr)
+        return 2
+
+    report = run_batch(tickers, args.output_dir, period=None if args.start else args.period,
+                       start_date=args.start, end_date=args.end, sma_windows=args.sma,
+                       file_format=args.format, workers=args.workers, provider_name=args.provider,
+                       data_dir=args.data_dir, resume=not args.restart)
+
+    print(f"Done: {report['completed']} completed, {report['failed']} failed, {report['skipped']} skipped "
+          f"in {report['elapsed']:.1f}s ({report['throughput']:.2f} tickers/sec)")
+    for stage, seconds in report['stages'].items():
+        print(f"  {stage:<8} {seconds:8.2f}s total")
+
+    return 1 if report['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Response compression and conditional-GET helpers for the Flask app.
+
+Compression is negotiated from Accept-Encoding: brotli when the optional
+brotli package is installed and the client accepts it, otherwise gzip.
+Compressed responses get their own strong ETag (the uncompressed ETag with
+an encoding suffix), as each encoding is a different representation.
+"""
+import gzip
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Responses smaller than this are sent uncompressed
+MIN_COMPRESS_BYTES = int(os.environ.get("COMPRESS_MIN_BYTES", 1024))
+
+# gzip level, 6 is a good balance of size and speed for multi-megabyte pages
+GZIP_LEVEL = int(os.environ.get("COMPRESS_GZIP_LEVEL", 6))
+
+# brotli quality, 5 compresses better than gzip -6 at a similar speed
+BROTLI_QUALITY = int(os.environ.get("COMPRESS_BROTLI_QUALITY", 5))
+
+COMPRESSIBLE_TYPES = ("text/html", "text/css", "text/plain", "application/json", "application/javascript")
+
+
+def negotiate_encoding(accept_encodings):
+    """
+    Pick the content encoding for a request.
+
+    Args:
+        accept_encodings: The request's werkzeug Accept object (request.accept_encodings)
+
+    Returns:
+        str: 'br', 'gzip' or None for no compression
+    """
+    if brotli is not None and accept_encodings.quality("br") > 0:
+        return "br"
+    if accept_encodings.quality("gzip") > 0:
+        return "gzip"
+    return None
+
+
+def compress(data, encoding):
+    """
+    Compress a response body with 'br' or 'gzip'.
+    """
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Unknown content encoding: {encoding}")
+
+
+def representation_etag(etag, encoding):
+    """
+    The strong ETag of one encoding of a resource, e.g. 'abc' -> 'abc-gzip'.
+    """
+    return f"{etag}-{encoding}" if encoding else etag
+
+
+def is_not_modified(if_none_match, etag):
+    """
+    Whether the client's If-None-Match already names the resource, in any encoding.
+
+    Args:
+        if_none_match: The request's werkzeug ETags object (request.if_none_match)
+        etag: Unquoted ETag of the uncompressed resource
+    """
+    return any(if_none_match.contains(representation_etag(etag, encoding)) for encoding in (None, "gzip", "br"))
+
+
+def compress_response(response, encoding):
+    """
+    Compress a response in place with the negotiated encoding.
+
+    Only complete 200 responses of a compressible type and at least
+    MIN_COMPRESS_BYTES are compressed. A 304 keeps the ETag of the
+    representation the client holds. Responses that carry an ETag or that
+    could be compressed vary on Accept-Encoding.
+
+    Args:
+        response: Flask response
+        encoding: 'br', 'gzip' or None, from negotiate_encoding
+
+    Returns:
+        The same response
+    """
+    etag, weak = response.get_etag()
+    compressible = response.mimetype in COMPRESSIBLE_TYPES
+
+    if compressible or etag:
+        response.vary.add("Accept-Encoding")
+
+    if encoding is None:
+        return response
+
+    if response.status_code == 304:
+        if etag and not weak:
+            response.set_etag(representation_etag(etag, encoding))
+        return response
+
+    if (response.status_code != 200 or not compressible or response.direct_passthrough
+            or "Content-Encoding" in response.headers):
+        return response
+
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_BYTES:
+        return response
+
+    response.set_data(compress(data, encoding))
+    response.headers["Content-Encoding"] = encoding
+    if etag and not weak:
+        response.set_etag(representation_etag(etag, encoding))
+
+    return response
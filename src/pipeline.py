@@ -0,0 +1,528 @@
+import asyncio
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from urllib.parse import quote
+
+import numpy as np
+
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.analysis_frame import AnalysisFrame
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.data_fetcher import (data_fetcher, data_fetcher_async, data_version,
+                                                                          source_version, source_version_async)
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.simple_moving_average import moving_averages
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.daily_returns import daily_returns_array, round_returns
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.up_down_runs import direction_codes, calculate_run_arrays, analyze_run_arrays
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.max_profit import max_profit, max_profit_trades
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.volatility import analyze_volatility, volatility_series
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.range_index import get_range_index
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.result_cache import get_result_cache, make_key
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.memo_cache import get_memo_cache, content_hash
+from INF1002_Stock_Market_Trend_Analysis.src.visualization.create_price_sma_chart import create_price_sma_chart, build_price_sma_chart, sma_range_traces
+from INF1002_Stock_Market_Trend_Analysis.src.visualization.create_price_chart import create_price_chart, build_price_chart, price_range_traces
+from INF1002_Stock_Market_Trend_Analysis.src.visualization.create_run_statistics_chart import create_run_statistics_chart, build_run_statistics_chart
+from INF1002_Stock_Market_Trend_Analysis.src.visualization.create_volatility_chart import create_volatility_chart, build_volatility_chart
+from INF1002_Stock_Market_Trend_Analysis.src.visualization.zoom_pyramid import get_zoom_pyramid
+from INF1002_Stock_Market_Trend_Analysis.src.visualization.downsampling import DEFAULT_POINT_BUDGET
+
+# Number of non-overlapping trades shown on the price chart
+TRADE_COUNT = 3
+
+# Rolling volatility windows (trading days) shown on the volatility chart
+VOLATILITY_WINDOWS = (20, 60, 252)
+
+# Range-data endpoint the price charts refetch from on zoom/pan (see app.range_slice)
+RANGE_URL = "/api/range/{symbol}"
+
+# Largest number of points a single range request may ask for
+MAX_RANGE_POINTS = 10000
+
+# Part of the memo cache keys of the analysis results and the rendered charts;
+# bump when their output changes so results memoized by older code aren't served
+ANALYSIS_VERSION = 1
+CHART_VERSION = 2
+
+# Chart traces a range request can ask for besides the closing price (see query_range)
+RANGE_VIEWS = (None, 'runs', 'sma')
+
+# Dashboard charts, in page order: name -> (figure builder, HTML builder)
+CHARTS = {
+    'price': (build_price_chart, create_price_chart),
+    'price_sma': (build_price_sma_chart, create_price_sma_chart),
+    'run_statistics': (build_run_statistics_chart, create_run_statistics_chart),
+    'volatility': (build_volatility_chart, create_volatility_chart),
+}
+
+# CPUs this process may run on
+_CPUS = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+
+# How the four charts of a request are rendered: 'process' (in parallel worker
+# processes), 'thread' (a thread pool) or 'serial'. The default is 'process'
+# on multi-core machines and 'serial' on a single core, where a pool can't help.
+CHART_EXECUTORS = ("process", "thread", "serial")
+CHART_EXECUTOR = os.environ.get("CHART_EXECUTOR", "process" if _CPUS > 1 else "serial")
+CHART_WORKERS = int(os.environ.get("CHART_WORKERS", min(4, _CPUS)))
+
+# Fail at startup rather than on the first request
+if CHART_EXECUTOR not in CHART_EXECUTORS:
+    raise ValueError(f"Unknown chart executor: {CHART_EXECUTOR} (expected one of {', '.join(CHART_EXECUTORS)})")
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_chart_executor():
+    """
+    Return the shared pool that renders charts, created on first use, or None
+    when CHART_EXECUTOR is 'serial'. Worker processes are spawned rather than
+    forked, since the web server process may already be running threads.
+    """
+    global _executor
+    if CHART_EXECUTOR == "serial":
+        return None
+
+    with _executor_lock:
+        if _executor is None:
+            if CHART_EXECUTOR == "process":
+                _executor = ProcessPoolExecutor(max_workers=CHART_WORKERS,
+                                                mp_context=multiprocessing.get_context("spawn"))
+            elif CHART_EXECUTOR == "thread":
+                _executor = ThreadPoolExecutor(max_workers=CHART_WORKERS, thread_name_prefix="chart")
+            else:
+                raise ValueError(f"Unknown chart executor: {CHART_EXECUTOR}")
+        return _executor
+
+
+def shutdown_chart_executor():
+    """
+    Shut down the chart pool, if one was created, and wait for its workers to
+    exit. Registered with atexit and called from the ASGI lifespan shutdown, so
+    spawned worker processes don't outlive the server.
+    """
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown_chart_executor)
+
+
+def fetch_data(symbol, period=None, start_date=None, end_date=None):
+    """
+    Fetch cleaned price data for a symbol, by period or date range.
+
+    Returns:
+        pd.DataFrame: Cleaned historical stock data
+    """
+    if start_date and end_date:
+        data = data_fetcher(symbol, start_date=start_date, end_date=end_date)
+    else:
+        data = data_fetcher(symbol, period=period)
+
+    if data is None or data.empty:
+        raise ValueError(f"No data found for symbol {symbol}")
+
+    return data
+
+
+def history_index(symbol):
+    """
+    The PriceRangeIndex of a symbol's full history, looked up by the
+    provider's source_version so the history is only loaded and indexed
+    again when it has changed.
+
+    Returns:
+        PriceRangeIndex or None: None when the provider can't tell the
+                                 version without loading the history
+    """
+    version = source_version(symbol)
+    if version is None:
+        return None
+    return get_range_index(symbol, version, lambda: fetch_data(symbol, period="max"))
+
+
+def data_key(data):
+    """
+    Content hash of a price history's timestamps and closing prices. It
+    changes whenever bars are added or revised, so it versions everything
+    derived from the data.
+
+    Returns:
+        str: 32-character hex digest
+    """
+    frame = data if isinstance(data, AnalysisFrame) else AnalysisFrame.from_dataframe(data)
+    return content_hash(frame.timestamps, frame.close)
+
+
+def range_data(symbol, start=None, end=None, points=None, view=None, since=None, until=None, sma_windows=None):
+    """
+    Return the closing price over a visible x-range at the finest resolution
+    of the symbol's zoom pyramid that fits the point budget, plus the traces
+    of one chart for that range when a view is given.
+
+    The pyramid is looked up by the provider's source_version, so a zoom or
+    pan only loads the history when the data has changed.
+
+    Args:
+        symbol: Stock ticker symbol
+        start: Start of the visible range (datetime-like string), None for the beginning
+        end: End of the visible range, None for the end of the history
+        points: Point budget, defaults to CHART_POINT_BUDGET and is capped at MAX_RANGE_POINTS
+        view: 'runs' for the price chart's run traces, 'sma' for the price and SMA traces
+        since: First date of the window the chart was drawn for
+        until: Last date of that window
+        sma_windows: SMA window sizes for the 'sma' view
+
+    Returns:
+        dict: level, x, min, max and close lists (see ZoomPyramid.query), and
+              for a view a 'traces' list of x/y(/customdata) lists in the
+              order of the chart's layout.meta.detail_traces
+    """
+    return query_range(symbol, source_version(symbol), start, end, points, view=view, since=since, until=until,
+                       sma_windows=sma_windows)
+
+
+def query_range(symbol, version, start=None, end=None, points=None, view=None, since=None, until=None,
+                sma_windows=None):
+    """
+    The zoom pyramid step of range_data for a known source version, or None
+    to load the history and version it by its content.
+    """
+    if view not in RANGE_VIEWS:
+        raise ValueError(f"Unknown range view: {view}")
+    if view == 'sma' and (not sma_windows or len(sma_windows) != 3):
+        raise ValueError("All SMA windows are required")
+
+    if version is None:
+        history = fetch_data(symbol, period="max")
+        pyramid = get_zoom_pyramid(symbol, data_version(history), lambda: history)
+    else:
+        pyramid = get_zoom_pyramid(symbol, version, lambda: fetch_data(symbol, period="max"))
+
+    if points is not None:
+        points = min(max(int(points), 3), MAX_RANGE_POINTS)
+
+    result = pyramid.query(start, end, points)
+    if view is None:
+        return result
+
+    # Chart traces from the full-resolution closes of the chart's own window,
+    # sampled at the bars the pyramid level picks
+    first, last, positions = pyramid.sample(start, end, points, since=since, until=until)
+    closes = pyramid.levels[0]['close'][first:last]
+    plot_dates = pyramid.format_dates(pyramid.levels[0]['time'][positions])
+    if view == 'runs':
+        traces = price_range_traces(plot_dates, closes, positions - first)
+    else:
+        traces = sma_range_traces(plot_dates, closes, tuple(int(window) for window in sma_windows),
+                                  positions - first)
+
+    result['traces'] = [{name: _json_list(values) for name, values in trace.items()} for trace in traces]
+    return result
+
+
+def _json_list(values):
+    # NaN as null, which JSON has and Plotly draws as a gap
+    values = np.asarray(values)
+    if values.dtype.kind != 'f':
+        return values.tolist()
+    result = values.astype(object)
+    result[np.isnan(values)] = None
+    return result.tolist()
+
+
+def analyze_data(data, sma_windows, range_index=None):
+    """
+    Run the full analysis chain over cleaned price data.
+
+    Results are memoized on disk by a content hash of the prices, dates and
+    parameters, so the same data is only analyzed once however it was
+    requested (e.g. '1y' and an equivalent date range) and by whichever
+    worker process.
+
+    Args:
+        data: Cleaned DataFrame from data_fetcher, or an AnalysisFrame
+        sma_windows: Tuple of (short, medium, long) SMA window sizes
+        range_index: Optional zero-argument function returning a PriceRangeIndex
+                     (or None) over a history that data is a slice of; volatility
+                     and max profit are then looked up instead of rescanned.
+                     Only called when the analysis isn't memoized yet
+
+    Returns:
+        dict: Inputs for the chart builders (dates, prices, returns, runs and
+              statistics); series are NumPy arrays with NaN for missing values
+    """
+    frame = data if isinstance(data, AnalysisFrame) else AnalysisFrame.from_dataframe(data)
+    sma_windows = tuple(int(window) for window in sma_windows)
+
+    key = content_hash("analysis", ANALYSIS_VERSION, frame.close, frame.timestamps, frame.tz,
+                       sma_windows, TRADE_COUNT, VOLATILITY_WINDOWS)
+
+    return get_memo_cache().get_or_compute(key, lambda: _analyze_frame(frame, sma_windows, range_index))
+
+
+def _analyze_frame(frame, sma_windows, range_index=None):
+    # The uncached analysis chain behind analyze_data
+    sma_short_int, sma_medium_int, sma_long_int = sma_windows
+
+    # One array-backed frame feeds every step, dates are formatted once
+    closing_prices = np.asarray(frame, dtype=np.float64)
+    dates = frame.dates
+
+    # Rounded like daily_returns, without the detour through a list with None
+    returns = round_returns(daily_returns_array(closing_prices))
+    run_directions, run_lengths, run_starts = calculate_run_arrays(direction_codes(returns))
+    run_stats = analyze_run_arrays(run_directions, run_lengths)
+
+    # A slice of an indexed history answers these in O(1)/O(log n), with the same results
+    index = range_index() if range_index is not None else None
+    window = index.positions(frame) if index is not None else None
+    if window is not None:
+        max_profit_data = index.max_profit_between(*window)
+        volatility = index.volatility_between(*window)
+    else:
+        max_profit_data = max_profit(frame)
+        volatility = analyze_volatility(returns)
+
+    trades = max_profit_trades(frame, TRADE_COUNT)
+    rolling_volatility = volatility_series(returns, VOLATILITY_WINDOWS)
+
+    max_window = max(sma_windows)
+    if max_window > len(closing_prices):
+        raise ValueError(f"Largest SMA window ({max_window}) cannot be larger than data length ({len(closing_prices)})")
+
+    # One cumulative sum serves all three windows, already NaN-padded to the price length
+    sma_values = moving_averages(closing_prices, sma_windows)
+
+    sma_data = {
+        'short': {'values': sma_values[sma_short_int], 'period': sma_short_int},
+        'medium': {'values': sma_values[sma_medium_int], 'period': sma_medium_int},
+        'long': {'values': sma_values[sma_long_int], 'period': sma_long_int}
+    }
+
+    return {
+        'dates': dates,
+        'closing_prices': closing_prices,
+        'returns': returns,
+        'run_arrays': (run_directions, run_lengths, run_starts),
+        'run_stats': run_stats,
+        'max_profit': max_profit_data,
+        'trades': trades,
+        'volatility': volatility,
+        'volatility_series': rolling_volatility,
+        'sma_data': sma_data
+    }
+
+
+def figure_json(build, *args, **kwargs):
+    """
+    Build a figure and serialize it with fig.to_json(), which encodes NumPy
+    arrays as base64 typed arrays ({"dtype": "f8", "bdata": ...}) that
+    Plotly.js decodes natively.
+
+    Returns:
+        str: Figure JSON with 'data' and 'layout'
+    """
+    return build(*args, **kwargs).to_json()
+
+
+def _chart_inputs(symbol, analysis):
+    # name -> (args, kwargs, inputs beyond the price data the chart depends on)
+    range_url = RANGE_URL.format(symbol=quote(symbol, safe=""))
+    sma_windows = tuple(analysis['sma_data'][key]['period'] for key in ('short', 'medium', 'long'))
+
+    return {
+        'price': ((analysis['dates'], analysis['closing_prices'], analysis['returns'],
+                   analysis['run_arrays'], symbol, analysis['max_profit'], analysis['trades']),
+                  {'range_url': range_url},
+                  (TRADE_COUNT,)),
+        'price_sma': ((analysis['dates'], analysis['closing_prices'], analysis['sma_data'], symbol),
+                      {'range_url': range_url},
+                      (sma_windows,)),
+        'run_statistics': ((analysis['dates'], analysis['run_arrays'], analysis['run_stats']),
+                           {},
+                           ()),
+        'volatility': ((analysis['dates'], analysis['returns'], analysis['volatility'],
+                        analysis['volatility_series']),
+                       {},
+                       (VOLATILITY_WINDOWS,))
+    }
+
+
+def _render(symbol, analysis, names, output):
+    """
+    Render the named charts as 'html' fragments or figure 'json'.
+
+    Each chart is cached in the memo cache under a key made of the symbol, a
+    hash of the price data and only the inputs that chart uses, so changing
+    the SMA windows re-renders just the SMA chart, and new bars (a different
+    hash) make every chart render afresh. The charts that do need rendering
+    are independent, so they are built concurrently on the chart executor and
+    the request waits roughly as long as the slowest one.
+
+    Returns:
+        dict: Rendered strings keyed by chart name
+    """
+    prices_key = content_hash(analysis['dates'], analysis['closing_prices'])
+    inputs = _chart_inputs(symbol, analysis)
+
+    jobs = {}
+    for name in names:
+        build, create = CHARTS[name]
+        args, kwargs, chart_inputs = inputs[name]
+        if output == "json":
+            function, args = figure_json, (build,) + args
+        else:
+            # A fixed div id (e.g. 'price-sma-plot') keeps re-rendered pages byte-identical
+            function, kwargs = create, dict(kwargs, div_id=name.replace('_', '-') + "-plot")
+        key = content_hash("chart", CHART_VERSION, output, name, symbol, prices_key, DEFAULT_POINT_BUDGET, *chart_inputs)
+        jobs[name] = (key, function, args, kwargs)
+
+    cache = get_memo_cache()
+    charts = {}
+    missing = []
+    for name, (key, function, args, kwargs) in jobs.items():
+        charts[name] = cache.get(key)
+        if charts[name] is None:
+            missing.append(name)
+
+    executor = get_chart_executor()
+    futures = {}
+    if executor is not None:
+        futures = {name: executor.submit(jobs[name][1], *jobs[name][2], **jobs[name][3]) for name in missing}
+
+    for name in missing:
+        key, function, args, kwargs = jobs[name]
+        charts[name] = futures[name].result() if futures else function(*args, **kwargs)
+        cache.set(key, charts[name])
+
+    return charts
+
+
+def render_charts(symbol, analysis):
+    """
+    Render the four dashboard charts from the analysis results as HTML
+    fragments (cached and rendered concurrently, see _render).
+
+    Returns:
+        dict: Chart HTML fragments keyed by template variable name
+    """
+    charts = _render(symbol, analysis, CHARTS, "html")
+    return {f"{name}_chart_html": html for name, html in charts.items()}
+
+
+def chart_figures(symbol, analysis, names=None):
+    """
+    Serialize dashboard charts as Plotly figure JSON for the page to draw
+    with Plotly.react (cached and rendered concurrently, see _render).
+
+    Args:
+        symbol: Stock ticker symbol
+        analysis: Dict from analyze_data
+        names: Chart names from CHARTS, defaults to all four
+
+    Returns:
+        dict: Figure JSON strings keyed by chart name
+    """
+    names = list(CHARTS) if names is None else list(names)
+    unknown = [name for name in names if name not in CHARTS]
+    if unknown:
+        raise KeyError(f"Unknown chart: {unknown[0]}")
+
+    return _render(symbol, analysis, names, "json")
+
+
+def _date_range_index(symbol, start_date, end_date):
+    # Date ranges are slices of the full history, whose index answers their statistics
+    return partial(history_index, symbol) if start_date and end_date else None
+
+
+def run_analysis(symbol, period=None, start_date=None, end_date=None, sma_windows=(20, 50, 200), data=None):
+    """
+    Fetch, analyze and render one request without caching.
+
+    Returns:
+        dict: Chart HTML fragments keyed by template variable name
+    """
+    if data is None:
+        data = fetch_data(symbol, period=period, start_date=start_date, end_date=end_date)
+
+    analysis = analyze_data(data, sma_windows, _date_range_index(symbol, start_date, end_date))
+    return render_charts(symbol, analysis)
+
+
+def cached_analysis(symbol, period=None, start_date=None, end_date=None, sma_windows=(20, 50, 200), data=None):
+    """
+    Same as run_analysis, but served from the in-process result cache.
+    Concurrent identical requests share a single fetch and computation.
+
+    A view that has already fetched the data (e.g. to build its ETag) passes
+    it in: the result is then keyed by that data's data_key, so it is always
+    the analysis of exactly that data and nothing is fetched twice.
+    """
+    key = make_key(symbol, period=period, start_date=start_date, end_date=end_date, sma_windows=sma_windows)
+    if data is not None:
+        key += (data_key(data),)
+
+    return get_result_cache().get_or_compute(
+        key,
+        lambda: run_analysis(symbol, period=period, start_date=start_date,
+                             end_date=end_date, sma_windows=sma_windows, data=data)
+    )
+
+
+def analysis_figures(symbol, period=None, start_date=None, end_date=None, sma_windows=(20, 50, 200), names=None,
+                     data=None):
+    """
+    Fetch and analyze one request like run_analysis, but return Plotly figure
+    JSON instead of HTML. The analysis and each figure come from the memo cache
+    when the price data hasn't changed.
+
+    Args:
+        data: Price data the caller already fetched, analyzed instead of fetching again
+
+    Returns:
+        dict: Figure JSON strings keyed by chart name
+    """
+    if data is None:
+        data = fetch_data(symbol, period=period, start_date=start_date, end_date=end_date)
+
+    analysis = analyze_data(data, sma_windows, _date_range_index(symbol, start_date, end_date))
+    return chart_figures(symbol, analysis, names)
+
+
+async def fetch_data_async(symbol, period=None, start_date=None, end_date=None):
+    """
+    Awaitable fetch_data: the price download doesn't block the event loop.
+
+    Returns:
+        pd.DataFrame: Cleaned historical stock data
+    """
+    if start_date and end_date:
+        data = await data_fetcher_async(symbol, start_date=start_date, end_date=end_date)
+    else:
+        data = await data_fetcher_async(symbol, period=period)
+
+    if data is None or data.empty:
+        raise ValueError(f"No data found for symbol {symbol}")
+
+    return data
+
+
+async def range_data_async(symbol, start=None, end=None, points=None, view=None, since=None, until=None,
+                           sma_windows=None, executor=None):
+    """
+    Awaitable range_data: the source version (and any refresh behind it) is
+    awaited, the zoom pyramid work runs on the executor.
+
+    Returns:
+        dict: level, x, min, max and close lists (see ZoomPyramid.query), and traces for a view
+    """
+    version = await source_version_async(symbol)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(query_range, symbol, version, start, end, points, view=view,
+                                                        since=since, until=until, sma_windows=sma_windows))
@@ -1,91 +1,84 @@
+from urllib.parse import urlencode
+
+import numpy as np
 import plotly.graph_objects as go
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.daily_returns import daily_returns_array, round_returns
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.up_down_runs import as_run_arrays, direction_codes, calculate_run_arrays
+from INF1002_Stock_Market_Trend_Analysis.src.visualization.downsampling import downsample_indices, date_positions
+from INF1002_Stock_Market_Trend_Analysis.src.visualization.zoom_pyramid import relayout_script
+
+# Direction code -> (hover label, line color)
+RUN_STYLES = {
+    1: ("Up", "green"),
+    -1: ("Down", "red"),
+    0: ("Flat", "blue")
+}
 
-def create_price_chart(dates, closing_prices, returns, runs, symbol, max_profit):
+def build_price_chart(dates, closing_prices, returns, runs, symbol, max_profit, trades=None, max_points=None,
+                      range_url=None):
     """
     Create a Plotly chart showing price movements colored by run direction and maximum profit.
     
     Args:
-        dates: List of date strings
-        closing_prices: List of closing prices
-        returns: Pandas Series or list of daily returns
-        runs: List of tuples (direction, streak_length)
+        dates: List or array of date strings
+        closing_prices: List or array of closing prices
+        returns: Pandas Series, list or array of daily returns
+        runs: Run arrays (run_directions, run_lengths, run_starts) from
+              calculate_run_arrays, or a list of tuples (direction, streak_length)
         symbol: Stock symbol string
         max_profit: Dict from max_profit function
+        trades: Optional list of trade dicts from max_profit_trades, drawn as
+                additional trade opportunities
+        max_points: Point budget for the price line, defaults to CHART_POINT_BUDGET
+        range_url: Optional URL of the range-data endpoint; when given, zooming
+                   in refills the run traces at full resolution from it
         
     Returns:
-        HTML string of the Plotly chart
+        plotly Figure
     """
     fig = go.Figure()
     
-    # Build color and streak info arrays
-    colors = []
-    streak_info = []
-    
-    for direction, streak in runs:
-        color = "green" if direction == "up" else "red" if direction == "down" else "blue"
-       
-        for i in range(streak):
-            colors.append(color)
-            streak_info.append({
-                'direction': direction,
-                'streak': streak,
-                'position_in_streak': i + 1
-            })
+    point_directions, point_streaks, point_positions = run_points(runs)
    
     # Determine maximum segments to plot
-    max_segments = min(len(returns), len(colors), len(dates) - 1, len(closing_prices) - 1)
-   
-    # Plot segments grouped by run
-    i = 0
-    while i < max_segments:
-        current_color = colors[i]
-        current_streak_data = streak_info[i]
-       
-        start_idx = i
-        # Group consecutive points in the same run
-        while (i < max_segments and
-               colors[i] == current_color and
-               streak_info[i]['direction'] == current_streak_data['direction'] and
-               streak_info[i]['streak'] == current_streak_data['streak']):
-            i += 1
-       
-        end_idx = i
-       
-        # Extract data for this segment
-        x_data = dates[start_idx:end_idx + 1]
-        y_data = closing_prices[start_idx:end_idx + 1]
-       
-        direction = current_streak_data['direction'].title()
-        streak = current_streak_data['streak']
-       
-        # Build hover text
-        hover_text = []
-        for j in range(len(x_data)):
-            if j < len(x_data) - 1:
-                actual_idx = start_idx + j
-                hover_text.append(
-                    f"Date: {x_data[j]}<br>"
-                    f"Price: ${y_data[j]:.2f}<br>"
-                    f"Direction: {direction}<br>"
-                    f"Streak Length: {streak} days<br>"
-                    f"Day {actual_idx - start_idx + 1} of {streak}"
-                )
-            else:
-                hover_text.append(
-                    f"Date: {x_data[j]}<br>"
-                    f"Price: ${y_data[j]:.2f}"
-                )
-       
-        # Add trace for this run segment
-        fig.add_trace(go.Scatter(
-            x=x_data,
-            y=y_data,
+    max_segments = min(len(returns), len(point_directions), len(dates) - 1, len(closing_prices) - 1)
+    
+    dates_array = np.asarray(dates, dtype=object)
+    prices_array = np.asarray(closing_prices, dtype=np.float64)
+    
+    # Downsample the line, keeping the buy/sell days of the highlighted trades
+    trade_dates = [trade[key] for trade in ([max_profit] if max_profit else []) + list(trades or [])
+                   for key in ('buy_date', 'sell_date')]
+    indices = downsample_indices(prices_array[:max_segments + 1], max_points,
+                                 keep=date_positions(dates, sorted(set(trade_dates))))
+    plot_dates = dates_array[indices]
+    plot_prices = prices_array[indices]
+    
+    # One WebGL trace per direction, runs separated by gaps instead of one trace per run.
+    # A zoomable chart keeps all three, so the page can refill them by position
+    traces = run_traces(plot_dates, plot_prices, point_directions[indices[:-1]], point_streaks[indices[:-1]],
+                        point_positions[indices[:-1]])
+    for code, (direction, color) in RUN_STYLES.items():
+        if len(traces[code]['x']) == 0 and not range_url:
+            continue
+        
+        fig.add_trace(go.Scattergl(
+            x=traces[code]['x'],
+            y=traces[code]['y'],
             mode="lines+markers",
-            line=dict(color=current_color, width=3),
-            marker=dict(size=4, color=current_color),
-            name=f"{direction} Run (Length: {streak})",
-            text=hover_text,
-            hovertemplate="%{text}<extra></extra>",
+            line=dict(color=color, width=3),
+            marker=dict(size=4, color=color),
+            name=f"{direction} Runs",
+            customdata=traces[code]['customdata'],
+            hovertemplate=(
+                "Date: %{x}<br>"
+                "Price: $%{y:.2f}<br>"
+                f"Direction: {direction}<br>"
+                "Streak Length: %{customdata[0]} days<br>"
+                "Day %{customdata[1]} of %{customdata[0]}"
+                "<extra></extra>"
+            ),
+            connectgaps=False,
             showlegend=False
         ))
    
@@ -148,7 +141,8 @@ def create_price_chart(dates, closing_prices, returns, runs, symbol, max_profit)
         ))
        
         # Add annotation showing profit
-        mid_x_idx = dates.index(buy_date) + (dates.index(sell_date) - dates.index(buy_date)) // 2
+        buy_idx, sell_idx = date_positions(dates, [buy_date, sell_date])
+        mid_x_idx = buy_idx + (sell_idx - buy_idx) // 2
         mid_date = dates[mid_x_idx] if mid_x_idx < len(dates) else sell_date
         mid_price = (buy_price + sell_price) / 2
        
@@ -170,6 +164,30 @@ def create_price_chart(dates, closing_prices, returns, runs, symbol, max_profit)
             font=dict(size=11, color="black", family="Arial Black")
         )
    
+    # Add the best non-overlapping trades as one line trace and one marker trace
+    if trades:
+        trade_x = []
+        trade_y = []
+        trade_text = []
+        for number, trade in enumerate(trades, start=1):
+            trade_pct = (trade['max_profit'] / trade['buy_price']) * 100
+            label = f"<b>Trade {number}</b><br>Profit: ${trade['max_profit']:.2f} ({trade_pct:.2f}%)"
+            trade_x += [trade['buy_date'], trade['sell_date'], None]
+            trade_y += [trade['buy_price'], trade['sell_price'], None]
+            trade_text += [f"{label}<br>Buy: {trade['buy_date']}", f"{label}<br>Sell: {trade['sell_date']}", None]
+        
+        fig.add_trace(go.Scatter(
+            x=trade_x,
+            y=trade_y,
+            mode='lines+markers',
+            line=dict(color='darkorange', width=2, dash='dot'),
+            marker=dict(size=9, color='darkorange', symbol='diamond'),
+            name=f'Top {len(trades)} Trades',
+            text=trade_text,
+            hovertemplate='%{text}<extra></extra>',
+            showlegend=True
+        ))
+   
     fig.update_layout(
         title=f'Closing Price over time with Runs and Maximum Profit for {symbol}',
         xaxis_title='Date',
@@ -187,4 +205,127 @@ def create_price_chart(dates, closing_prices, returns, runs, symbol, max_profit)
         )
     )
    
-    return fig.to_html(full_html=False, include_plotlyjs=False)
\ No newline at end of file
+    # Lets the page refetch the run traces (the first three) for the zoomed range,
+    # within the dates this chart was drawn for
+    if range_url:
+        query = urlencode({'view': 'runs', 'since': str(dates[0]), 'until': str(dates[-1])})
+        fig.update_layout(meta=dict(range_url=f"{range_url}?{query}", detail_traces=[0, 1, 2]))
+
+    return fig
+
+
+def create_price_chart(dates, closing_prices, returns, runs, symbol, max_profit, trades=None, max_points=None,
+                       range_url=None, div_id=None):
+    """
+    Render the price chart from build_price_chart as an HTML fragment.
+
+    Args:
+        div_id: Id of the chart\'s div, random when None
+
+    Returns:
+        HTML string of the Plotly chart
+    """
+    fig = build_price_chart(dates, closing_prices, returns, runs, symbol, max_profit, trades=trades,
+                            max_points=max_points, range_url=range_url)
+
+    post_script = relayout_script() if range_url else None
+    return fig.to_html(full_html=False, include_plotlyjs=False, div_id=div_id, post_script=post_script)
+
+
+def run_points(runs):
+    """
+    Per-day run data; entry i belongs to the segment joining price i to price i + 1.
+    
+    Args:
+        runs: Run arrays from calculate_run_arrays, or a list of (direction, streak_length) tuples
+        
+    Returns:
+        tuple: (direction code, streak length, day within the streak) arrays
+    """
+    run_directions, run_lengths, run_starts = as_run_arrays(runs)
+    
+    point_directions = np.repeat(run_directions, run_lengths)
+    point_streaks = np.repeat(run_lengths, run_lengths)
+    point_positions = np.arange(len(point_directions)) - np.repeat(run_starts, run_lengths) + 1
+    
+    return point_directions, point_streaks, point_positions
+
+
+def run_traces(plot_dates, plot_prices, segment_directions, segment_streaks, segment_positions):
+    """
+    Lay out the plotted points as one gap-separated line per direction.
+    Each plotted segment takes the run data of the day it starts on.
+    
+    Returns:
+        dict: Direction code -> x, y (NaN in the gaps) and customdata
+              (streak length, day within the streak) arrays
+    """
+    traces = {}
+    for code in RUN_STYLES:
+        source, segment, gap_slots = _segment_points(segment_directions == code)
+        y_data = plot_prices[source]
+        y_data[gap_slots] = np.nan
+        traces[code] = {
+            'x': plot_dates[source],
+            'y': y_data,
+            'customdata': np.column_stack((segment_streaks[segment], segment_positions[segment]))
+        }
+    return traces
+
+
+def price_range_traces(plot_dates, closing_prices, indices):
+    """
+    The run traces of build_price_chart for a zoomed view, in the order the
+    chart adds them.
+    
+    Args:
+        plot_dates: Dates of the plotted points
+        closing_prices: Every closing price of the window the chart was drawn for
+        indices: Positions of the plotted points in closing_prices, ascending
+        
+    Returns:
+        list: One dict of x, y and customdata arrays per direction
+    """
+    closing_prices = np.asarray(closing_prices, dtype=np.float64)
+    if len(closing_prices) < 2:
+        empty = {'x': np.array([], dtype=object), 'y': np.array([]), 'customdata': np.empty((0, 2))}
+        return [empty] * len(RUN_STYLES)
+    
+    returns = round_returns(daily_returns_array(closing_prices))
+    point_directions, point_streaks, point_positions = run_points(calculate_run_arrays(direction_codes(returns)))
+    
+    # Run data exists up to the last segment, like max_segments in build_price_chart
+    indices = indices[indices <= len(point_directions)]
+    segments = indices[:-1]
+    traces = run_traces(np.asarray(plot_dates, dtype=object)[:len(indices)], closing_prices[indices],
+                        point_directions[segments], point_streaks[segments], point_positions[segments])
+    
+    return [traces[code] for code in RUN_STYLES]
+
+
+def _segment_points(mask):
+    """
+    Lay out the points of every segment i -> i + 1 where mask[i] is set as one
+    polyline, with a gap slot after each block of consecutive segments.
+    
+    Returns:
+        tuple: (source point index per slot, segment index per slot for hover
+                data, positions of the gap slots)
+    """
+    starts = np.append(mask, False)       # point j starts a drawn segment
+    ends = np.insert(mask, 0, False)      # point j ends a drawn segment
+    points = np.flatnonzero(starts | ends)
+    
+    # A block ends at a point that closes a segment without opening the next one
+    gap_after = (ends & ~starts)[points]
+    slots = np.arange(len(points)) + np.cumsum(gap_after) - gap_after
+    gap_slots = slots[gap_after] + 1
+    
+    source = np.empty(len(points) + int(gap_after.sum()), dtype=np.int64)
+    source[slots] = points
+    source[gap_slots] = points[gap_after]
+    
+    # Hover data comes from the segment a point opens, or the one it closes
+    segment = np.where(starts[source], source, source - 1)
+    
+    return source, segment, gap_slots
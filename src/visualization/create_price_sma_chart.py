@@ -1,25 +1,58 @@
+from urllib.parse import urlencode
+
+import numpy as np
 import plotly.graph_objs as go
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.crossovers import find_crossovers, BULLISH, BEARISH
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.simple_moving_average import moving_averages
+from INF1002_Stock_Market_Trend_Analysis.src.visualization.downsampling import downsample_indices
+from INF1002_Stock_Market_Trend_Analysis.src.visualization.zoom_pyramid import relayout_script
+
+# SMAs in order from fastest to slowest, as rows for find_crossovers
+SMA_KEYS = ('short', 'medium', 'long')
+
+# Crossovers drawn on the chart: (fast row, slow row, direction) -> (type, color, label)
+CROSSOVER_STYLES = {
+    (1, 2, BULLISH): ('Golden Cross', 'gold', '★ GC'),
+    (1, 2, BEARISH): ('Death Cross', 'darkred', '✕ DC'),
+    (0, 1, BULLISH): ('Bullish Cross', 'limegreen', '↑'),
+    (0, 1, BEARISH): ('Bearish Cross', 'orangered', '↓'),
+}
 
+# Pairs compared: medium/long (golden and death crosses), then short/medium
+CROSSOVER_PAIRS = [(1, 2), (0, 1)]
 
-def create_price_sma_chart(dates, closing_prices, sma_data, symbol):
+
+def build_price_sma_chart(dates, closing_prices, sma_data, symbol, max_points=None, range_url=None):
     """
     Create a Plotly chart showing closing prices and multiple SMAs with crossover markers.
     
     Args:
-        dates: List of date strings
-        closing_prices: List of closing prices
-        sma_data: Dictionary with 'short', 'medium', 'long' keys, each containing 'values' and 'period'
+        dates: List or array of date strings
+        closing_prices: List or array of closing prices
+        sma_data: Dictionary with 'short', 'medium', 'long' keys, each containing 'values'
+                  (NaN-padded to the length of dates) and 'period'
         symbol: Stock symbol string
+        max_points: Point budget per line, defaults to CHART_POINT_BUDGET
+        range_url: Optional URL of the range-data endpoint; when given, the closing
+                   price and the SMAs are refetched at the zoomed resolution on zoom/pan
         
     Returns:
-        HTML string of the Plotly chart
+        plotly Figure
     """
     fig = go.Figure()
     
+    # Detect crossovers on the full series, before downsampling
+    crossovers = find_crossovers([sma_data[key]['values'] for key in SMA_KEYS], CROSSOVER_PAIRS)
+    
+    # Downsample every line at the same points, keeping the crossover days
+    indices = downsample_indices(closing_prices, max_points, keep=crossovers['index'])
+    dates_array = np.asarray(dates, dtype=object)
+    plot_dates = dates_array[indices]
+    
     # Add closing price trace
     fig.add_trace(go.Scatter(
-        x=dates,
-        y=closing_prices,
+        x=plot_dates,
+        y=np.asarray(closing_prices, dtype=np.float64)[indices],
         mode='lines',
         name='Closing Price',
         line=dict(color='#1f77b4', width=2),
@@ -41,10 +74,10 @@ def create_price_sma_chart(dates, closing_prices, sma_data, symbol):
     
     for key in ['short', 'medium', 'long']:
         period = sma_data[key]['period']
-        values = sma_data[key]['values']
+        values = np.asarray(sma_data[key]['values'], dtype=np.float64)[indices]
         
         fig.add_trace(go.Scatter(
-            x=dates,
+            x=plot_dates,
             y=values,
             mode='lines',
             name=f'{sma_names[key]} SMA ({period})',
@@ -52,31 +85,27 @@ def create_price_sma_chart(dates, closing_prices, sma_data, symbol):
             hovertemplate=f'Date: %{{x}}<br>SMA-{period}: $%{{y:.2f}}<extra></extra>'
         ))
     
-    # Detect crossovers and add markers
-    crossovers = detect_crossovers(
-        dates,
-        sma_data['short']['values'],
-        sma_data['medium']['values'],
-        sma_data['long']['values']
-    )
-    
-    # Add crossover markers
-    for crossover in crossovers:
+    # Add crossover markers, one trace per crossover type
+    for (fast, slow, direction), (crossover_type, color, label) in CROSSOVER_STYLES.items():
+        mask = (crossovers['fast'] == fast) & (crossovers['slow'] == slow) & (crossovers['direction'] == direction)
+        if not mask.any():
+            continue
+        
         fig.add_trace(go.Scatter(
-            x=[crossover['date']],
-            y=[crossover['price']],
+            x=dates_array[crossovers['index'][mask]],
+            y=crossovers['value'][mask],
             mode='markers+text',
-            name=crossover['type'],
+            name=crossover_type,
             marker=dict(
                 size=15,
-                color=crossover['color'],
+                color=color,
                 symbol='star',
                 line=dict(color='white', width=2)
             ),
-            text=[crossover['label']],
+            text=[label] * int(mask.sum()),
             textposition='top center',
-            textfont=dict(size=10, color=crossover['color']),
-            hovertemplate=f"{crossover['type']}<br>Date: {crossover['date']}<br>Price: ${crossover['price']:.2f}<extra></extra>",
+            textfont=dict(size=10, color=color),
+            hovertemplate=f"{crossover_type}<br>Date: %{{x}}<br>Price: $%{{y:.2f}}<extra></extra>",
             showlegend=False
         ))
     
@@ -95,75 +124,83 @@ def create_price_sma_chart(dates, closing_prices, sma_data, symbol):
         )
     )
     
-    return fig.to_html(full_html=False, include_plotlyjs=False)
+    # Lets the page refetch the closing price and the three SMAs (traces 0-3) for
+    # the zoomed range, within the dates this chart was drawn for
+    if range_url:
+        windows = ",".join(str(sma_data[key]['period']) for key in SMA_KEYS)
+        query = urlencode({'view': 'sma', 'since': str(dates[0]), 'until': str(dates[-1]), 'sma': windows})
+        fig.update_layout(meta=dict(range_url=f"{range_url}?{query}", detail_traces=[0, 1, 2, 3]))
+
+    return fig
+
+
+def create_price_sma_chart(dates, closing_prices, sma_data, symbol, max_points=None, range_url=None, div_id=None):
+    """
+    Render the price vs SMA chart from build_price_sma_chart as an HTML fragment.
+
+    Args:
+        div_id: Id of the chart\'s div, random when None
+
+    Returns:
+        HTML string of the Plotly chart
+    """
+    fig = build_price_sma_chart(dates, closing_prices, sma_data, symbol, max_points=max_points, range_url=range_url)
+
+    post_script = relayout_script() if range_url else None
+    return fig.to_html(full_html=False, include_plotlyjs=False, div_id=div_id, post_script=post_script)
+
+
+def sma_range_traces(plot_dates, closing_prices, sma_windows, indices):
+    """
+    The closing price and SMA traces of build_price_sma_chart for a zoomed
+    view, in the order the chart adds them.
+    
+    Args:
+        plot_dates: Dates of the plotted points
+        closing_prices: Every closing price of the window the chart was drawn for,
+                        so the SMAs match the chart's (NaN before a full window)
+        sma_windows: (short, medium, long) SMA window sizes
+        indices: Positions of the plotted points in closing_prices
+        
+    Returns:
+        list: One dict of x and y arrays per trace
+    """
+    closing_prices = np.asarray(closing_prices, dtype=np.float64)
+    sma_values = moving_averages(closing_prices, sma_windows)
+    
+    traces = [{'x': plot_dates, 'y': closing_prices[indices]}]
+    for window in sma_windows:
+        traces.append({'x': plot_dates, 'y': np.asarray(sma_values[window], dtype=np.float64)[indices]})
+    return traces
 
 
 def detect_crossovers(dates, sma_short, sma_medium, sma_long):
     """
     Detect crossover points between SMA lines.
+    List version of find_crossovers, kept for callers that want one dict per event.
     
     Args:
         dates: List of date strings
-        sma_short: List of short SMA values
-        sma_medium: List of medium SMA values
-        sma_long: List of long SMA values
+        sma_short: List or array of short SMA values (None or NaN before the first full window)
+        sma_medium: List or array of medium SMA values
+        sma_long: List or array of long SMA values
         
     Returns:
-        List of crossover dictionaries with date, price, type, color, and label
+        List of crossover dictionaries with date, price, type, color, and label;
+        golden and death crosses first, then short-medium crosses, each in date order
     """
-    crossovers = []
+    crossovers = find_crossovers([sma_short, sma_medium, sma_long], CROSSOVER_PAIRS)
     
-    # Check for Golden Cross and Death Cross (medium crosses long)
-    for i in range(1, len(dates)):
-        # Skip if any value is None
-        if (sma_medium[i] is None or sma_medium[i-1] is None or 
-            sma_long[i] is None or sma_long[i-1] is None):
-            continue
-        
-        # Golden Cross: medium crosses above long
-        if sma_medium[i-1] <= sma_long[i-1] and sma_medium[i] > sma_long[i]:
-            crossovers.append({
-                'date': dates[i],
-                'price': sma_medium[i],
-                'type': 'Golden Cross',
-                'color': 'gold',
-                'label': '★ GC'
-            })
-        
-        # Death Cross: medium crosses below long
-        elif sma_medium[i-1] >= sma_long[i-1] and sma_medium[i] < sma_long[i]:
-            crossovers.append({
-                'date': dates[i],
-                'price': sma_medium[i],
-                'type': 'Death Cross',
-                'color': 'darkred',
-                'label': '✕ DC'
-            })
-    
-    # Check for short-medium crossovers
-    for i in range(1, len(dates)):
-        if (sma_short[i] is None or sma_short[i-1] is None or 
-            sma_medium[i] is None or sma_medium[i-1] is None):
-            continue
-        
-        # Short crosses above medium (bullish)
-        if sma_short[i-1] <= sma_medium[i-1] and sma_short[i] > sma_medium[i]:
-            crossovers.append({
-                'date': dates[i],
-                'price': sma_short[i],
-                'type': 'Bullish Cross',
-                'color': 'limegreen',
-                'label': '↑'
-            })
-        
-        # Short crosses below medium (bearish)
-        elif sma_short[i-1] >= sma_medium[i-1] and sma_short[i] < sma_medium[i]:
-            crossovers.append({
-                'date': dates[i],
-                'price': sma_short[i],
-                'type': 'Bearish Cross',
-                'color': 'orangered',
-                'label': '↓'
-            })
+    result = []
+    for index, fast, slow, direction, value in zip(crossovers['index'], crossovers['fast'], crossovers['slow'],
+                                                   crossovers['direction'], crossovers['value']):
+        crossover_type, color, label = CROSSOVER_STYLES[(int(fast), int(slow), int(direction))]
+        result.append({
+            'date': str(dates[index]),
+            'price': float(value),
+            'type': crossover_type,
+            'color': color,
+            'label': label
+        })
     
-    return crossovers
\ No newline at end of file
+    return result
@@ -1,19 +1,31 @@
+import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.distribution import box_stats
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.up_down_runs import as_run_arrays
+from INF1002_Stock_Market_Trend_Analysis.src.visualization.downsampling import downsample_indices
 
-def create_run_statistics_chart(dates, runs, stats):
+# Bar and box color per direction code
+RUN_COLORS = {1: 'green', -1: 'red', 0: 'gray'}
+
+def build_run_statistics_chart(dates, runs, stats, max_points=None):
     """
     Create visualization for run statistics.
-    Works directly with tuple format from calculate_runs.
+    Box plots are computed here and sent as summary statistics, so the
+    payload doesn't grow with the length of the history.
     
     Args:
-        runs: List of tuples [('up', 3), ('down', 2), ...]
+        dates: List or array of date strings the returns were computed over
+        runs: Run arrays (run_directions, run_lengths, run_starts) from
+              calculate_run_arrays, or a list of tuples [('up', 3), ('down', 2), ...]
         stats: Dictionary from analyze_runs()
+        max_points: Point budget for the timeline, defaults to CHART_POINT_BUDGET
         
     Returns:
-        Plotly figure html string
+        plotly Figure
     """
-    if not runs:
+    run_directions, run_lengths, run_starts = as_run_arrays(runs)
+    if len(run_lengths) == 0:
         raise ValueError("No run data to visualize")
     
     fig = make_subplots(
@@ -22,29 +34,27 @@ def create_run_statistics_chart(dates, runs, stats):
         column_widths=[0.6, 0.4]
     )
     
-    # Extract run values with sign for plotting
-    run_values = []
-    colors = []
-    for direction, streak in runs:
-        if direction == 'up':
-            run_values.append(streak)
-            colors.append('green')
-        elif direction == 'down':
-            run_values.append(-streak)
-            colors.append('red')
-        else:  # flat
-            run_values.append(0)
-            colors.append('gray')
+    # Run values with sign for plotting: up positive, down negative, flat zero
+    run_values = run_directions * run_lengths
+    colors = np.where(run_directions == 1, RUN_COLORS[1],
+                      np.where(run_directions == -1, RUN_COLORS[-1], RUN_COLORS[0]))
+    
+    # Each run is placed at the date it starts; the first day has no return,
+    # so run_starts (positions in the returns) are one day behind the dates
+    run_dates = np.asarray(dates, dtype=object)[np.minimum(run_starts + 1, len(dates) - 1)]
+    
+    # Downsample the timeline, keeping the longest up and down runs
+    indices = downsample_indices(run_values, max_points, keep=[np.argmax(run_values), np.argmin(run_values)])
     
     # Left: Run lengths timeline
     fig.add_trace(
         go.Bar(
-            x=dates,
-            y=run_values,
-            marker_color=colors,
+            x=run_dates[indices],
+            y=run_values[indices],
+            marker_color=colors[indices],
             name='Run Length',
             showlegend=False,
-            hovertemplate='Run: %{y} days<extra></extra>'
+            hovertemplate='Start: %{x}<br>Run: %{y} days<extra></extra>'
         ),
         row=1, col=1
     )
@@ -59,29 +69,44 @@ def create_run_statistics_chart(dates, runs, stats):
                   annotation_text=f"Avg Down: {stats['avg_downward_run']}",
                   row=1, col=1)
     
-    # Right: Box plot comparison
-    upward_runs = [streak for direction, streak in runs if direction == 'up']
-    downward_runs = [streak for direction, streak in runs if direction == 'down']
-    
-    fig.add_trace(
-        go.Box(
-            y=upward_runs,
-            name='Upward Runs',
-            marker_color='green',
-            boxmean='sd'
-        ),
-        row=1, col=2
-    )
-    
-    fig.add_trace(
-        go.Box(
-            y=downward_runs,
-            name='Downward Runs',
-            marker_color='red',
-            boxmean='sd'
-        ),
-        row=1, col=2
-    )
+    # Right: Box plot comparison from precomputed quartiles and whiskers
+    for code, name in ((1, 'Upward Runs'), (-1, 'Downward Runs')):
+        box = box_stats(run_lengths[run_directions == code])
+        if box is None:
+            continue
+        
+        fig.add_trace(
+            go.Box(
+                x=[name],
+                q1=[box['q1']],
+                median=[box['median']],
+                q3=[box['q3']],
+                lowerfence=[box['lowerfence']],
+                upperfence=[box['upperfence']],
+                mean=[box['mean']],
+                sd=[box['sd']],
+                name=name,
+                marker_color=RUN_COLORS[code]
+            ),
+            row=1, col=2
+        )
+        
+        # Outliers as one marker per distinct length
+        outliers = box['outliers']
+        if len(outliers['values']):
+            fig.add_trace(
+                go.Scatter(
+                    x=[name] * len(outliers['values']),
+                    y=outliers['values'],
+                    customdata=outliers['counts'],
+                    mode='markers',
+                    marker=dict(color=RUN_COLORS[code], size=6, symbol='circle-open'),
+                    name=f'{name} Outliers',
+                    showlegend=False,
+                    hovertemplate='Run: %{y} days<br>Occurrences: %{customdata}<extra></extra>'
+                ),
+                row=1, col=2
+            )
     
     fig.update_layout(
         title_text="Run Statistics",
@@ -93,4 +118,18 @@ def create_run_statistics_chart(dates, runs, stats):
     fig.update_yaxes(title_text="Run Length (days)", row=1, col=1)
     fig.update_yaxes(title_text="Run Length (days)", row=1, col=2)
     
-    return fig.to_html(full_html=False, include_plotlyjs=False)
\ No newline at end of file
+    return fig
+
+
+def create_run_statistics_chart(dates, runs, stats, max_points=None, div_id=None):
+    """
+    Render the run statistics chart from build_run_statistics_chart as an HTML fragment.
+
+    Args:
+        div_id: Id of the chart\'s div, random when None
+
+    Returns:
+        HTML string of the Plotly chart
+    """
+    fig = build_run_statistics_chart(dates, runs, stats, max_points=max_points)
+    return fig.to_html(full_html=False, include_plotlyjs=False, div_id=div_id)
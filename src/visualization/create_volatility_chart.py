@@ -1,29 +1,49 @@
+import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.distribution import histogram
+from INF1002_Stock_Market_Trend_Analysis.src.visualization.downsampling import downsample_indices
 
-def create_volatility_chart(dates, returns, stats):
+# Colors for the rolling/EWMA volatility traces, in order
+VOLATILITY_COLORS = ['#1f77b4', '#2ca02c', '#d62728', '#7f7f7f']
+
+# Number of bins in the returns distribution
+HISTOGRAM_BINS = 30
+
+
+def build_volatility_chart(dates, returns, stats, volatility_series=None, max_points=None):
     """
     Create visualization for volatility analysis.
     
     Args:
-        returns: List of daily returns (with None values)
+        returns: List of daily returns (with None values) or array (with NaN)
         stats: Dictionary from analyze_volatility()
+        volatility_series: Optional dict from volatility_series(), drawn as
+                           annualized volatility lines on a secondary axis
+        max_points: Point budget for the timeline, defaults to CHART_POINT_BUDGET
         
     Returns:
-        Plotly figure html string
+        plotly Figure
     """
     
     fig = make_subplots(
         rows=1, cols=2,
         subplot_titles=('Daily Returns Over Time', 'Returns Distribution'),
-        column_widths=[0.6, 0.4]
+        column_widths=[0.6, 0.4],
+        specs=[[{"secondary_y": True}, {}]]
     )
     
+    # Downsample the timeline, keeping the largest gain and loss
+    returns_array = np.asarray(returns, dtype=np.float64)
+    extremes = [np.nanargmax(returns_array), np.nanargmin(returns_array)] if not np.isnan(returns_array).all() else []
+    indices = downsample_indices(returns_array, max_points, keep=extremes)
+    plot_dates = np.asarray(dates, dtype=object)[indices]
+    
     # Left: Returns timeline
     fig.add_trace(
         go.Scatter(
-            x=dates,
-            y=returns,
+            x=plot_dates,
+            y=returns_array[indices],
             mode='lines',
             line=dict(color='purple', width=1),
             fill='tozeroy',
@@ -34,26 +54,42 @@ def create_volatility_chart(dates, returns, stats):
         row=1, col=1
     )
     
+    # Rolling and EWMA volatility on the right-hand axis of the timeline
+    for color, (label, values) in zip(VOLATILITY_COLORS, (volatility_series or {}).items()):
+        fig.add_trace(
+            go.Scatter(
+                x=plot_dates,
+                y=np.asarray(values, dtype=np.float64)[indices],
+                mode='lines',
+                line=dict(color=color, width=1.5),
+                name=f'{label} Volatility',
+                hovertemplate=f'{label} Volatility: %{{y:.1f}}%<br>Date: %{{x}}<extra></extra>'
+            ),
+            row=1, col=1, secondary_y=True
+        )
+    
     fig.add_hline(y=0, line_dash="solid", line_color="gray", row=1, col=1)
     fig.add_hline(y=stats['avg_daily_return'], line_dash="dash", 
                   line_color="blue",
                   annotation_text=f"Avg: {stats['avg_daily_return']}%",
                   row=1, col=1)
     
-    # Right: Distribution histogram
+    # Right: Distribution histogram, binned here so only the bin counts are sent
+    bins = histogram(returns_array, HISTOGRAM_BINS)
     fig.add_trace(
-        go.Histogram(
-            x=returns,
+        go.Bar(
+            x=bins['centers'],
+            y=bins['counts'],
+            width=bins['widths'],
+            customdata=np.column_stack((bins['edges'][:-1], bins['edges'][1:])),
             marker_color='orange',
-            nbinsx=30,
             name='Distribution',
             showlegend=False,
             hovertemplate=(
-                '<b>Return Range:</b> %{x:.1f}%<br>'
+                '<b>Return Range:</b> %{customdata[0]:.1f}% to %{customdata[1]:.1f}%<br>'
                 '<b>Frequency:</b> %{y} days<br>'
                 '<extra></extra>'
-            ),
-            histnorm=''  # Show raw counts
+            )
         ),
         row=1, col=2
     )
@@ -66,8 +102,24 @@ def create_volatility_chart(dates, returns, stats):
     )
     
     fig.update_xaxes(title_text="Date", row=1, col=1)
-    fig.update_yaxes(title_text="Return (%)", row=1, col=1)
+    fig.update_yaxes(title_text="Return (%)", row=1, col=1, secondary_y=False)
+    if volatility_series:
+        fig.update_yaxes(title_text="Annualized Volatility (%)", row=1, col=1, secondary_y=True)
     fig.update_xaxes(title_text="Return (%)", row=1, col=2)
     fig.update_yaxes(title_text="Frequency", row=1, col=2)
     
-    return fig.to_html(full_html=False, include_plotlyjs=False)
+    return fig
+
+
+def create_volatility_chart(dates, returns, stats, volatility_series=None, max_points=None, div_id=None):
+    """
+    Render the volatility chart from build_volatility_chart as an HTML fragment.
+
+    Args:
+        div_id: Id of the chart\'s div, random when None
+
+    Returns:
+        HTML string of the Plotly chart
+    """
+    fig = build_volatility_chart(dates, returns, stats, volatility_series=volatility_series, max_points=max_points)
+    return fig.to_html(full_html=False, include_plotlyjs=False, div_id=div_id)
@@ -0,0 +1,120 @@
+import os
+
+import numpy as np
+
+# Default number of points per trace sent to the browser, override with CHART_POINT_BUDGET
+DEFAULT_POINT_BUDGET = int(os.environ.get("CHART_POINT_BUDGET", 2000))
+
+
+def lttb_indices(y, budget, x=None):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, from each of budget - 2 equal buckets
+    in between, the point forming the largest triangle with the previously kept
+    point and the average of the next bucket. This keeps the visual shape of the
+    series, including its peaks and troughs.
+
+    Args:
+        y: Array of values (NaN values are never picked unless a bucket is all NaN)
+        budget: Number of points to keep (at least 3)
+        x: Optional array of x positions, defaults to the point index
+
+    Returns:
+        np.ndarray: Sorted indices of the kept points
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if budget >= n:
+        return np.arange(n)
+    if budget < 3:
+        raise ValueError("Point budget must be at least 3")
+
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+
+    # Bucket edges over the points between the first and the last
+    edges = np.linspace(1, n - 1, budget - 1).astype(np.int64)
+
+    # Average of each bucket, computed up front since it doesn't depend on the selection
+    filled = np.where(np.isnan(y), 0.0, y)
+    valid = ~np.isnan(y)
+    y_sums = np.add.reduceat(filled[:-1], edges[:-1])
+    y_counts = np.add.reduceat(valid[:-1].astype(np.int64), edges[:-1])
+    x_means = np.add.reduceat(x[:-1], edges[:-1]) / np.diff(edges)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        y_means = y_sums / y_counts
+    # The last point stands in for the bucket after the final one
+    x_means = np.append(x_means, x[-1])
+    y_means = np.append(y_means, y[-1])
+
+    selected = np.empty(budget, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for bucket in range(budget - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_x, next_y = x_means[bucket + 1], y_means[bucket + 1]
+        if np.isnan(next_y):
+            next_y = y[previous]
+
+        bucket_x = x[start:end]
+        bucket_y = y[start:end]
+        areas = np.abs((x[previous] - next_x) * (bucket_y - y[previous])
+                       - (x[previous] - bucket_x) * (next_y - y[previous]))
+
+        if np.isnan(areas).all():
+            # No usable triangle (e.g. the previous point is missing), take the first real value
+            valid_points = np.flatnonzero(~np.isnan(bucket_y))
+            previous = start + (int(valid_points[0]) if len(valid_points) else 0)
+        else:
+            previous = start + int(np.nanargmax(areas))
+        selected[bucket + 1] = previous
+
+    return selected
+
+
+def downsample_indices(y, budget=None, keep=None):
+    """
+    Pick the indices of a series to plot within a point budget.
+
+    Args:
+        y: Array of values driving the selection (e.g. closing prices)
+        budget: Maximum number of LTTB points, defaults to DEFAULT_POINT_BUDGET
+        keep: Indices that must survive, such as max-profit buy/sell days or
+              SMA crossovers; they are added on top of the budget
+
+    Returns:
+        np.ndarray: Sorted unique indices into y
+    """
+    budget = DEFAULT_POINT_BUDGET if budget is None else int(budget)
+    indices = lttb_indices(y, budget)
+
+    if keep is not None and len(keep):
+        keep = np.asarray(keep, dtype=np.int64)
+        keep = keep[(keep >= 0) & (keep < len(y))]
+        indices = np.union1d(indices, keep)
+
+    return indices
+
+
+def date_positions(dates, wanted):
+    """
+    Find the positions of some dates in a sorted array of dates.
+
+    Args:
+        dates: Sorted dates (ISO strings or datetime values)
+        wanted: Dates to look up
+
+    Returns:
+        np.ndarray: Positions of the wanted dates that occur in dates
+    """
+    dates = np.asarray(dates)
+    wanted = np.asarray(list(wanted), dtype=dates.dtype)
+    if len(wanted) == 0 or len(dates) == 0:
+        return np.array([], dtype=np.int64)
+
+    positions = np.searchsorted(dates, wanted)
+    clipped = np.minimum(positions, len(dates) - 1)
+    found = (positions < len(dates)) & (dates[clipped] == wanted)
+    return positions[found]
@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.result_cache import ResultCache
+from INF1002_Stock_Market_Trend_Analysis.src.visualization.downsampling import DEFAULT_POINT_BUDGET
+
+
+class ZoomPyramid:
+    """
+    Multi-resolution min/max/close summary of one price series.
+
+    Level 0 holds every bar; each level above groups `factor` consecutive
+    buckets of the level below into one, keeping the bucket's first timestamp,
+    lowest low, highest high and last close. A query for a visible x-range
+    returns the finest level that fits the point budget, so a chart can show
+    decades at overview scale and single days when zoomed in.
+    """
+
+    def __init__(self, dates, closes, factor=4, min_points=64):
+        self.factor = int(factor)
+        if self.factor < 2:
+            raise ValueError("Pyramid factor must be at least 2")
+
+        timestamps = pd.DatetimeIndex(dates)
+        self.tz = timestamps.tz
+        closes = np.asarray(closes, dtype=np.float64)
+
+        self.levels = [{
+            'time': timestamps.as_unit("ns").asi8,
+            'min': closes,
+            'max': closes,
+            'close': closes,
+        }]
+
+        while len(self.levels[-1]['time']) > min_points:
+            below = self.levels[-1]
+            starts = np.arange(0, len(below['time']), self.factor)
+            ends = np.append(starts[1:], len(below['time'])) - 1
+            self.levels.append({
+                'time': below['time'][starts],
+                'min': np.minimum.reduceat(below['min'], starts),
+                'max': np.maximum.reduceat(below['max'], starts),
+                'close': below['close'][ends],
+            })
+
+    def query(self, start=None, end=None, budget=None):
+        """
+        Return the slice of the pyramid covering [start, end].
+
+        Args:
+            start: Start of the visible range (datetime-like), None for the beginning
+            end: End of the visible range (datetime-like), None for the end
+            budget: Maximum number of points, defaults to CHART_POINT_BUDGET
+
+        Returns:
+            dict: level, x (ISO date strings), min, max and close lists
+        """
+        number, first, last = self.locate(start, end, budget)
+        level = self.levels[number]
+
+        return {
+            'level': number,
+            'x': self.format_dates(level['time'][first:last]).tolist(),
+            'min': level['min'][first:last].tolist(),
+            'max': level['max'][first:last].tolist(),
+            'close': level['close'][first:last].tolist(),
+        }
+
+    def locate(self, start=None, end=None, budget=None):
+        """
+        Pick the finest level whose buckets over [start, end] fit the budget.
+
+        Returns:
+            tuple: (level number, first bucket, bucket after the last)
+        """
+        budget = DEFAULT_POINT_BUDGET if budget is None else int(budget)
+        start_ns = self._to_ns(start, default=np.iinfo(np.int64).min)
+        end_ns = self._to_ns(end, default=np.iinfo(np.int64).max)
+
+        for number, level in enumerate(self.levels):
+            # Include one bucket either side so lines run off the edges of the view
+            first = max(int(np.searchsorted(level['time'], start_ns, side="left")) - 1, 0)
+            last = min(int(np.searchsorted(level['time'], end_ns, side="right")) + 1, len(level['time']))
+            if last - first <= budget or number == len(self.levels) - 1:
+                break
+
+        return number, first, last
+
+    def sample(self, start=None, end=None, budget=None, since=None, until=None):
+        """
+        Full-resolution bars to plot for [start, end]: every bar when they fit
+        the budget, otherwise the first bar of each bucket of the level query()
+        would return. Only bars between since and until (inclusive) are used,
+        so a zoomed chart stays within the window it was drawn for.
+
+        Returns:
+            tuple: (first and last + 1 bar of the since/until window, positions
+                    of the sampled bars as level-0 indices)
+        """
+        times = self.levels[0]['time']
+        window_first = int(np.searchsorted(times, self._to_ns(since, default=np.iinfo(np.int64).min), side="left"))
+        window_last = int(np.searchsorted(times, self._to_ns(until, default=np.iinfo(np.int64).max), side="right"))
+
+        number, first, last = self.locate(start, end, budget)
+        positions = np.arange(first, last, dtype=np.int64) * self.factor ** number
+        positions = positions[(positions >= window_first) & (positions < window_last)]
+
+        return window_first, window_last, positions
+
+    def format_dates(self, timestamps):
+        """
+        Format nanosecond timestamps as 'YYYY-MM-DD' in the series' timezone.
+        """
+        times = pd.DatetimeIndex(pd.to_datetime(timestamps, unit="ns", utc=True))
+        if self.tz is not None:
+            times = times.tz_convert(self.tz)
+        else:
+            times = times.tz_localize(None)
+        return np.asarray(times.strftime("%Y-%m-%d"), dtype=object)
+
+    def _to_ns(self, value, default):
+        if value is None or value == "":
+            return default
+        timestamp = pd.Timestamp(value)
+        if self.tz is not None:
+            timestamp = timestamp.tz_localize(self.tz) if timestamp.tzinfo is None else timestamp.tz_convert(self.tz)
+        elif timestamp.tzinfo is not None:
+            timestamp = timestamp.tz_localize(None)
+        return timestamp.as_unit("ns").value
+
+
+# Built pyramids per series, keyed by symbol and data version
+_pyramid_cache = ResultCache(maxsize=32, ttl=3600)
+
+
+def get_zoom_pyramid(symbol, version, load):
+    """
+    Return the ZoomPyramid for a symbol's history, building it once per data version.
+
+    Args:
+        symbol: Stock ticker symbol
+        version: Identifier of the history (source_version or data_version)
+        load: Zero-argument function returning the full history, only called on a miss
+    """
+    def build():
+        data = load()
+        return ZoomPyramid(data.index, data['Close'])
+
+    return _pyramid_cache.get_or_compute((symbol.upper(), version), build)
+
+
+def relayout_script():
+    """
+    Build a Plotly post_script that hands a server-rendered chart to the
+    page's attachRangeRefetch (templates/index.html), which refills the
+    traces listed in layout.meta.detail_traces from layout.meta.range_url
+    whenever the user zooms or pans. The page's script may not have run yet
+    when the chart is drawn, so the chart is queued for it in that case.
+
+    Returns:
+        str: JavaScript snippet for fig.to_html(post_script=...)
+    """
+    return """
+var gd = document.getElementById('{plot_id}');
+if (window.attachRangeRefetch) {
+    attachRangeRefetch(gd);
+} else {
+    (window.pendingRangeCharts = window.pendingRangeCharts || []).push(gd);
+}
+"""
@@ -0,0 +1,105 @@
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def chart_payload(symbol, days=300):
+    """
+    A Yahoo chart API response with a reproducible random walk ending today,
+    bars stamped at the 9:30 New York open like the real API.
+    """
+    rng = np.random.default_rng(sum(symbol.encode()))
+    dates = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=days)
+    opens = (dates + pd.Timedelta(hours=9, minutes=30)).tz_localize("America/New_York")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, days)))
+    timestamps = opens.tz_convert("UTC").as_unit("s").asi8.tolist()
+
+    return {"chart": {"result": [{
+        "meta": {"symbol": symbol, "exchangeTimezoneName": "America/New_York"},
+        "timestamp": timestamps,
+        "events": {"dividends": {str(timestamps[-20]): {"amount": 0.5, "date": timestamps[-20]}}},
+        "indicators": {
+            "quote": [{"open": close.tolist(), "high": (close * 1.01).tolist(), "low": (close * 0.99).tolist(),
+                       "close": close.tolist(), "volume": [1000000] * days}],
+            "adjclose": [{"adjclose": close.tolist()}]
+        }
+    }], "error": None}}
+
+
+class YahooStub:
+    """
+    Local stand-in for the Yahoo chart API: answers /v8/finance/chart/<SYMBOL>
+    after `delay` seconds, 404 for symbols starting with 'NONE', and records
+    how many requests it served and how many were in flight at once.
+    """
+
+    def __init__(self):
+        self.delay = 0.0
+        self.body = json.dumps(chart_payload("STUB")).encode()
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                symbol = parts.path.rsplit("/", 1)[-1]
+                with stub._lock:
+                    stub.requests.append((symbol, parse_qs(parts.query)))
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    time.sleep(stub.delay)
+                    if symbol.startswith("NONE"):
+                        status, body = 404, b'{"chart": {"result": null, "error": {"code": "Not Found"}}}'
+                    else:
+                        # Every symbol gets the same prices, so the stub costs little CPU
+                        status, body = 200, stub.body
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    if "gzip" in self.headers.get("Accept-Encoding", ""):
+                        body = gzip.compress(body)
+                        self.send_header("Content-Encoding", "gzip")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            request_queue_size = 512
+
+        self.server = Server(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v8/finance/chart/"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def yahoo_stub(monkeypatch):
+    from INF1002_Stock_Market_Trend_Analysis.src.analysis import yahoo_chart
+
+    stub = YahooStub()
+    monkeypatch.setattr(yahoo_chart, "YAHOO_CHART_URL", stub.url)
+    yield stub
+    stub.close()
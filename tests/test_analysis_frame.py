@@ -0,0 +1,99 @@
+import pytest
+import numpy as np
+import pandas as pd
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.analysis_frame import AnalysisFrame
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.daily_returns import daily_returns, daily_returns_array
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.max_profit import max_profit, max_profit_trades
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.volatility import analyze_volatility
+
+
+def make_data(n=300, tz=None, start="2020-01-01"):
+    rng = np.random.default_rng(2)
+    index = pd.date_range(start, periods=n, freq="D", tz=tz)
+    return pd.DataFrame({'Close': np.round(100 + np.cumsum(rng.normal(0, 1, n)), 2)}, index=index)
+
+
+class TestAnalysisFrame:
+    def test_from_dataframe(self):
+        data = make_data()
+        frame = AnalysisFrame.from_dataframe(data, symbol="AAPL")
+
+        assert len(frame) == len(data)
+        assert frame.close.dtype == np.float64
+        assert frame.timestamps.dtype == np.int64
+        assert not frame.missing.any()
+        assert frame.dates.tolist() == data.index.strftime("%Y-%m-%d").tolist()
+        assert frame.to_dataframe().equals(data)
+
+    def test_timezone_dates_use_local_time(self):
+        data = make_data(n=10, tz="Asia/Tokyo")
+        frame = AnalysisFrame.from_dataframe(data)
+
+        assert frame.dates.tolist() == data.index.strftime("%Y-%m-%d").tolist()
+        assert frame.index.equals(data.index)
+
+    def test_dates_before_epoch(self):
+        data = make_data(n=5, start="1962-01-02")
+        frame = AnalysisFrame.from_dataframe(data)
+
+        assert frame.dates.tolist() == data.index.strftime("%Y-%m-%d").tolist()
+
+    def test_dates_formatted_once(self):
+        frame = AnalysisFrame.from_dataframe(make_data())
+        assert frame.dates is frame.dates
+
+    def test_array_protocol(self):
+        frame = AnalysisFrame.from_dataframe(make_data())
+
+        assert np.asarray(frame) is frame.close
+        assert np.asarray(frame, dtype=np.float32).dtype == np.float32
+        assert np.array_equal(daily_returns_array(frame), daily_returns_array(frame.close), equal_nan=True)
+
+    def test_float32_storage(self):
+        data = make_data()
+        frame = AnalysisFrame.from_dataframe(data, dtype=np.float32)
+
+        assert frame.close.dtype == np.float32
+        assert frame.nbytes < AnalysisFrame.from_dataframe(data).nbytes
+
+    def test_missing_mask(self):
+        frame = AnalysisFrame(np.arange(3), [1.0, None, 3.0])
+        assert frame.missing.tolist() == [False, True, False]
+
+    def test_slice(self):
+        data = make_data()
+        frame = AnalysisFrame.from_dataframe(data)
+        frame.dates
+        part = frame.slice(10, 19)
+
+        assert len(part) == 10
+        assert part.dates.tolist() == frame.dates[10:20].tolist()
+        assert part.close.tolist() == data['Close'].iloc[10:20].tolist()
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError):
+            AnalysisFrame(np.arange(3), [1.0, 2.0])
+
+    def test_slots(self):
+        frame = AnalysisFrame.from_dataframe(make_data())
+        with pytest.raises(AttributeError):
+            frame.extra = 1
+
+
+class TestFrameConsumers:
+    def test_max_profit_matches_dataframe(self):
+        data = make_data()
+        frame = AnalysisFrame.from_dataframe(data)
+
+        assert max_profit(frame) == max_profit(data)
+        assert max_profit_trades(frame, 3) == max_profit_trades(data, 3)
+
+    def test_volatility_accepts_nan_array(self):
+        data = make_data()
+        returns = np.round(daily_returns_array(AnalysisFrame.from_dataframe(data)), 2)
+
+        assert analyze_volatility(returns) == analyze_volatility(daily_returns(data['Close'].tolist()))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
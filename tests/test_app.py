@@ -0,0 +1,141 @@
+import json
+import pytest
+from INF1002_Stock_Market_Trend_Analysis import app as app_module
+from INF1002_Stock_Market_Trend_Analysis.src import pipeline
+from INF1002_Stock_Market_Trend_Analysis.src.analysis import memo_cache, price_providers, result_cache
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.memo_cache import MemoCache
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.price_providers import SyntheticProvider
+
+QUERY = "symbol={}&date_mode=period&period=1y&sma_short=5&sma_medium=10&sma_long=20"
+
+
+class CountingProvider(SyntheticProvider):
+    def __init__(self):
+        super().__init__(days=600)
+        self.loads = 0
+
+    def load(self, *args, **kwargs):
+        self.loads += 1
+        return super().load(*args, **kwargs)
+
+
+@pytest.fixture
+def provider():
+    return CountingProvider()
+
+
+@pytest.fixture
+def client(provider, tmp_path, monkeypatch):
+    """
+    The Flask app on a synthetic provider, with fresh caches and serial rendering.
+    """
+    monkeypatch.setattr(price_providers, '_provider', provider)
+    monkeypatch.setattr(memo_cache, '_memo_cache', MemoCache(str(tmp_path / "memo.sqlite3")))
+    monkeypatch.setattr(result_cache, '_result_cache', None)
+    monkeypatch.setattr(pipeline, 'get_chart_executor', lambda: None)
+    return app_module.app.test_client()
+
+
+class TestAnalysisApi:
+    def test_all_charts(self, client):
+        response = client.get("/api/analysis?" + QUERY.format("aapl"))
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/json"
+        body = response.get_json()
+        assert body["symbol"] == "AAPL"
+        assert sorted(body["charts"]) == sorted(pipeline.CHARTS)
+        assert all("data" in figure and "layout" in figure for figure in body["charts"].values())
+
+    def test_single_chart(self, client):
+        response = client.get("/api/chart/volatility?" + QUERY.format("AAPL"))
+
+        assert response.status_code == 200
+        assert "data" in json.loads(response.data)
+
+    def test_unknown_chart(self, client):
+        response = client.get("/api/chart/candles?" + QUERY.format("AAPL"))
+
+        assert response.status_code == 404
+        assert response.get_json()["error"] == "Unknown chart: candles"
+
+    @pytest.mark.parametrize("query, message", [
+        ("date_mode=period&period=1y&sma_short=5&sma_medium=10&sma_long=20", "Stock symbol is required"),
+        (QUERY.format("AAPL").replace("sma_long=20", "sma_long=2"), "ascending order"),
+        (QUERY.format("AAPL").replace("sma_short=5", "sma_short=0"), "positive numbers"),
+        ("symbol=AAPL&date_mode=daterange&start_date=2024-02-01&end_date=2024-01-01"
+         "&sma_short=5&sma_medium=10&sma_long=20", "Start date must be before end date"),
+    ])
+    def test_validation_errors(self, client, query, message):
+        for path in ("/api/analysis", "/api/chart/price"):
+            response = client.get(f"{path}?{query}")
+
+            assert response.status_code == 400
+            assert message in response.get_json()["error"]
+
+
+class TestRevalidation:
+    def test_index_permalink(self, client, provider):
+        response = client.get("/?" + QUERY.format("aapl"))
+
+        assert response.status_code == 200
+        assert b"Up Runs" in response.data
+        assert response.headers["ETag"]
+        assert response.cache_control.public
+        assert provider.loads == 1
+
+        revalidated = client.get("/?" + QUERY.format("aapl"), headers={"If-None-Match": response.headers["ETag"]})
+        assert revalidated.status_code == 304
+        assert revalidated.data == b""
+        assert revalidated.headers["ETag"] == response.headers["ETag"]
+        assert provider.loads == 2
+
+    def test_rerendered_page_is_byte_identical(self, client, tmp_path, monkeypatch):
+        first = client.get("/?" + QUERY.format("aapl"))
+
+        # Render everything again from scratch
+        monkeypatch.setattr(memo_cache, '_memo_cache', MemoCache(str(tmp_path / "fresh.sqlite3")))
+        monkeypatch.setattr(result_cache, '_result_cache', None)
+        second = client.get("/?" + QUERY.format("aapl"))
+
+        assert second.data == first.data
+        assert second.headers["ETag"] == first.headers["ETag"]
+
+    def test_index_without_symbol_has_no_etag(self, client, provider):
+        response = client.get("/")
+
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+        assert provider.loads == 0
+
+    @pytest.mark.parametrize("path", ["/api/analysis", "/api/chart/price"])
+    def test_api_if_none_match_round_trip(self, client, provider, path):
+        response = client.get(f"{path}?" + QUERY.format("AAPL"))
+        etag = response.headers["ETag"]
+        assert response.status_code == 200
+        assert provider.loads == 1
+
+        revalidated = client.get(f"{path}?" + QUERY.format("AAPL"), headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+        assert revalidated.data == b""
+        assert provider.loads == 2
+
+        # Other parameters are another representation
+        other = client.get(f"{path}?" + QUERY.format("AAPL").replace("sma_long=20", "sma_long=30"),
+                           headers={"If-None-Match": etag})
+        assert other.status_code == 200
+        assert other.headers["ETag"] != etag
+
+    def test_new_data_changes_the_etag(self, client, provider):
+        etag = client.get("/api/analysis?" + QUERY.format("AAPL")).headers["ETag"]
+
+        provider.seed = 1
+        provider._frames.clear()
+        response = client.get("/api/analysis?" + QUERY.format("AAPL"), headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,190 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from INF1002_Stock_Market_Trend_Analysis import asgi
+from INF1002_Stock_Market_Trend_Analysis.src import pipeline
+from INF1002_Stock_Market_Trend_Analysis.src.analysis import memo_cache, price_providers, result_cache
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.memo_cache import MemoCache
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.price_cache import PriceCache
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.price_providers import YFinanceProvider
+
+QUERY = "symbol={}&date_mode=period&period=1y&sma_short=5&sma_medium=10&sma_long=20"
+
+
+@pytest.fixture
+def stubbed(yahoo_stub, tmp_path, monkeypatch):
+    """
+    The yfinance provider with a fresh price cache, downloading from the Yahoo stub.
+    """
+    cache = PriceCache(str(tmp_path / "prices.sqlite3"), fetch=lambda *args, **kwargs: pytest.fail("blocking fetch"))
+    monkeypatch.setattr(price_providers, '_provider', YFinanceProvider(cache=cache))
+    monkeypatch.setattr(memo_cache, '_memo_cache', MemoCache(str(tmp_path / "memo.sqlite3")))
+    monkeypatch.setattr(result_cache, '_result_cache', None)
+    monkeypatch.setattr(pipeline, 'get_chart_executor', lambda: None)
+    return yahoo_stub
+
+
+async def call(path, query="", method="GET", headers=(), body=b""):
+    """
+    Drive the ASGI app with one request.
+
+    Returns:
+        tuple: (status, dict of response headers, body)
+    """
+    scope = {"type": "http", "method": method, "path": path, "query_string": query.encode(),
+             "headers": [(name.lower().encode(), value.encode()) for name, value in headers]}
+    received = asyncio.Event()
+    messages = []
+
+    async def receive():
+        if received.is_set():
+            await asyncio.Event().wait()
+        received.set()
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await asgi.app(scope, receive, send)
+    headers = {name.decode(): value.decode() for name, value in messages[0]["headers"]}
+    return messages[0]["status"], headers, b"".join(message.get("body", b"") for message in messages[1:])
+
+
+def get(path, query="", **kwargs):
+    return asyncio.run(call(path, query, **kwargs))
+
+
+class TestAsgiApp:
+    def test_analysis_api(self, stubbed):
+        status, headers, body = get("/api/analysis", QUERY.format("AAPL"))
+
+        assert status == 200
+        assert headers["content-type"] == "application/json"
+        assert sorted(json.loads(body)["charts"]) == sorted(pipeline.CHARTS)
+        assert [request[0] for request in stubbed.requests] == ["AAPL"]
+
+    def test_single_chart_and_unknown_chart(self, stubbed):
+        status, _, body = get("/api/chart/volatility", QUERY.format("AAPL"))
+        assert status == 200
+        assert "data" in json.loads(body)
+
+        assert get("/api/chart/candles", QUERY.format("AAPL"))[0] == 404
+
+    def test_index_permalink_and_revalidation(self, stubbed):
+        status, headers, body = get("/", QUERY.format("aapl"), headers=[("Accept-Encoding", "gzip")])
+
+        assert status == 200
+        assert headers["content-encoding"] == "gzip"
+        assert headers["etag"].endswith('-gzip"')
+
+        status, _, body = get("/", QUERY.format("aapl"), headers=[("Accept-Encoding", "gzip"),
+                                                                 ("If-None-Match", headers["etag"])])
+        assert status == 304
+        assert body == b""
+
+    def test_index_uses_the_result_cache(self, stubbed):
+        first = get("/", QUERY.format("AAPL"))
+        second = get("/", QUERY.format("AAPL"))
+
+        assert first[0] == second[0] == 200
+        assert first[2] == second[2]
+        stats = result_cache.get_result_cache().stats()
+        assert (stats["misses"], stats["hits"]) == (1, 1)
+
+    def test_index_form_post(self, stubbed):
+        status, _, body = get("/", method="POST", body=QUERY.format("aapl").replace("sma_long=20", "sma_long=2").encode())
+
+        assert status == 200
+        assert b"SMA windows must be in ascending order" in body
+
+    def test_unknown_symbol(self, stubbed):
+        status, _, body = get("/api/analysis", QUERY.format("NONEXISTENT"))
+
+        assert status == 400
+        assert "No data" in json.loads(body)["error"]
+
+    def test_range_api(self, stubbed):
+        status, _, body = get("/api/range/AAPL", "points=50")
+
+        assert status == 200
+        assert len(json.loads(body)["close"]) <= 60
+
+        status, _, body = get("/api/range/AAPL", "points=50&view=runs")
+        traces = json.loads(body)["traces"]
+        assert status == 200
+        assert len(traces) == 3
+        assert all(set(trace) == {"x", "y", "customdata"} for trace in traces)
+
+        assert get("/api/range/AAPL", "view=sma&sma=5,x")[0] == 400
+
+    def test_not_found(self, stubbed):
+        assert get("/nowhere")[0] == 404
+        assert get("/api/analysis", method="DELETE")[0] == 405
+
+    def test_hundreds_of_requests_in_flight(self, stubbed):
+        stubbed.delay = 0.5
+        symbols = [f"T{number}" for number in range(200)]
+
+        async def run():
+            return await asyncio.gather(*(call(f"/api/range/{symbol}", "points=50") for symbol in symbols))
+
+        started = time.perf_counter()
+        responses = asyncio.run(run())
+        elapsed = time.perf_counter() - started
+
+        assert [response[0] for response in responses] == [200] * len(symbols)
+        assert stubbed.max_in_flight >= 100
+        # Serially this would take 200 * 0.5 s
+        assert elapsed < 20
+
+    def test_event_loop_not_blocked_by_downloads(self, stubbed):
+        stubbed.delay = 1.0
+
+        async def run():
+            slow = asyncio.ensure_future(call("/api/range/SLOW"))
+            await asyncio.sleep(0.1)
+            started = time.perf_counter()
+            status, _, _ = await call("/cache/stats")
+            fast = time.perf_counter() - started
+            await slow
+            return status, fast, slow.done()
+
+        status, fast, finished = asyncio.run(run())
+
+        assert status == 200
+        assert fast < 0.5
+        assert finished
+
+    def test_concurrent_requests_share_one_download(self, stubbed):
+        stubbed.delay = 0.3
+
+        async def run():
+            return await asyncio.gather(*(call("/api/range/SAME") for _ in range(20)))
+
+        assert [response[0] for response in asyncio.run(run())] == [200] * 20
+        assert len(stubbed.requests) == 1
+
+    def test_lifespan(self, monkeypatch):
+        chart_pool = ThreadPoolExecutor(max_workers=1)
+        monkeypatch.setattr(pipeline, '_executor', chart_pool)
+        messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+        sent = []
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        asyncio.run(asgi.app({"type": "lifespan"}, receive, send))
+
+        assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+        assert pipeline._executor is None
+        with pytest.raises(RuntimeError):
+            chart_pool.submit(print)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,93 @@
+import pytest
+import numpy as np
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.backtest import sma_grid_backtest, best_windows
+
+
+def loop_backtest(prices, short_window, long_window, cost=0.0):
+    # Reference day-by-day simulation of one window pair
+    equity, peak, worst, buys, position = 1.0, 1.0, 0.0, 0, 0
+    for day in range(1, len(prices)):
+        previous = day - 1
+        short_sma = np.mean(prices[previous - short_window + 1:previous + 1]) if previous >= short_window - 1 else None
+        long_sma = np.mean(prices[previous - long_window + 1:previous + 1]) if previous >= long_window - 1 else None
+        new_position = 1 if short_sma is not None and long_sma is not None and short_sma > long_sma else 0
+        if new_position != position:
+            equity *= 1 - cost
+            buys += new_position > position
+        position = new_position
+        equity *= 1 + position * (prices[day] / prices[previous] - 1)
+        peak = max(peak, equity)
+        worst = max(worst, 1 - equity / peak)
+    return (equity - 1) * 100, worst * 100, buys
+
+
+class TestSmaGridBacktest:
+    prices = 100 * np.exp(np.cumsum(np.random.default_rng(7).normal(0.0003, 0.015, 800)))
+
+    def test_matrix_shape(self):
+        result = sma_grid_backtest(self.prices, range(5, 15), range(20, 60, 5))
+        assert result['total_return'].shape == (10, 8)
+        assert result['max_drawdown'].shape == (10, 8)
+        assert result['trades'].shape == (10, 8)
+
+    @pytest.mark.parametrize("short_window,long_window", [(5, 20), (10, 50), (20, 30)])
+    def test_matches_loop(self, short_window, long_window):
+        result = sma_grid_backtest(self.prices, [5, 10, 20], [20, 30, 50])
+        row = [5, 10, 20].index(short_window)
+        column = [20, 30, 50].index(long_window)
+
+        expected_return, expected_drawdown, expected_trades = loop_backtest(self.prices, short_window, long_window)
+
+        assert result['total_return'][row, column] == pytest.approx(expected_return, rel=1e-9)
+        assert result['max_drawdown'][row, column] == pytest.approx(expected_drawdown, rel=1e-9)
+        assert result['trades'][row, column] == expected_trades
+
+    def test_transaction_costs(self):
+        free = sma_grid_backtest(self.prices, [10], [50])
+        costly = sma_grid_backtest(self.prices, [10], [50], cost=0.001)
+
+        expected_return, _, _ = loop_backtest(self.prices, 10, 50, cost=0.001)
+        assert costly['total_return'][0, 0] < free['total_return'][0, 0]
+        assert costly['total_return'][0, 0] == pytest.approx(expected_return, rel=1e-6)
+
+    def test_invalid_pairs_are_nan(self):
+        result = sma_grid_backtest(self.prices, [10, 30], [20, 30])
+        assert np.isnan(result['total_return'][1, 0])
+        assert np.isnan(result['total_return'][1, 1])
+        assert not np.isnan(result['total_return'][0, 0])
+
+    def test_buy_and_hold(self):
+        result = sma_grid_backtest(self.prices, [5], [20])
+        assert result['buy_and_hold'] == pytest.approx((self.prices[-1] / self.prices[0] - 1) * 100)
+
+    def test_invalid_inputs(self):
+        with pytest.raises(ValueError):
+            sma_grid_backtest([100.0], [5], [20])
+        with pytest.raises(ValueError):
+            sma_grid_backtest([100.0, np.nan, 101.0], [1], [2])
+        with pytest.raises(ValueError):
+            sma_grid_backtest(self.prices, [0], [20])
+        with pytest.raises(ValueError):
+            sma_grid_backtest(self.prices[:10], [5], [20])
+
+
+class TestBestWindows:
+    def test_best_return(self):
+        result = sma_grid_backtest(TestSmaGridBacktest.prices, range(5, 15), range(20, 60, 5))
+        best = best_windows(result)
+        assert best['total_return'] == round(float(np.nanmax(result['total_return'])), 2)
+        assert best['short_window'] < best['long_window']
+
+    def test_lowest_drawdown(self):
+        result = sma_grid_backtest(TestSmaGridBacktest.prices, range(5, 15), range(20, 60, 5))
+        best = best_windows(result, metric='max_drawdown')
+        assert best['max_drawdown'] == round(float(np.nanmin(result['max_drawdown'])), 2)
+
+    def test_no_valid_pair(self):
+        result = sma_grid_backtest(TestSmaGridBacktest.prices, [30], [20])
+        with pytest.raises(ValueError):
+            best_windows(result)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,144 @@
+import json
+import os
+
+import pytest
+import pandas as pd
+from INF1002_Stock_Market_Trend_Analysis.src.analysis import memo_cache, price_cache
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.price_providers import get_provider, set_provider
+from INF1002_Stock_Market_Trend_Analysis.src.batch_runner import (
+    init_worker, analyze_ticker, run_batch, read_checkpoint, main, CHECKPOINT_NAME
+)
+
+
+@pytest.fixture(autouse=True)
+def restore_provider():
+    provider = get_provider()
+    yield
+    set_provider(provider)
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """
+    Price and memo caches under tmp_path, for this process and for spawned
+    workers, which read the paths from the environment.
+    """
+    memo_path = str(tmp_path / "memo.sqlite3")
+    prices_path = str(tmp_path / "prices.sqlite3")
+    monkeypatch.setenv("MEMO_CACHE_PATH", memo_path)
+    monkeypatch.setenv("PRICE_CACHE_PATH", prices_path)
+    monkeypatch.setattr(memo_cache, 'DEFAULT_MEMO_PATH', memo_path)
+    monkeypatch.setattr(memo_cache, '_memo_cache', None)
+    monkeypatch.setattr(price_cache, 'DEFAULT_CACHE_PATH', prices_path)
+    monkeypatch.setattr(price_cache, '_price_cache', None)
+
+
+def quiet(message):
+    pass
+
+
+class TestAnalyzeTicker:
+    def test_ok_result(self):
+        init_worker("synthetic")
+
+        result = analyze_ticker("AAPL", period="1y")
+
+        assert result['status'] == 'ok'
+        assert set(result['timings']) == {'fetch', 'analyze'}
+        assert result['summary']['rows'] == len(result['series']['date'])
+        assert set(result['series']) == {'date', 'close', 'daily_return', 'sma_20', 'sma_50', 'sma_200'}
+
+    def test_error_result(self):
+        init_worker("synthetic")
+
+        result = analyze_ticker("AAPL", period="1y", sma_windows=(20, 50, 5000))
+
+        assert result['status'] == 'error'
+        assert "SMA window" in result['error']
+
+
+class TestRunBatch:
+    def test_writes_json_and_checkpoint(self, tmp_path):
+        report = run_batch(["aapl", "msft", "AAPL"], str(tmp_path), period="1y",
+                           workers=0, provider_name="synthetic", log=quiet)
+
+        assert report['completed'] == 2
+        assert report['failed'] == 0
+        assert report['throughput'] > 0
+        assert set(report['stages']) == {'fetch', 'analyze', 'write'}
+
+        with open(tmp_path / "AAPL.json") as f:
+            result = json.load(f)
+        assert result['symbol'] == 'AAPL'
+        assert len(result['series']['close']) == result['summary']['rows']
+
+        records = read_checkpoint(str(tmp_path / CHECKPOINT_NAME))
+        assert {symbol: record['status'] for symbol, record in records.items()} == {'AAPL': 'ok', 'MSFT': 'ok'}
+
+    def test_resume_skips_completed(self, tmp_path):
+        run_batch(["AAPL"], str(tmp_path), period="1y", workers=0, provider_name="synthetic", log=quiet)
+        # An interrupted run can leave half a line behind
+        with open(tmp_path / CHECKPOINT_NAME, "a") as f:
+            f.write('{"symbol": "MS')
+
+        report = run_batch(["AAPL", "MSFT"], str(tmp_path), period="1y",
+                           workers=0, provider_name="synthetic", log=quiet)
+
+        assert report['skipped'] == 1
+        assert report['completed'] == 1
+        assert set(read_checkpoint(str(tmp_path / CHECKPOINT_NAME))) == {'AAPL', 'MSFT'}
+
+    def test_restart_ignores_checkpoint(self, tmp_path):
+        run_batch(["AAPL"], str(tmp_path), period="1y", workers=0, provider_name="synthetic", log=quiet)
+        report = run_batch(["AAPL"], str(tmp_path), period="1y", workers=0,
+                           provider_name="synthetic", resume=False, log=quiet)
+
+        assert report['skipped'] == 0
+        assert report['completed'] == 1
+
+    def test_failures_are_retried(self, tmp_path):
+        report = run_batch(["AAPL"], str(tmp_path), period="1mo", workers=0,
+                           provider_name="synthetic", log=quiet)
+        assert report['failed'] == 1
+
+        report = run_batch(["AAPL"], str(tmp_path), period="2y", workers=0,
+                           provider_name="synthetic", log=quiet)
+        assert report['skipped'] == 0
+        assert report['completed'] == 1
+
+    def test_parquet_output(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        run_batch(["AAPL"], str(tmp_path), period="1y", file_format="parquet",
+                  workers=0, provider_name="synthetic", log=quiet)
+
+        table = pd.read_parquet(tmp_path / "AAPL.parquet")
+        assert list(table.columns) == ['date', 'close', 'daily_return', 'sma_20', 'sma_50', 'sma_200']
+        assert pd.api.types.is_datetime64_any_dtype(table['date'])
+
+    def test_process_pool(self, tmp_path):
+        report = run_batch(["AAPL", "MSFT", "GOOG"], str(tmp_path), period="1y",
+                           workers=2, provider_name="synthetic", log=quiet)
+
+        assert report['completed'] == 3
+        assert all(os.path.exists(tmp_path / f"{symbol}.json") for symbol in ("AAPL", "MSFT", "GOOG"))
+
+
+class TestMain:
+    def test_command_line(self, tmp_path, capsys):
+        tickers_file = tmp_path / "tickers.txt"
+        tickers_file.write_text("AAPL\n# comment\nMSFT  # inline\n\n")
+
+        status = main(["--tickers-file", str(tickers_file), "--output-dir", str(tmp_path / "out"),
+                       "--workers", "0", "--provider", "synthetic", "--period", "1y"])
+
+        assert status == 0
+        assert "2 completed" in capsys.readouterr().out
+
+    def test_invalid_arguments(self, tmp_path):
+        assert main(["AAPL", "--start", "2024-01-01", "--output-dir", str(tmp_path)]) == 2
+        assert main(["AAPL", "--sma", "50", "20", "200", "--output-dir", str(tmp_path)]) == 2
+        assert main(["--output-dir", str(tmp_path)]) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
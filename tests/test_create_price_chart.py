@@ -0,0 +1,89 @@
+import pytest
+import numpy as np
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.daily_returns import daily_returns_array, round_returns
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.up_down_runs import direction_codes, calculate_run_arrays
+from INF1002_Stock_Market_Trend_Analysis.src.visualization.create_price_chart import (
+    RUN_STYLES, build_price_chart, _segment_points
+)
+
+
+def make_inputs(prices):
+    dates = [f"2024-01-{day:02d}" for day in range(1, len(prices) + 1)]
+    returns = round_returns(daily_returns_array(prices))
+    runs = calculate_run_arrays(direction_codes(returns))
+    return dates, np.asarray(prices, dtype=np.float64), returns, runs
+
+
+def run_traces(fig):
+    return [trace for trace in fig.data if trace.type == 'scattergl']
+
+
+class TestSegmentPoints:
+    def test_single_segment_run(self):
+        source, segment, gap_slots = _segment_points(np.array([False, True, False]))
+
+        assert source.tolist() == [1, 2, 2]
+        assert segment.tolist() == [1, 1, 1]
+        assert gap_slots.tolist() == [2]
+
+    def test_alternating_runs_are_separated_by_gaps(self):
+        source, segment, gap_slots = _segment_points(np.array([True, False, True, False]))
+
+        assert source.tolist() == [0, 1, 1, 2, 3, 3]
+        assert segment.tolist() == [0, 0, 0, 2, 2, 2]
+        assert gap_slots.tolist() == [2, 5]
+
+    def test_run_at_the_end(self):
+        source, segment, gap_slots = _segment_points(np.array([False, False, True, True]))
+
+        assert source.tolist() == [2, 3, 4, 4]
+        assert segment.tolist() == [2, 3, 3, 3]
+        assert gap_slots.tolist() == [3]
+
+    def test_no_segments(self):
+        source, segment, gap_slots = _segment_points(np.array([False, False]))
+
+        assert len(source) == 0 and len(segment) == 0 and len(gap_slots) == 0
+
+
+class TestBuildPriceChart:
+    def test_one_trace_per_direction(self):
+        fig = build_price_chart(*make_inputs([100, 101, 102, 101, 101, 103]), "TEST", None)
+
+        traces = run_traces(fig)
+        assert len(traces) == 3
+        assert [trace.name for trace in traces] == [f"{label} Runs" for label, _ in RUN_STYLES.values()]
+        assert [trace.line.color for trace in traces] == [color for _, color in RUN_STYLES.values()]
+        assert all(trace.connectgaps is False for trace in traces)
+
+    def test_missing_direction_has_no_trace(self):
+        fig = build_price_chart(*make_inputs([100, 101, 102, 101]), "TEST", None)
+
+        assert [trace.name for trace in run_traces(fig)] == ["Up Runs", "Down Runs"]
+
+    def test_gaps_and_hover_data(self):
+        # Up, down, up: the up trace holds two blocks separated by a gap
+        fig = build_price_chart(*make_inputs([100, 101, 102, 101, 103]), "TEST", None)
+        up = run_traces(fig)[0]
+
+        assert list(up.x) == ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-03",
+                              "2024-01-04", "2024-01-05", "2024-01-05"]
+        assert np.isnan(up.y[3]) and np.isnan(up.y[6])
+        assert up.y[0] == 100 and up.y[5] == 103
+
+        # customdata holds (streak length, day within the streak) per point
+        assert up.customdata.tolist() == [[2, 1], [2, 2], [2, 2], [2, 2], [1, 1], [1, 1], [1, 1]]
+        assert "Streak Length: %{customdata[0]} days" in up.hovertemplate
+        assert "Direction: Up" in up.hovertemplate
+
+
+    def test_zoomable_chart_keeps_all_run_traces(self):
+        fig = build_price_chart(*make_inputs([100, 101, 102, 101]), "TEST", None, range_url="/api/range/TEST")
+
+        assert [trace.name for trace in run_traces(fig)] == [f"{label} Runs" for label, _ in RUN_STYLES.values()]
+        assert all(trace.name != "Close (zoomed)" for trace in fig.data)
+        assert fig.layout.meta['detail_traces'] == [0, 1, 2]
+        assert fig.layout.meta['range_url'] == "/api/range/TEST?view=runs&since=2024-01-01&until=2024-01-04"
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
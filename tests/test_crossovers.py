@@ -0,0 +1,94 @@
+import pytest
+import numpy as np
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.crossovers import find_crossovers, BULLISH, BEARISH
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.simple_moving_average import moving_averages
+from INF1002_Stock_Market_Trend_Analysis.src.visualization.create_price_sma_chart import detect_crossovers
+
+
+def loop_crossovers(fast, slow):
+    # Reference scan: one (day, direction) per crossover
+    events = []
+    for i in range(1, len(fast)):
+        if fast[i - 1] <= slow[i - 1] and fast[i] > slow[i]:
+            events.append((i, BULLISH))
+        elif fast[i - 1] >= slow[i - 1] and fast[i] < slow[i]:
+            events.append((i, BEARISH))
+    return events
+
+
+class TestFindCrossovers:
+    def test_simple_cross(self):
+        fast = [1.0, 2.0, 3.0, 2.0, 1.0]
+        slow = [2.0, 2.0, 2.0, 2.0, 2.0]
+        result = find_crossovers([fast, slow])
+
+        assert result['index'].tolist() == [2, 4]
+        assert result['direction'].tolist() == [BULLISH, BEARISH]
+        assert result['value'].tolist() == [3.0, 1.0]
+        assert result['index'].dtype == np.int64
+        assert result['direction'].dtype == np.int8
+
+    def test_nan_padding_skipped(self):
+        fast = [np.nan, np.nan, 3.0, 1.0]
+        slow = [np.nan, 2.0, 2.0, 2.0]
+        result = find_crossovers([fast, slow])
+
+        assert result['index'].tolist() == [3]
+        assert result['direction'].tolist() == [BEARISH]
+
+    def test_all_pairs_match_loop(self):
+        prices = 100 + np.cumsum(np.random.default_rng(3).normal(0, 1, 2000))
+        windows = (5, 10, 20, 50)
+        smas = moving_averages(prices, windows)
+        averages = [smas[window] for window in windows]
+
+        result = find_crossovers(averages)
+
+        expected = []
+        for fast in range(len(windows)):
+            for slow in range(fast + 1, len(windows)):
+                expected += [(fast, slow, day, direction)
+                             for day, direction in loop_crossovers(averages[fast], averages[slow])]
+        assert list(zip(result['fast'].tolist(), result['slow'].tolist(),
+                        result['index'].tolist(), result['direction'].tolist())) == expected
+
+    def test_pairs_order(self):
+        fast = [1.0, 3.0]
+        medium = [2.0, 2.0]
+        slow = [0.0, 4.0]
+        result = find_crossovers([fast, medium, slow], pairs=[(1, 2), (0, 1)])
+
+        assert result['fast'].tolist() == [1, 0]
+        assert result['slow'].tolist() == [2, 1]
+        assert result['direction'].tolist() == [BEARISH, BULLISH]
+
+    def test_no_crossovers(self):
+        result = find_crossovers([[1.0, 2.0, 3.0], [0.0, 0.0, 0.0]])
+        assert len(result['index']) == 0
+
+    def test_unequal_lengths_raise(self):
+        with pytest.raises(ValueError):
+            find_crossovers([[1.0, 2.0], [1.0]])
+
+
+class TestDetectCrossovers:
+    def test_matches_loop_with_none_padding(self):
+        prices = 100 + np.cumsum(np.random.default_rng(5).normal(0, 1, 600))
+        smas = moving_averages(prices, (10, 30, 60))
+        short, medium, long = ([None if np.isnan(value) else value for value in smas[window]]
+                               for window in (10, 30, 60))
+        dates = [f"day-{i}" for i in range(len(prices))]
+
+        result = detect_crossovers(dates, short, medium, long)
+
+        expected = [('Golden Cross' if direction == BULLISH else 'Death Cross', day)
+                    for day, direction in loop_crossovers(smas[30], smas[60])]
+        expected += [('Bullish Cross' if direction == BULLISH else 'Bearish Cross', day)
+                     for day, direction in loop_crossovers(smas[10], smas[30])]
+        assert [(crossover['type'], crossover['date']) for crossover in result] == \
+            [(crossover_type, dates[day]) for crossover_type, day in expected]
+        assert all(isinstance(crossover['price'], float) for crossover in result)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,7 +1,7 @@
 import pytest
 import pandas as pd
 import numpy as np
-from INF1002_Stock_Market_Trend_Analysis.src.analysis.daily_returns import daily_returns
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.daily_returns import daily_returns, daily_returns_array, round_returns
 
 class TestDailyReturns: 
     def test_basic_calculation(self):
@@ -13,6 +13,13 @@ class TestDailyReturns:
         assert result[2] == -4.55
         assert result[3] == -4.76
     
+    def test_rounds_like_python_round(self):
+        # (213.52 - 320) / 320 * 100 is just above -33.275, np.round gives -33.28
+        result = daily_returns([320.0, 213.52, 282.57])
+        
+        assert result[1] == -33.27
+        assert result[2] == 32.34
+    
     def test_nan_values(self):
         prices = pd.Series([100, np.nan, 110, 120])
         result = daily_returns(prices)
@@ -39,5 +46,58 @@ class TestDailyReturns:
         assert single_result[0] is None
 
 
+
+class TestRoundReturns:
+    def test_matches_python_round(self):
+        values = np.array([-33.275, 135.475, 176.025, 1.005, 2.675, np.nan])
+        result = round_returns(values)
+        
+        assert result[:-1].tolist() == [-33.27, 135.47, 176.03, 1.0, 2.67]
+        assert np.isnan(result[-1])
+    
+    def test_two_dimensional(self):
+        result = round_returns(np.array([[1.005, 2.5], [np.nan, -0.125]]))
+        
+        assert result[0].tolist() == [1.0, 2.5]
+        assert result[1, 1] == -0.12
+
+
+class TestDailyReturnsArray:
+    def test_matches_reference_values(self):
+        prices = pd.Series([100, 110, np.nan, 120, 0, 50, 55])
+        result = daily_returns_array(prices)
+        
+        assert result.dtype == np.float64
+        assert np.isnan(result[[0, 2, 3, 5]]).all()
+        assert result[1] == pytest.approx(10.0)
+        assert result[4] == -100.0
+        assert result[6] == pytest.approx(10.0)
+    
+    def test_log_returns(self):
+        result = daily_returns_array(np.array([100.0, 110.0, 99.0]), log=True)
+        
+        assert np.isnan(result[0])
+        assert result[1] == pytest.approx(np.log(1.1))
+        assert result[2] == pytest.approx(np.log(0.9))
+    
+    def test_none_values_become_nan(self):
+        result = daily_returns_array([100, None, 110])
+        assert np.isnan(result).all()
+    
+    def test_empty_and_single_price(self):
+        assert len(daily_returns_array([])) == 0
+        assert np.isnan(daily_returns_array([100])).all()
+    
+    def test_axis_computes_each_series(self):
+        prices = np.array([[100.0, 110.0, 0.0, 5.0], [50.0, np.nan, 60.0, 66.0]])
+        
+        by_row = daily_returns_array(prices, axis=1)
+        by_column = daily_returns_array(prices.T, axis=0)
+        
+        for row in range(2):
+            assert np.array_equal(by_row[row], daily_returns_array(prices[row]), equal_nan=True)
+        assert np.array_equal(by_column, by_row.T, equal_nan=True)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
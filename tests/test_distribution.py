@@ -0,0 +1,64 @@
+import pytest
+import numpy as np
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.distribution import histogram, box_stats
+
+
+class TestHistogram:
+    def test_matches_numpy_histogram(self):
+        values = np.random.default_rng(0).normal(size=500)
+        result = histogram(values, bins=30)
+        counts, edges = np.histogram(values, bins=30)
+        assert np.array_equal(result['counts'], counts)
+        assert np.allclose(result['centers'], (edges[:-1] + edges[1:]) / 2)
+        assert np.allclose(result['widths'], np.diff(edges))
+
+    def test_missing_values_ignored(self):
+        result = histogram([None, 1.0, 2.0, np.nan, 3.0], bins=3)
+        assert result['counts'].sum() == 3
+
+    def test_size_independent_of_input_length(self):
+        values = np.random.default_rng(1).normal(size=100000)
+        assert len(histogram(values, bins=30)['counts']) == 30
+
+    def test_empty(self):
+        result = histogram([None, None])
+        assert len(result['counts']) == 0
+        assert len(result['centers']) == 0
+
+
+class TestBoxStats:
+    def test_quartiles_and_moments(self):
+        values = [1, 2, 3, 4, 5, 6, 7, 8]
+        result = box_stats(values)
+        assert result['q1'] == np.percentile(values, 25)
+        assert result['median'] == 4.5
+        assert result['q3'] == np.percentile(values, 75)
+        assert result['mean'] == 4.5
+        assert result['sd'] == pytest.approx(np.std(values))
+        assert result['count'] == 8
+
+    def test_fences_and_outliers(self):
+        values = [1, 1, 2, 2, 2, 3, 3, 4, 15, 15, 20]
+        result = box_stats(values)
+        # q1 = 2, q3 = 9.5 -> whiskers reach the extremes within [-9.25, 20.75]
+        assert result['lowerfence'] == 1
+        assert result['upperfence'] == 20
+        assert len(result['outliers']['values']) == 0
+
+        result = box_stats([1, 2, 2, 3, 3, 3, 4, 30, 30])
+        assert result['upperfence'] == 4
+        assert result['outliers']['values'].tolist() == [30]
+        assert result['outliers']['counts'].tolist() == [2]
+
+    def test_single_value(self):
+        result = box_stats([5])
+        assert result['q1'] == result['median'] == result['q3'] == 5
+        assert result['lowerfence'] == result['upperfence'] == 5
+
+    def test_empty(self):
+        assert box_stats([]) is None
+        assert box_stats([np.nan]) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,57 @@
+import pytest
+import numpy as np
+from INF1002_Stock_Market_Trend_Analysis.src.visualization.downsampling import lttb_indices, downsample_indices, date_positions
+
+
+class TestLttb:
+    def test_short_series_is_unchanged(self):
+        assert lttb_indices([1.0, 2.0, 3.0], 10).tolist() == [0, 1, 2]
+    
+    def test_budget_and_endpoints(self):
+        y = np.random.default_rng(0).normal(size=10000).cumsum()
+        result = lttb_indices(y, 500)
+        
+        assert len(result) == 500
+        assert result[0] == 0 and result[-1] == 9999
+        assert (np.diff(result) > 0).all()
+    
+    def test_keeps_spikes(self):
+        y = np.zeros(1000)
+        y[337] = 50.0
+        y[712] = -50.0
+        result = lttb_indices(y, 20)
+        
+        assert 337 in result
+        assert 712 in result
+    
+    def test_nan_values_are_skipped(self):
+        y = np.arange(100, dtype=float)
+        y[:10] = np.nan
+        result = lttb_indices(y, 10)
+        
+        assert not np.isnan(y[result[1:]]).any()
+    
+    def test_invalid_budget_raises_error(self):
+        with pytest.raises(ValueError):
+            lttb_indices(np.arange(10), 2)
+
+
+class TestDownsampleIndices:
+    def test_forced_points_are_kept(self):
+        y = np.random.default_rng(1).normal(size=5000).cumsum()
+        result = downsample_indices(y, 100, keep=[1234, 4321])
+        
+        assert 1234 in result and 4321 in result
+        assert len(result) <= 102
+
+
+class TestDatePositions:
+    def test_finds_existing_dates(self):
+        dates = ['2024-01-01', '2024-01-02', '2024-01-04']
+        result = date_positions(dates, ['2024-01-02', '2024-01-03', '2024-01-04', '2025-01-01'])
+        
+        assert result.tolist() == [1, 2]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,104 @@
+import gzip
+import pytest
+from flask import Flask, Response, request
+from INF1002_Stock_Market_Trend_Analysis.src import http_caching
+from INF1002_Stock_Market_Trend_Analysis.src.http_caching import (compress_response, negotiate_encoding,
+                                                                  is_not_modified, representation_etag)
+
+PAGE = "<html>" + "chart data " * 500 + "</html>"
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+
+    @app.route("/page")
+    def page():
+        if is_not_modified(request.if_none_match, "v1"):
+            response = Response(status=304)
+        else:
+            response = Response(PAGE, mimetype="text/html")
+        response.set_etag("v1")
+        return response
+
+    @app.route("/small")
+    def small():
+        return Response("ok", mimetype="text/plain")
+
+    @app.route("/image")
+    def image():
+        return Response(b"\x89PNG" * 1000, mimetype="image/png")
+
+    @app.after_request
+    def compress(response):
+        return compress_response(response, negotiate_encoding(request.accept_encodings))
+
+    return app.test_client()
+
+
+class TestNegotiation:
+    def test_gzip_when_accepted(self, client, monkeypatch):
+        monkeypatch.setattr(http_caching, 'brotli', None)
+        with client.application.test_request_context(headers={'Accept-Encoding': 'gzip, deflate, br'}):
+            assert negotiate_encoding(request.accept_encodings) == 'gzip'
+
+    def test_none_without_header_or_when_refused(self, client):
+        with client.application.test_request_context():
+            assert negotiate_encoding(request.accept_encodings) is None
+        with client.application.test_request_context(headers={'Accept-Encoding': 'gzip;q=0'}):
+            assert negotiate_encoding(request.accept_encodings) is None
+
+    def test_brotli_preferred_when_installed(self, client, monkeypatch):
+        monkeypatch.setattr(http_caching, 'brotli', object())
+        with client.application.test_request_context(headers={'Accept-Encoding': 'gzip, br'}):
+            assert negotiate_encoding(request.accept_encodings) == 'br'
+
+
+class TestCompressResponse:
+    def test_gzip_body_and_etag(self, client):
+        response = client.get("/page", headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.data).decode() == PAGE
+        assert int(response.headers['Content-Length']) == len(response.data)
+        assert response.get_etag() == ('v1-gzip', False)
+        assert 'Accept-Encoding' in response.headers['Vary']
+
+    def test_uncompressed_without_accept_encoding(self, client):
+        response = client.get("/page")
+
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_data(as_text=True) == PAGE
+        assert response.get_etag() == ('v1', False)
+        assert 'Accept-Encoding' in response.headers['Vary']
+
+    def test_small_and_binary_responses_are_not_compressed(self, client):
+        assert 'Content-Encoding' not in client.get("/small", headers={'Accept-Encoding': 'gzip'}).headers
+        assert 'Content-Encoding' not in client.get("/image", headers={'Accept-Encoding': 'gzip'}).headers
+
+    def test_not_modified_keeps_the_representation_etag(self, client):
+        etag = client.get("/page", headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+
+        response = client.get("/page", headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == etag
+
+
+class TestEtags:
+    def test_representation_etag(self):
+        assert representation_etag('abc', 'gzip') == 'abc-gzip'
+        assert representation_etag('abc', None) == 'abc'
+
+    def test_any_encoding_matches(self, client):
+        for etag in ('"v1"', '"v1-gzip"', '"v1-br"', '"other", "v1-gzip"'):
+            with client.application.test_request_context(headers={'If-None-Match': etag}):
+                assert is_not_modified(request.if_none_match, 'v1')
+
+        with client.application.test_request_context(headers={'If-None-Match': '"v2-gzip"'}):
+            assert not is_not_modified(request.if_none_match, 'v1')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
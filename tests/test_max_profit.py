@@ -1,7 +1,10 @@
 import pytest
 import pandas as pd
+import numpy as np
 import datetime as dt
-from INF1002_Stock_Market_Trend_Analysis.src.analysis.max_profit import max_profit
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.max_profit import (
+    max_profit, max_profit_indices, max_profit_k_indices, max_profit_trades
+)
 
 
 class TestMaxProfit:    
@@ -56,5 +59,75 @@ class TestMaxProfit:
             max_profit(data)
 
 
+
+def brute_force_k(prices, k):
+    # Exhaustive DP over (day, transactions left, holding) for small inputs
+    from functools import lru_cache
+
+    @lru_cache(maxsize=None)
+    def best(i, left, holding):
+        if i == len(prices):
+            return 0.0 if not holding else float('-inf')
+        skip = best(i + 1, left, holding)
+        if holding:
+            return max(skip, prices[i] + best(i + 1, left, False))
+        if left == 0:
+            return skip
+        # Buy today, the earliest sale is tomorrow
+        return max(skip, -prices[i] + best(i + 1, left - 1, True))
+
+    return best(0, k, False)
+
+
+class TestMaxProfitArrays:
+    def test_ties_resolve_to_earliest_dates(self):
+        prices = [100.0, 90.0, 90.0, 120.0, 120.0, 80.0]
+        assert max_profit_indices(prices) == (1, 3, 30.0)
+    
+    def test_nan_prices_are_skipped(self):
+        prices = [np.nan, 100.0, np.nan, 90.0, 130.0]
+        assert max_profit_indices(prices) == (3, 4, 40.0)
+    
+    def test_no_profit(self):
+        assert max_profit_indices([5.0, 4.0, 3.0]) == (None, None, 0.0)
+        assert max_profit_indices([5.0]) == (None, None, 0.0)
+    
+    def test_k_transactions(self):
+        prices = [1.0, 5.0, 2.0, 8.0, 3.0, 10.0]
+        
+        assert max_profit_k_indices(prices, 1) == [(0, 5, 9.0)]
+        assert max_profit_k_indices(prices, 2) == [(0, 3, 7.0), (4, 5, 7.0)]
+        assert max_profit_k_indices(prices, 3) == [(0, 1, 4.0), (2, 3, 6.0), (4, 5, 7.0)]
+    
+    def test_k_transactions_match_brute_force(self):
+        rng = np.random.default_rng(7)
+        for _ in range(20):
+            prices = np.round(rng.uniform(1, 20, 12), 0)
+            for k in (1, 2, 3):
+                trades = max_profit_k_indices(prices, k)
+                
+                assert len(trades) <= k
+                assert all(trades[i][1] < trades[i + 1][0] for i in range(len(trades) - 1))
+                assert sum(profit for _, _, profit in trades) == pytest.approx(brute_force_k(tuple(prices), k))
+    
+    def test_single_trade_matches_max_profit(self):
+        dates = pd.date_range(start='2024-01-01', periods=200, freq='D')
+        data = pd.DataFrame({
+            'Close': 100 * np.exp(np.cumsum(np.random.default_rng(2).normal(0, 0.02, 200)))
+        }, index=dates)
+        
+        assert max_profit_trades(data, 1) == [max_profit(data)]
+    
+    def test_declining_prices_have_no_trades(self):
+        dates = pd.date_range(start='2024-01-01', periods=3, freq='D')
+        data = pd.DataFrame({'Close': [3.0, 2.0, 1.0]}, index=dates)
+        
+        assert max_profit_trades(data, 2) == []
+    
+    def test_invalid_k_raises_error(self):
+        with pytest.raises(ValueError):
+            max_profit_k_indices([1.0, 2.0], 0)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,139 @@
+import multiprocessing
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.memo_cache import MemoCache, content_hash
+from INF1002_Stock_Market_Trend_Analysis.src.analysis import memo_cache
+from INF1002_Stock_Market_Trend_Analysis.src import pipeline
+
+
+def _compute_in_process(path, key, queue):
+    cache = MemoCache(path)
+    queue.put(cache.get_or_compute(key, lambda: 'from child'))
+
+
+class TestContentHash:
+    def test_equal_arrays_give_equal_keys(self):
+        assert content_hash(np.array([1.0, 2.0]), (20, 50)) == content_hash(np.array([1.0, 2.0]), (20, 50))
+
+    def test_values_dtype_and_parameters_change_the_key(self):
+        base = content_hash(np.array([1.0, 2.0]), (20, 50))
+
+        assert content_hash(np.array([1.0, 2.5]), (20, 50)) != base
+        assert content_hash(np.array([1.0, 2.0], dtype=np.float32), (20, 50)) != base
+        assert content_hash(np.array([1.0, 2.0]), (20, 60)) != base
+
+    def test_parts_are_separated(self):
+        assert content_hash('ab', 'c') != content_hash('a', 'bc')
+
+    def test_object_arrays_hash_by_value(self):
+        assert content_hash(np.array(['a', None], dtype=object)) == content_hash(np.array(['a', None], dtype=object))
+
+
+class TestMemoCache:
+    def test_hit_after_miss(self, tmp_path):
+        cache = MemoCache(str(tmp_path / "memo.sqlite3"))
+        calls = []
+
+        first = cache.get_or_compute('a', lambda: calls.append(1) or {'values': np.arange(3)})
+        second = cache.get_or_compute('a', lambda: calls.append(1) or 'other')
+
+        np.testing.assert_array_equal(first['values'], second['values'])
+        assert len(calls) == 1
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_shared_between_instances(self, tmp_path):
+        path = str(tmp_path / "memo.sqlite3")
+        MemoCache(path).get_or_compute('a', lambda: 1)
+
+        assert MemoCache(path).get_or_compute('a', lambda: 2) == 1
+
+    def test_shared_between_processes(self, tmp_path):
+        path = str(tmp_path / "memo.sqlite3")
+        MemoCache(path).set('a', 'from parent')
+
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        child = context.Process(target=_compute_in_process, args=(path, 'a', queue))
+        child.start()
+        result = queue.get(timeout=60)
+        child.join(60)
+
+        assert result == 'from parent'
+
+    def test_size_bounded_lru_eviction(self, tmp_path):
+        cache = MemoCache(str(tmp_path / "memo.sqlite3"), max_bytes=2500)
+        cache.set('a', b'x' * 1000)
+        cache.set('b', b'x' * 1000)
+        cache.get('a')  # 'a' becomes most recently used
+        cache.set('c', b'x' * 1000)
+
+        assert cache.get('a') is not None
+        assert cache.get('b') is None
+        assert cache.stats()['bytes'] <= 2500
+        assert cache.stats()['evictions'] == 1
+
+    def test_errors_are_not_cached(self, tmp_path):
+        cache = MemoCache(str(tmp_path / "memo.sqlite3"))
+
+        def fail():
+            raise ValueError("Bad input")
+
+        with pytest.raises(ValueError, match="Bad input"):
+            cache.get_or_compute('a', fail)
+        assert cache.get_or_compute('a', lambda: 1) == 1
+
+    def test_waits_for_a_computation_claimed_elsewhere(self, tmp_path):
+        path = str(tmp_path / "memo.sqlite3")
+        other = MemoCache(path)
+        assert other._claim('a')
+
+        cache = MemoCache(path)
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(cache.get_or_compute('a', lambda: 'recomputed')))
+        waiter.start()
+        other.set('a', 'claimed result')
+        waiter.join(5)
+
+        assert results == ['claimed result']
+
+    def test_stale_claims_are_taken_over(self, tmp_path):
+        path = str(tmp_path / "memo.sqlite3")
+        assert MemoCache(path)._claim('a')
+
+        cache = MemoCache(path, claim_seconds=0)
+        assert cache.get_or_compute('a', lambda: 'recomputed') == 'recomputed'
+
+    def test_zero_size_disables(self, tmp_path):
+        cache = MemoCache(str(tmp_path / "memo.sqlite3"), max_bytes=0)
+        calls = []
+
+        cache.get_or_compute('a', lambda: calls.append(1))
+        cache.get_or_compute('a', lambda: calls.append(1))
+
+        assert len(calls) == 2
+
+
+class TestAnalyzeDataMemo:
+    def test_identical_data_is_analyzed_once(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(memo_cache, '_memo_cache', MemoCache(str(tmp_path / "memo.sqlite3")))
+        calls = []
+        analyze_frame = pipeline._analyze_frame
+        monkeypatch.setattr(pipeline, '_analyze_frame', lambda *args: calls.append(1) or analyze_frame(*args))
+
+        index = pd.date_range("2024-01-01", periods=30, freq="D")
+        data = pd.DataFrame({'Close': np.linspace(100, 130, 30)}, index=index)
+
+        first = pipeline.analyze_data(data, (2, 5, 10))
+        second = pipeline.analyze_data(data.copy(), (2, 5, 10))
+        pipeline.analyze_data(data, (3, 5, 10))
+
+        assert len(calls) == 2
+        np.testing.assert_array_equal(first['returns'], second['returns'])
+        assert list(first['dates']) == list(second['dates'])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,306 @@
+import json
+import subprocess
+import sys
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.memo_cache import MemoCache
+from INF1002_Stock_Market_Trend_Analysis.src.analysis import memo_cache, price_providers, range_index
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.data_fetcher import data_version
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.price_providers import SyntheticProvider
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.result_cache import ResultCache
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.simple_moving_average import moving_averages
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.daily_returns import daily_returns
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.max_profit import max_profit
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.volatility import analyze_volatility
+from INF1002_Stock_Market_Trend_Analysis.src.visualization import zoom_pyramid
+from INF1002_Stock_Market_Trend_Analysis.src.visualization.create_price_chart import build_price_chart
+from INF1002_Stock_Market_Trend_Analysis.src import pipeline
+
+BUILDERS = ('price', 'price_sma', 'run_statistics', 'volatility')
+
+
+class StubFigure:
+    def __init__(self, name):
+        self.name = name
+
+    def to_json(self):
+        return json.dumps({'data': [], 'layout': {'title': self.name}})
+
+
+@pytest.fixture
+def rendered(tmp_path, monkeypatch):
+    """
+    Serial rendering into a fresh memo cache, with stub builders that record
+    which charts were rendered.
+    """
+    monkeypatch.setattr(memo_cache, '_memo_cache', MemoCache(str(tmp_path / "memo.sqlite3")))
+    monkeypatch.setattr(pipeline, 'get_chart_executor', lambda: None)
+
+    calls = []
+    for name in BUILDERS:
+        monkeypatch.setitem(pipeline.CHARTS, name, (
+            lambda *args, name=name, **kwargs: calls.append(name) or StubFigure(name),
+            lambda *args, name=name, **kwargs: calls.append(name) or f"<div>{name} {len(calls)}</div>"
+        ))
+    return calls
+
+
+def make_data(days=60, last=None):
+    index = pd.date_range("2024-01-01", periods=days, freq="D")
+    close = 100 + np.sin(np.arange(days) / 3) * 5
+    if last is not None:
+        close[-1] = last
+    return pd.DataFrame({'Close': close}, index=index)
+
+
+class TestAnalyzeData:
+    def test_date_range_statistics_come_from_the_history_index(self, rendered, monkeypatch):
+        rng = np.random.default_rng(7)
+        history = make_data(400)
+        history['Close'] *= np.exp(np.cumsum(rng.normal(0, 0.02, 400)))
+        loads = []
+
+        def fetch(symbol, period=None, start_date=None, end_date=None):
+            if period == "max":
+                loads.append(symbol)
+                return history
+            return history[(history.index >= start_date) & (history.index < end_date)]
+        monkeypatch.setattr(pipeline, 'data_fetcher', fetch)
+        monkeypatch.setattr(pipeline, 'source_version', lambda symbol: "v1")
+        monkeypatch.setattr(range_index, '_index_cache', ResultCache(maxsize=4, ttl=60))
+
+        rescans = []
+        monkeypatch.setattr(pipeline, 'analyze_volatility', lambda returns: rescans.append('volatility'))
+        monkeypatch.setattr(pipeline, 'max_profit', lambda data: rescans.append('max_profit'))
+
+        for start, end in [("2024-02-01", "2024-10-01"), ("2024-03-15", "2024-12-01")]:
+            pipeline.analysis_figures("TEST", start_date=start, end_date=end, sma_windows=(5, 10, 20))
+
+            # Memoized by the analysis above
+            data = pipeline.fetch_data("TEST", start_date=start, end_date=end)
+            analysis = pipeline.analyze_data(data, (5, 10, 20))
+            assert analysis['volatility'] == analyze_volatility(daily_returns(data['Close'].tolist()))
+            assert analysis['max_profit'] == max_profit(data)
+
+        assert rescans == []
+        assert loads == ["TEST"]
+
+    def test_revised_date_range_is_rescanned(self, rendered, monkeypatch):
+        history = make_data(100)
+        revised = history.copy()
+        revised.iloc[50, 0] += 1
+        monkeypatch.setattr(pipeline, 'data_fetcher', lambda symbol, period=None, **window: history)
+        monkeypatch.setattr(pipeline, 'source_version', lambda symbol: "v1")
+        monkeypatch.setattr(range_index, '_index_cache', ResultCache(maxsize=4, ttl=60))
+
+        analysis = pipeline.analyze_data(revised, (5, 10, 20), lambda: pipeline.history_index("TEST"))
+
+        assert analysis['volatility'] == analyze_volatility(daily_returns(revised['Close'].tolist()))
+        assert analysis['max_profit'] == max_profit(revised)
+
+    def test_analysis_version_is_part_of_the_key(self, rendered, monkeypatch):
+        calls = []
+        analyze = pipeline._analyze_frame
+        monkeypatch.setattr(pipeline, '_analyze_frame', lambda *args: calls.append(args) or analyze(*args))
+
+        pipeline.analyze_data(make_data(), (5, 10, 20))
+        pipeline.analyze_data(make_data(), (5, 10, 20))
+        assert len(calls) == 1
+
+        monkeypatch.setattr(pipeline, 'ANALYSIS_VERSION', pipeline.ANALYSIS_VERSION + 1)
+        pipeline.analyze_data(make_data(), (5, 10, 20))
+        assert len(calls) == 2
+
+
+class TestRenderCharts:
+    def test_unchanged_inputs_are_not_rendered_again(self, rendered):
+        analysis = pipeline.analyze_data(make_data(), (5, 10, 20))
+
+        first = pipeline.render_charts("TEST", analysis)
+        second = pipeline.render_charts("TEST", analysis)
+
+        assert first == second
+        assert sorted(rendered) == sorted(BUILDERS)
+
+    def test_sma_windows_only_rerender_the_sma_chart(self, rendered):
+        pipeline.render_charts("TEST", pipeline.analyze_data(make_data(), (5, 10, 20)))
+        rendered.clear()
+
+        pipeline.render_charts("TEST", pipeline.analyze_data(make_data(), (5, 10, 30)))
+
+        assert rendered == ['price_sma']
+
+    def test_new_bars_rerender_every_chart(self, rendered):
+        pipeline.render_charts("TEST", pipeline.analyze_data(make_data(), (5, 10, 20)))
+        rendered.clear()
+
+        pipeline.render_charts("TEST", pipeline.analyze_data(make_data(days=61), (5, 10, 20)))
+        assert sorted(rendered) == sorted(BUILDERS)
+        rendered.clear()
+
+        # A revised last bar changes the data as well
+        pipeline.render_charts("TEST", pipeline.analyze_data(make_data(days=61, last=90.0), (5, 10, 20)))
+        assert sorted(rendered) == sorted(BUILDERS)
+
+    def test_chart_version_is_part_of_the_key(self, rendered, monkeypatch):
+        analysis = pipeline.analyze_data(make_data(), (5, 10, 20))
+        pipeline.render_charts("TEST", analysis)
+        rendered.clear()
+
+        monkeypatch.setattr(pipeline, 'CHART_VERSION', pipeline.CHART_VERSION + 1)
+        pipeline.render_charts("TEST", analysis)
+
+        assert sorted(rendered) == sorted(BUILDERS)
+
+    def test_symbol_is_part_of_the_key(self, rendered):
+        analysis = pipeline.analyze_data(make_data(), (5, 10, 20))
+        pipeline.render_charts("TEST", analysis)
+        rendered.clear()
+
+        pipeline.render_charts("OTHER", analysis)
+
+        assert sorted(rendered) == sorted(BUILDERS)
+
+    def test_template_keys(self, rendered):
+        charts = pipeline.render_charts("TEST", pipeline.analyze_data(make_data(), (5, 10, 20)))
+
+        assert sorted(charts) == sorted(f"{name}_chart_html" for name in BUILDERS)
+
+    @pytest.mark.parametrize("mode", ["thread", "process"])
+    def test_executors_render_the_same_charts(self, mode, tmp_path, monkeypatch):
+        monkeypatch.setattr(pipeline, '_executor', None)
+        monkeypatch.setattr(memo_cache, '_memo_cache', MemoCache(str(tmp_path / "serial.sqlite3")))
+        analysis = pipeline.analyze_data(make_data(), (5, 10, 20))
+        monkeypatch.setattr(pipeline, 'CHART_EXECUTOR', 'serial')
+        serial = pipeline.render_charts("TEST", analysis)
+
+        monkeypatch.setattr(memo_cache, '_memo_cache', MemoCache(str(tmp_path / f"{mode}.sqlite3")))
+        monkeypatch.setattr(pipeline, 'CHART_EXECUTOR', mode)
+        try:
+            assert pipeline.get_chart_executor() is not None
+            assert pipeline.render_charts("TEST", analysis) == serial
+            assert 'id="price-sma-plot"' in serial['price_sma_chart_html']
+        finally:
+            pipeline.shutdown_chart_executor()
+        assert pipeline._executor is None
+
+    def test_unknown_executor_fails_at_import(self, monkeypatch):
+        monkeypatch.setenv("CHART_EXECUTOR", "fibers")
+
+        result = subprocess.run([sys.executable, "-c", "import INF1002_Stock_Market_Trend_Analysis.src.pipeline"],
+                                 capture_output=True, text=True)
+
+        assert result.returncode != 0
+        assert "Unknown chart executor: fibers" in result.stderr
+
+
+class TestChartFigures:
+    def test_figure_json_for_selected_charts(self, rendered):
+        analysis = pipeline.analyze_data(make_data(), (5, 10, 20))
+
+        figures = pipeline.chart_figures("TEST", analysis, ['volatility'])
+
+        assert list(figures) == ['volatility']
+        assert json.loads(figures['volatility'])['layout']['title'] == 'volatility'
+
+    def test_json_and_html_are_cached_separately(self, rendered):
+        analysis = pipeline.analyze_data(make_data(), (5, 10, 20))
+        pipeline.render_charts("TEST", analysis)
+        rendered.clear()
+
+        pipeline.chart_figures("TEST", analysis)
+        pipeline.chart_figures("TEST", analysis)
+
+        assert sorted(rendered) == sorted(BUILDERS)
+
+    def test_unknown_chart(self, rendered):
+        analysis = pipeline.analyze_data(make_data(), (5, 10, 20))
+
+        with pytest.raises(KeyError, match="Unknown chart"):
+            pipeline.chart_figures("TEST", analysis, ['candles'])
+
+    def test_arrays_are_base64_encoded(self):
+        figure = json.loads(pipeline.figure_json(lambda: go.Figure(go.Scatter(y=np.array([1.5, 2.5])))))
+
+        assert figure['data'][0]['y']['dtype'] == 'f8'
+        assert 'bdata' in figure['data'][0]['y']
+
+
+
+class CountingProvider(SyntheticProvider):
+    def __init__(self):
+        super().__init__(days=600)
+        self.loads = 0
+
+    def load(self, *args, **kwargs):
+        self.loads += 1
+        return super().load(*args, **kwargs)
+
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    """
+    A synthetic provider that counts history loads, with fresh pyramid and memo caches.
+    """
+    provider = CountingProvider()
+    monkeypatch.setattr(price_providers, '_provider', provider)
+    monkeypatch.setattr(zoom_pyramid, '_pyramid_cache', ResultCache(maxsize=32, ttl=3600))
+    monkeypatch.setattr(memo_cache, '_memo_cache', MemoCache(str(tmp_path / "memo.sqlite3")))
+    return provider
+
+
+class TestRangeData:
+    def test_data_version_covers_every_bar(self):
+        data = make_data()
+        revised = make_data()
+        revised.iloc[10, 0] += 0.01
+
+        assert data_version(data) == data_version(make_data())
+        assert data_version(revised) != data_version(data)
+
+    def test_zooms_do_not_reload_the_history(self, provider):
+        pipeline.range_data("TEST", "2024-01-01", "2024-06-01", points=100)
+        pipeline.range_data("TEST", "2024-02-01", "2024-03-01", points=100)
+
+        assert provider.loads == 1
+
+    def test_run_traces_match_the_price_chart(self, provider):
+        analysis = pipeline.analyze_data(pipeline.fetch_data("TEST", period="max"), (5, 10, 20))
+        fig = build_price_chart(analysis['dates'], analysis['closing_prices'], analysis['returns'],
+                                analysis['run_arrays'], "TEST", analysis['max_profit'], max_points=10000,
+                                range_url="/api/range/TEST")
+
+        traces = pipeline.range_data("TEST", points=10000, view='runs')['traces']
+
+        assert len(traces) == 3
+        for trace, expected in zip(traces, fig.data[:3]):
+            assert trace['x'] == list(expected.x)
+            np.testing.assert_array_equal(np.array(trace['y'], dtype=np.float64), expected.y)
+            assert trace['customdata'] == expected.customdata.tolist()
+
+    def test_sma_traces_match_moving_averages(self, provider):
+        history = pipeline.fetch_data("TEST", period="max")
+        since, until = f"{history.index[100]:%Y-%m-%d}", f"{history.index[299]:%Y-%m-%d}"
+        window = history['Close'].to_numpy()[100:300]
+
+        result = pipeline.range_data("TEST", points=10000, view='sma', since=since, until=until,
+                                     sma_windows=(5, 10, 20))
+
+        traces = result['traces']
+        assert len(traces) == 4
+        assert traces[0]['y'] == window.tolist()
+        expected = moving_averages(window, (5, 10, 20))
+        for trace, size in zip(traces[1:], (5, 10, 20)):
+            values = np.array(trace['y'], dtype=np.float64)
+            np.testing.assert_array_equal(values, np.asarray(expected[size], dtype=np.float64))
+
+    def test_invalid_view(self, provider):
+        with pytest.raises(ValueError, match="Unknown range view"):
+            pipeline.range_data("TEST", view='candles')
+        with pytest.raises(ValueError, match="SMA windows"):
+            pipeline.range_data("TEST", view='sma')
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
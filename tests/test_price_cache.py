@@ -0,0 +1,150 @@
+import pytest
+import pandas as pd
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.price_cache import PriceCache, slice_history
+
+
+def make_history(start, periods):
+    dates = pd.date_range(start=start, periods=periods, freq='D', tz='America/New_York')
+    return pd.DataFrame({
+        'Open': [100.0 + i for i in range(periods)],
+        'High': [101.0 + i for i in range(periods)],
+        'Low': [99.0 + i for i in range(periods)],
+        'Close': [100.5 + i for i in range(periods)],
+        'Volume': [1000.0] * periods,
+    }, index=dates)
+
+
+class FakeFetch:
+    def __init__(self, full_history):
+        self.full_history = full_history
+        self.calls = []
+
+    def __call__(self, ticker, period=None, start=None, end=None):
+        self.calls.append({'period': period, 'start': start})
+        if period == 'max':
+            return self.full_history
+        start = pd.Timestamp(start).tz_localize(self.full_history.index.tz)
+        return self.full_history[self.full_history.index >= start]
+
+
+class TestPriceCache:
+    def test_first_request_fetches_full_history(self, tmp_path):
+        fetch = FakeFetch(make_history('2024-01-01', 30))
+        cache = PriceCache(path=str(tmp_path / 'prices.sqlite3'), fetch=fetch)
+
+        result = cache.history('aapl', period='max')
+
+        assert len(result) == 30
+        assert fetch.calls == [{'period': 'max', 'start': None}]
+        assert result['Close'].iloc[0] == 100.5
+        assert str(result.index.tz) == 'America/New_York'
+
+    def test_repeat_request_served_from_disk(self, tmp_path):
+        fetch = FakeFetch(make_history('2024-01-01', 30))
+        cache = PriceCache(path=str(tmp_path / 'prices.sqlite3'), fetch=fetch)
+
+        cache.history('AAPL', period='max')
+        cache.history('AAPL', start_date='2024-01-05', end_date='2024-01-10')
+
+        assert len(fetch.calls) == 1
+
+    def test_stale_cache_fetches_only_tail(self, tmp_path):
+        fetch = FakeFetch(make_history('2024-01-01', 30))
+        cache = PriceCache(path=str(tmp_path / 'prices.sqlite3'), fetch=fetch, refresh_seconds=0)
+
+        cache.history('AAPL', period='max')
+        fetch.full_history = make_history('2024-01-01', 35)
+        result = cache.history('AAPL', period='max')
+
+        assert len(result) == 35
+        assert fetch.calls[1] == {'period': None, 'start': '2024-01-30'}
+
+    def test_split_in_tail_replaces_adjusted_history(self, tmp_path):
+        fetch = FakeFetch(make_history('2024-01-01', 30))
+        cache = PriceCache(path=str(tmp_path / 'prices.sqlite3'), fetch=fetch, refresh_seconds=0)
+        cache.history('AAPL', period='max')
+
+        # A 4:1 split on day 33, yfinance re-adjusts every earlier bar
+        history = make_history('2024-01-01', 35)
+        history['Stock Splits'] = 0.0
+        history.iloc[32, history.columns.get_loc('Stock Splits')] = 4.0
+        for column in ('Open', 'High', 'Low', 'Close'):
+            history.iloc[:32, history.columns.get_loc(column)] /= 4
+        fetch.full_history = history
+
+        result = cache.history('AAPL', period='max')
+
+        assert [call['period'] for call in fetch.calls] == ['max', None, 'max']
+        assert result['Close'].tolist() == history['Close'].tolist()
+        assert result['Close'].pct_change().min() > -0.5
+
+    def test_known_event_in_tail_does_not_refetch(self, tmp_path):
+        history = make_history('2024-01-01', 30)
+        history['Dividends'] = 0.0
+        history.iloc[-1, history.columns.get_loc('Dividends')] = 0.25
+        fetch = FakeFetch(history)
+        cache = PriceCache(path=str(tmp_path / 'prices.sqlite3'), fetch=fetch, refresh_seconds=0)
+
+        cache.history('AAPL', period='max')
+        cache.history('AAPL', period='max')
+
+        assert [call['period'] for call in fetch.calls] == ['max', None]
+
+    def test_failed_tail_refresh_serves_stale_copy(self, tmp_path, caplog):
+        fetch = FakeFetch(make_history('2024-01-01', 30))
+        cache = PriceCache(path=str(tmp_path / 'prices.sqlite3'), fetch=fetch, refresh_seconds=0)
+        cache.history('AAPL', period='max')
+
+        def failing_fetch(ticker, **kwargs):
+            raise ConnectionError("offline")
+        cache.fetch = failing_fetch
+
+        assert len(cache.history('AAPL', period='max')) == 30
+        assert "offline" in caplog.text
+
+    def test_version_changes_with_new_bars(self, tmp_path):
+        fetch = FakeFetch(make_history('2024-01-01', 30))
+        cache = PriceCache(path=str(tmp_path / 'prices.sqlite3'), fetch=fetch, refresh_seconds=0)
+
+        assert cache.version('AAPL') is None
+        cache.history('AAPL', period='max')
+        first = cache.version('AAPL')
+        assert cache.version('AAPL') == first
+
+        fetch.full_history = make_history('2024-01-01', 35)
+        cache.refresh('AAPL')
+        assert cache.version('AAPL') != first
+
+    def test_date_range_is_end_exclusive(self, tmp_path):
+        fetch = FakeFetch(make_history('2024-01-01', 30))
+        cache = PriceCache(path=str(tmp_path / 'prices.sqlite3'), fetch=fetch)
+
+        result = cache.history('AAPL', start_date='2024-01-05', end_date='2024-01-10')
+
+        assert result.index[0].strftime('%Y-%m-%d') == '2024-01-05'
+        assert result.index[-1].strftime('%Y-%m-%d') == '2024-01-09'
+
+    def test_unknown_ticker_returns_empty(self, tmp_path):
+        fetch = FakeFetch(make_history('2024-01-01', 0))
+        cache = PriceCache(path=str(tmp_path / 'prices.sqlite3'), fetch=fetch)
+
+        assert cache.history('NOPE', period='1y').empty
+
+
+class TestSliceHistory:
+    def test_day_period_counts_trading_days(self):
+        data = make_history('2024-01-01', 30)
+        assert len(slice_history(data, period='5d')) == 5
+
+    def test_relative_period(self):
+        data = make_history(pd.Timestamp.now().normalize() - pd.Timedelta(days=99), 100)
+        result = slice_history(data, period='1mo')
+        assert 28 <= len(result) <= 32
+
+    def test_invalid_period_raises_error(self):
+        with pytest.raises(ValueError, match="Invalid period"):
+            slice_history(make_history('2024-01-01', 5), period='forever')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,75 @@
+import pytest
+import pandas as pd
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.data_fetcher import data_fetcher
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.price_providers import (
+    LocalFileProvider, PriceProvider, SyntheticProvider, create_provider
+)
+
+
+class TestLocalFileProvider:
+    def test_reads_csv_and_slices_date_range(self, tmp_path):
+        data = pd.DataFrame({
+            'Date': pd.date_range(start='2024-01-01', periods=10, freq='D').strftime('%Y-%m-%d'),
+            'Close': [100.0 + i for i in range(10)]
+        })
+        data.to_csv(tmp_path / 'AAPL.csv', index=False)
+        provider = LocalFileProvider(str(tmp_path))
+
+        result = data_fetcher('aapl', start_date='2024-01-03', end_date='2024-01-06', provider=provider)
+
+        assert result['Close'].tolist() == [102.0, 103.0, 104.0]
+        assert result.index[0].strftime('%Y-%m-%d') == '2024-01-03'
+
+    def test_drops_incomplete_rows(self, tmp_path):
+        data = pd.DataFrame({
+            'Date': ['2024-01-01', '2024-01-02', '2024-01-03'],
+            'Close': [100.0, None, 102.0]
+        })
+        data.to_csv(tmp_path / 'MSFT.csv', index=False)
+
+        result = LocalFileProvider(str(tmp_path)).history('MSFT', period='max')
+
+        assert result['Close'].tolist() == [100.0, 102.0]
+
+    def test_missing_file_raises_error(self, tmp_path):
+        with pytest.raises(ValueError, match="No local price file"):
+            LocalFileProvider(str(tmp_path)).history('NOPE', period='1y')
+
+
+class TestSyntheticProvider:
+    def test_series_is_reproducible(self):
+        first = SyntheticProvider(seed=1).history('AAPL', period='1y')
+        second = SyntheticProvider(seed=1).history('AAPL', period='1y')
+
+        assert first['Close'].equals(second['Close'])
+        assert (first['Close'] > 0).all()
+
+    def test_tickers_get_different_series(self):
+        provider = SyntheticProvider(seed=1)
+        assert not provider.history('AAPL', period='5d')['Close'].equals(
+            provider.history('MSFT', period='5d')['Close'])
+
+    def test_requires_period_or_dates(self):
+        with pytest.raises(ValueError, match="Either period"):
+            SyntheticProvider().history('AAPL')
+
+
+class TestCreateProvider:
+    def test_known_names(self, tmp_path):
+        assert isinstance(create_provider('synthetic'), SyntheticProvider)
+        assert isinstance(create_provider('local', data_dir=str(tmp_path)), LocalFileProvider)
+
+    def test_unknown_name_raises_error(self):
+        with pytest.raises(ValueError, match="Unknown price provider"):
+            create_provider('bloomberg')
+
+    def test_provider_must_implement_load(self):
+        class Incomplete(PriceProvider):
+            name = "incomplete"
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,105 @@
+import pytest
+import numpy as np
+import pandas as pd
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.range_index import PriceRangeIndex, SparseTable, MaxProfitSegmentTree
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.analysis_frame import AnalysisFrame
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.daily_returns import daily_returns
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.max_profit import max_profit, max_profit_indices
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.volatility import analyze_volatility
+
+
+def make_data(periods, seed=0, decimals=None):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start='2020-01-01', periods=periods, freq='D')
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, periods)))
+    if decimals is not None:
+        close = np.round(close, decimals)
+    return pd.DataFrame({'Close': close}, index=dates)
+
+
+class TestSparseTable:
+    def test_range_min_and_max(self):
+        values = np.random.default_rng(0).normal(size=100)
+        maxima = SparseTable(values, np.maximum)
+        minima = SparseTable(values, np.minimum)
+        
+        for left, right in [(0, 0), (0, 99), (13, 57), (98, 99)]:
+            assert maxima.query(left, right) == values[left:right + 1].max()
+            assert minima.query(left, right) == values[left:right + 1].min()
+
+
+class TestMaxProfitSegmentTree:
+    def test_matches_scan_including_ties(self):
+        # Integer prices produce plenty of ties
+        prices = np.random.default_rng(1).integers(1, 10, 300).astype(float)
+        tree = MaxProfitSegmentTree(prices)
+        rng = np.random.default_rng(2)
+        
+        for _ in range(300):
+            left, right = sorted(rng.integers(0, len(prices), 2))
+            buy, sell, profit = max_profit_indices(prices[left:right + 1])
+            expected = (None, None, 0.0) if buy is None else (buy + left, sell + left, profit)
+            assert tree.query(left, right) == expected
+
+
+class TestPriceRangeIndex:
+    def test_matches_batch_functions_on_date_windows(self):
+        data = make_data(400, decimals=1)
+        index = PriceRangeIndex(data)
+        
+        for start, end in [('2020-01-01', '2021-02-04'), ('2020-03-15', '2020-06-01'), ('2020-08-01', '2020-08-20')]:
+            window = data[(data.index >= start) & (data.index < end)]
+            
+            assert index.max_profit(start, end) == max_profit(window)
+            
+            assert index.volatility(start, end) == analyze_volatility(daily_returns(window['Close'].tolist()))
+    
+    def test_volatility_is_exact_on_every_window(self):
+        # Prices to one decimal give returns on a coarse grid, with many rounding ties
+        data = make_data(300, seed=3, decimals=1)
+        index = PriceRangeIndex(data)
+        returns = daily_returns(data['Close'].tolist())
+        
+        for first in range(0, 300, 7):
+            for last in range(first + 1, 300, 5):
+                expected = analyze_volatility([None] + returns[first + 1:last + 1])
+                assert index.volatility_between(first, last) == expected
+    
+    def test_positions_of_a_slice(self):
+        data = make_data(50)
+        index = PriceRangeIndex(data)
+        
+        assert index.positions(AnalysisFrame.from_dataframe(data.iloc[10:30])) == (10, 29)
+        assert index.positions(AnalysisFrame.from_dataframe(data)) == (0, 49)
+        
+        revised = data.iloc[10:30].copy()
+        revised.iloc[5, 0] += 1
+        assert index.positions(AnalysisFrame.from_dataframe(revised)) is None
+        
+        later = make_data(60).iloc[45:]
+        assert index.positions(AnalysisFrame.from_dataframe(later)) is None
+    
+    def test_price_range(self):
+        data = make_data(50)
+        index = PriceRangeIndex(data)
+        
+        assert index.price_range(5, 20) == (data['Close'].iloc[5:21].min(), data['Close'].iloc[5:21].max())
+    
+    def test_empty_window(self):
+        index = PriceRangeIndex(make_data(20))
+        
+        assert index.volatility('2030-01-01', '2030-02-01') is None
+        with pytest.raises(ValueError, match="No profit opportunity"):
+            index.max_profit('2030-01-01', '2030-02-01')
+    
+    def test_declining_window_raises_error(self):
+        dates = pd.date_range(start='2024-01-01', periods=4, freq='D')
+        index = PriceRangeIndex(pd.DataFrame({'Close': [4.0, 3.0, 2.0, 5.0]}, index=dates))
+        
+        with pytest.raises(ValueError, match="No profit opportunity"):
+            index.max_profit('2024-01-01', '2024-01-04')
+        assert index.max_profit()['max_profit'] == 3.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
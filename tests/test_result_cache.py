@@ -0,0 +1,95 @@
+import threading
+import time
+import pytest
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.result_cache import ResultCache, make_key
+
+
+class TestResultCache:
+    def test_hit_after_miss(self):
+        cache = ResultCache(maxsize=4, ttl=60)
+        calls = []
+
+        first = cache.get_or_compute('a', lambda: calls.append(1) or 'value')
+        second = cache.get_or_compute('a', lambda: calls.append(1) or 'other')
+
+        assert first == second == 'value'
+        assert len(calls) == 1
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_lru_eviction(self):
+        cache = ResultCache(maxsize=2, ttl=60)
+        cache.get_or_compute('a', lambda: 1)
+        cache.get_or_compute('b', lambda: 2)
+        cache.get_or_compute('a', lambda: 1)  # 'a' becomes most recently used
+        cache.get_or_compute('c', lambda: 3)
+
+        assert cache.get_or_compute('a', lambda: 'recomputed') == 1
+        assert cache.get_or_compute('b', lambda: 'recomputed') == 'recomputed'
+        assert cache.stats()['evictions'] >= 1
+
+    def test_ttl_expiry(self):
+        cache = ResultCache(maxsize=2, ttl=0.01)
+        cache.get_or_compute('a', lambda: 1)
+        time.sleep(0.02)
+
+        assert cache.get_or_compute('a', lambda: 2) == 2
+        assert cache.stats()['expirations'] == 1
+
+    def test_errors_are_not_cached(self):
+        cache = ResultCache(maxsize=2, ttl=60)
+
+        def fail():
+            raise ValueError("No data")
+
+        with pytest.raises(ValueError, match="No data"):
+            cache.get_or_compute('a', fail)
+        assert cache.get_or_compute('a', lambda: 1) == 1
+
+    def test_concurrent_requests_share_one_computation(self):
+        cache = ResultCache(maxsize=2, ttl=60)
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def slow_compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'value'
+
+        def worker():
+            results.append(cache.get_or_compute('a', slow_compute))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        while cache.stats()['coalesced'] < 7:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(calls) == 1
+        assert results == ['value'] * 8
+
+    def test_invalid_maxsize_raises_error(self):
+        with pytest.raises(ValueError):
+            ResultCache(maxsize=0)
+
+
+class TestMakeKey:
+    def test_normalizes_symbol_and_period(self):
+        assert make_key('aapl ', period='1Y', sma_windows=('20', 50, 200)) == \
+            make_key('AAPL', period='1y', sma_windows=(20, 50, 200))
+
+    def test_date_range_ignores_period(self):
+        key = make_key('AAPL', period='1y', start_date='2024-01-01', end_date='2024-06-01')
+        assert key == ('AAPL', None, '2024-01-01', '2024-06-01', ())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
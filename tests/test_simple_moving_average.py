@@ -1,6 +1,7 @@
 import pytest
 import pandas as pd
-from INF1002_Stock_Market_Trend_Analysis.src.analysis.simple_moving_average import simple_moving_average
+import numpy as np
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.simple_moving_average import simple_moving_average, sma_array, moving_averages
 
 class TestSimpleMovingAverage:
     def test_window_size_one(self):
@@ -36,5 +37,45 @@ class TestSimpleMovingAverage:
         assert result == []
 
 
+
+class TestMovingAverages:
+    def test_padded_with_nan(self):
+        result = sma_array([10, 20, 30, 40], 3)
+        
+        assert np.isnan(result[:2]).all()
+        assert result[2:].tolist() == pytest.approx([20.0, 30.0])
+    
+    def test_many_windows_match_rolling_mean(self):
+        prices = np.random.default_rng(0).uniform(50, 150, 1000)
+        result = moving_averages(prices, [5, 50, 200])
+        
+        for window in (5, 50, 200):
+            expected = pd.Series(prices).rolling(window).mean().to_numpy()
+            np.testing.assert_allclose(result[window], expected, rtol=1e-9, equal_nan=True)
+    
+    def test_window_with_missing_price_is_nan(self):
+        result = sma_array([10, np.nan, 30, 40, 50], 2)
+        
+        assert np.isnan(result[:3]).all()
+        assert result[3] == 35.0
+        assert result[4] == 45.0
+    
+    def test_axis_averages_each_series(self):
+        prices = np.random.default_rng(1).uniform(50, 150, (3, 100))
+        prices[1, 40] = np.nan
+        
+        by_row = moving_averages(prices, [5, 20], axis=1)
+        by_column = moving_averages(prices.T, [5, 20], axis=0)
+        
+        for window in (5, 20):
+            for row in range(3):
+                np.testing.assert_array_equal(by_row[window][row], sma_array(prices[row], window))
+            np.testing.assert_array_equal(by_column[window], by_row[window].T)
+    
+    def test_invalid_window_raises_error(self):
+        with pytest.raises(ValueError):
+            moving_averages([1, 2, 3], [0])
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
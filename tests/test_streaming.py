@@ -0,0 +1,108 @@
+import pytest
+import numpy as np
+import pandas as pd
+from INF1002_Stock_Market_Trend_Analysis.src.analysis import streaming
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.streaming import StreamingAnalyzer
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.daily_returns import daily_returns
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.simple_moving_average import moving_averages
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.up_down_runs import calculate_directions, calculate_runs, analyze_runs
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.volatility import analyze_volatility
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.max_profit import max_profit
+
+
+def make_data(periods, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start='2020-01-01', periods=periods, freq='D')
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, periods)))
+    return pd.DataFrame({'Close': close}, index=dates)
+
+
+class TestStreamingAnalyzer:
+    def test_matches_batch_functions(self):
+        data = make_data(600)
+        analyzer = StreamingAnalyzer.from_history(data, sma_windows=(5, 20, 200))
+        
+        closing_prices = data['Close'].tolist()
+        returns = daily_returns(closing_prices)
+        smas = moving_averages(closing_prices, (5, 20, 200))
+        
+        for window, value in analyzer.sma().items():
+            assert value == smas[window][-1]
+        assert analyzer.volatility() == analyze_volatility(returns)
+        assert analyzer.run_stats() == analyze_runs(calculate_runs(calculate_directions(returns)))
+        assert analyzer.max_profit() == max_profit(data)
+    
+    def test_incremental_updates_track_batch(self):
+        data = make_data(120, seed=3)
+        analyzer = StreamingAnalyzer(sma_windows=(10,))
+        
+        for i, (date, close) in enumerate(zip(data.index, data['Close'])):
+            analyzer.update(close, date)
+            if i >= 10:
+                window = data.iloc[:i + 1]
+                assert analyzer.sma()[10] == moving_averages(window['Close'].tolist(), (10,))[10][-1]
+                assert analyzer.max_profit() == max_profit(window)
+    
+    def test_volatility_matches_batch_after_every_update(self):
+        data = make_data(300, seed=5)
+        analyzer = StreamingAnalyzer(sma_windows=(10,))
+        closing_prices = data['Close'].tolist()
+        
+        for i, (date, close) in enumerate(zip(data.index, closing_prices)):
+            analyzer.update(close, date)
+            assert analyzer.volatility() == analyze_volatility(daily_returns(closing_prices[:i + 1]))
+    
+    def test_volatility_is_one_pass_away_from_boundaries(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(streaming, 'analyze_volatility', lambda returns: calls.append(returns))
+        analyzer = StreamingAnalyzer.from_history(make_data(300, seed=5), sma_windows=(10,))
+
+        analyzer.volatility()
+
+        assert calls == []
+
+    def test_volatility_tie_uses_two_pass_result(self, monkeypatch):
+        calls = []
+        two_pass = streaming.analyze_volatility
+        monkeypatch.setattr(streaming, 'analyze_volatility', lambda returns: calls.append(returns) or two_pass(returns))
+        analyzer = StreamingAnalyzer(sma_windows=(2,))
+
+        # Returns of 0.12 and 0.13 average to the 0.125 tie
+        for close in (100.0, 100.12, 100.250156):
+            analyzer.update(close)
+
+        result = analyzer.volatility()
+
+        assert len(calls) == 1
+        assert calls[0].tolist() == [0.12, 0.13]
+        assert result == analyze_volatility([None, 0.12, 0.13])
+        assert result['avg_daily_return'] == 0.12
+
+    def test_update_returns_rounded_daily_return(self):
+        analyzer = StreamingAnalyzer(sma_windows=(2,))
+        
+        assert analyzer.update(100, '2024-01-01') is None
+        assert analyzer.update(110, '2024-01-02') == 10.0
+        assert analyzer.update(105, '2024-01-03') == -4.55
+        assert analyzer.sma()[2] == 107.5
+    
+    def test_incomplete_windows_are_nan(self):
+        analyzer = StreamingAnalyzer(sma_windows=(3,))
+        analyzer.update(100, '2024-01-01')
+        
+        assert np.isnan(analyzer.sma()[3])
+        assert analyzer.volatility() is None
+        assert analyzer.results()['run_stats'] is None
+    
+    def test_no_profit_raises_error(self):
+        analyzer = StreamingAnalyzer(sma_windows=(2,))
+        for day, close in enumerate([100.0, 90.0, 80.0]):
+            analyzer.update(close, f'2024-01-0{day + 1}')
+        
+        with pytest.raises(ValueError, match="No profit opportunity"):
+            analyzer.max_profit()
+        assert analyzer.results()['max_profit'] is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,156 @@
+import pytest
+import numpy as np
+import pandas as pd
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.universe import (
+    close_matrix, batch_daily_returns, batch_sma, batch_volatility, batch_run_stats,
+    batch_max_profit, screen_universe, rank_universe
+)
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.daily_returns import daily_returns
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.simple_moving_average import sma_array
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.volatility import analyze_volatility
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.up_down_runs import (
+    direction_codes, calculate_run_arrays, analyze_run_arrays
+)
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.max_profit import max_profit_indices
+
+
+def make_universe(rows=12, days=300, seed=11):
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (rows, days)), axis=1))
+    closes = np.round(closes, 1)
+    # Late listings and gaps
+    closes[1, :40] = np.nan
+    closes[2, 100:103] = np.nan
+    closes[3, -5:] = np.nan
+    # Only falling prices, no profitable trade
+    closes[4] = np.linspace(200, 100, days)
+    return closes
+
+
+class TestBatchFunctions:
+    closes = make_universe()
+
+    def test_daily_returns_match(self):
+        returns = batch_daily_returns(self.closes)
+        for row in range(len(self.closes)):
+            expected = np.array(daily_returns(self.closes[row].tolist()), dtype=np.float64)
+            assert np.array_equal(returns[row], expected, equal_nan=True)
+
+    def test_sma_matches(self):
+        sma = batch_sma(self.closes, 20)
+        for row in range(len(self.closes)):
+            assert np.array_equal(sma[row], sma_array(self.closes[row], 20), equal_nan=True)
+
+    def test_sma_window_longer_than_data(self):
+        assert np.isnan(batch_sma(self.closes[:, :10], 20)).all()
+        with pytest.raises(ValueError):
+            batch_sma(self.closes, 0)
+
+    def test_volatility_matches(self):
+        returns = batch_daily_returns(self.closes)
+        result = batch_volatility(returns)
+        for row in range(len(self.closes)):
+            expected = analyze_volatility(daily_returns(self.closes[row].tolist()))
+            for key, value in expected.items():
+                if key == 'volatility_level':
+                    assert result[key][row] == value
+                else:
+                    assert result[key][row] == value
+
+    def test_volatility_without_returns(self):
+        result = batch_volatility(np.full((2, 5), np.nan))
+        assert np.isnan(result['daily_volatility']).all()
+        assert result['volatility_level'].tolist() == [None, None]
+
+    def test_run_stats_match(self):
+        returns = batch_daily_returns(self.closes)
+        result = batch_run_stats(returns)
+        for row in range(len(self.closes)):
+            expected = analyze_run_arrays(*calculate_run_arrays(direction_codes(returns[row]))[:2])
+            assert {key: result[key][row] for key in expected} == expected
+
+    def test_run_stats_average_rounds_like_python(self):
+        # 20 up runs of 23 days in all: 1.15 is stored as 1.1499..., which round() takes down
+        lengths = [2] * 3 + [1] * 17
+        row = np.concatenate([[1.0] * length + [-1.0] for length in lengths])
+        returns = np.concatenate(([np.nan], row))[None, :]
+
+        result = batch_run_stats(returns)
+
+        expected = analyze_run_arrays(*calculate_run_arrays(direction_codes(returns[0]))[:2])
+        assert expected['avg_upward_run'] == 1.1
+        assert result['avg_upward_run'][0] == 1.1
+
+    def test_run_stats_empty_row(self):
+        returns = batch_daily_returns(self.closes)
+        returns[0] = np.nan
+        result = batch_run_stats(returns)
+        assert result['current_run'][0] == 0
+        assert result['current_run_type'][0] is None
+        assert result['current_run_type'][1] is not None
+
+    def test_max_profit_matches(self):
+        result = batch_max_profit(self.closes)
+        for row in range(len(self.closes)):
+            buy, sell, profit = max_profit_indices(self.closes[row])
+            assert result['buy_index'][row] == (-1 if buy is None else buy)
+            assert result['sell_index'][row] == (-1 if sell is None else sell)
+            assert result['max_profit'][row] == pytest.approx(profit)
+
+    def test_max_profit_ties(self):
+        closes = np.array([[5.0, 1.0, 3.0, 1.0, 3.0]])
+        result = batch_max_profit(closes)
+        assert result['buy_index'][0] == 1
+        assert result['sell_index'][0] == 2
+
+
+class TestScreen:
+    def test_close_matrix_alignment(self):
+        first = pd.DataFrame({'Close': [1.0, 2.0, 3.0]}, index=pd.date_range("2024-01-01", periods=3))
+        second = pd.DataFrame({'Close': [5.0, 6.0]}, index=pd.date_range("2024-01-02", periods=2))
+        tickers, dates, closes = close_matrix({'AAA': first, 'BBB': second})
+
+        assert tickers == ['AAA', 'BBB']
+        assert len(dates) == 3
+        assert np.isnan(closes[1, 0])
+        assert closes[1, 1:].tolist() == [5.0, 6.0]
+
+    def test_screen_and_rank(self):
+        closes = make_universe()
+        tickers = [f"T{row}" for row in range(len(closes))]
+        dates = pd.date_range("2020-01-01", periods=closes.shape[1])
+        table = screen_universe(closes, tickers, dates)
+
+        assert list(table.index) == tickers
+        assert table.loc['T3', 'last_close'] == closes[3, -6]
+        assert table.loc['T4', 'max_profit'] == 0
+        assert pd.isna(table.loc['T4', 'buy_date'])
+
+        ranked = rank_universe(table, 'annualized_volatility', top=5)
+        assert len(ranked) == 5
+        assert ranked['rank'].tolist() == [1, 2, 3, 4, 5]
+        assert ranked['annualized_volatility'].is_monotonic_decreasing
+
+        longest_up = rank_universe(table, 'current_up_run', top=1)
+        assert longest_up['current_up_run'].iloc[0] == table['current_up_run'].max()
+
+    def test_screen_rounds_like_single_ticker_functions(self):
+        # 135.475 is a tie that np.round takes up and round() takes down
+        closes = np.array([[133.0, 135.475, 135.475], [100.0, 101.5, 102.675]])
+        table = screen_universe(closes, ['AAA', 'BBB'], sma_windows=(2,))
+
+        assert table.loc['AAA', 'last_close'] == 135.47
+        for row, ticker in enumerate(['AAA', 'BBB']):
+            assert table.loc[ticker, 'last_close'] == round(float(closes[row, -1]), 2)
+            assert table.loc[ticker, 'sma_2'] == round(float(sma_array(closes[row], 2)[-1]), 2)
+            assert table.loc[ticker, 'max_profit'] == round(float(max_profit_indices(closes[row])[2]), 2)
+
+    def test_rank_unknown_column(self):
+        closes = make_universe()
+        table = screen_universe(closes, [f"T{row}" for row in range(len(closes))])
+        with pytest.raises(ValueError):
+            rank_universe(table, 'nonexistent')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
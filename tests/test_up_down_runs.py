@@ -1,7 +1,11 @@
 import pytest
 import pandas as pd
 import numpy as np
-from INF1002_Stock_Market_Trend_Analysis.src.analysis.up_down_runs import calculate_directions, calculate_runs, analyze_runs
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.up_down_runs import (
+    calculate_directions, calculate_runs, analyze_runs,
+    direction_codes, calculate_run_arrays, analyze_run_arrays, run_tuples,
+    as_run_arrays
+)
 
 class TestCalculateDirections:
     def test_mixed_price_changes(self):
@@ -104,6 +108,50 @@ class TestAnalyzeRuns:
         with pytest.raises(ValueError, match="No run data provided"):
             analyze_runs([])
 
+
+
+class TestRunArrays:
+    def test_direction_codes_drop_missing(self):
+        result = direction_codes([None, 1.5, np.nan, -2.0, 0, 2.5])
+        
+        assert result.dtype == np.int8
+        assert result.tolist() == [1, -1, 0, 1]
+    
+    def test_run_arrays(self):
+        codes = np.array([1, 1, -1, -1, -1, 0, 1], dtype=np.int8)
+        run_directions, run_lengths, run_starts = calculate_run_arrays(codes)
+        
+        assert run_directions.tolist() == [1, -1, 0, 1]
+        assert run_lengths.tolist() == [2, 3, 1, 1]
+        assert run_starts.tolist() == [0, 2, 5, 6]
+    
+    def test_matches_tuple_version(self):
+        returns = np.round(np.random.default_rng(1).normal(0, 1, 500), 0)
+        expected_runs = calculate_runs(calculate_directions(returns.tolist()))
+        
+        run_directions, run_lengths, _ = calculate_run_arrays(direction_codes(returns))
+        
+        assert run_tuples(run_directions, run_lengths) == expected_runs
+        assert analyze_run_arrays(run_directions, run_lengths) == analyze_runs(expected_runs)
+    
+    def test_empty_input_raises_error(self):
+        with pytest.raises(ValueError):
+            direction_codes([])
+        with pytest.raises(ValueError):
+            calculate_run_arrays(np.array([], dtype=np.int8))
+        with pytest.raises(ValueError, match="No run data provided"):
+            analyze_run_arrays(np.array([]), np.array([]))
+    
+    def test_as_run_arrays_from_tuples(self):
+        codes = np.array([1, 1, -1, -1, -1, 0, 1], dtype=np.int8)
+        arrays = calculate_run_arrays(codes)
+        
+        converted = as_run_arrays(run_tuples(*arrays[:2]))
+        
+        for expected, result in zip(arrays, converted):
+            assert result.tolist() == expected.tolist()
+        assert as_run_arrays(arrays) is arrays
+
         
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
\ No newline at end of file
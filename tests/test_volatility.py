@@ -1,5 +1,9 @@
 import pytest
-from INF1002_Stock_Market_Trend_Analysis.src.analysis.volatility import analyze_volatility, categorize_volatility
+import numpy as np
+import pandas as pd
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.volatility import (
+    analyze_volatility, categorize_volatility, rolling_volatility, ewma_volatility, volatility_series
+)
 
 class TestVolatilityAnalysis:
     def test_empty_returns_list(self):
@@ -31,5 +35,51 @@ class TestVolatilityAnalysis:
         assert result['avg_daily_return'] < 0
         assert result['max_loss'] == -2.0
 
+
+class TestVolatilitySeries:
+    def test_rolling_matches_analyze_volatility(self):
+        returns = list(np.random.default_rng(0).normal(0, 1.5, 100))
+        result = rolling_volatility(returns, 20)
+        
+        assert np.isnan(result[:19]).all()
+        for end in (20, 57, 100):
+            expected = analyze_volatility(returns[end - 20:end])['annualized_volatility']
+            assert round(result[end - 1], 1) == expected
+    
+    def test_rolling_matches_pandas(self):
+        returns = np.random.default_rng(1).normal(0, 2, 500)
+        result = rolling_volatility(returns, 60)
+        expected = pd.Series(returns).rolling(60).std(ddof=0).to_numpy() * np.sqrt(252)
+        
+        np.testing.assert_allclose(result, expected, rtol=1e-8, equal_nan=True)
+    
+    def test_rolling_window_with_missing_is_nan(self):
+        result = rolling_volatility([None, 1.0, 2.0, 3.0], 2)
+        
+        assert np.isnan(result[:2]).all()
+        assert result[2] == pytest.approx(0.5 * np.sqrt(252))
+    
+    def test_ewma_recursion(self):
+        returns = [1.0, -2.0, 0.5]
+        result = ewma_volatility(returns, decay=0.9)
+        
+        variance = 1.0
+        expected = [variance]
+        for r in returns[1:]:
+            variance = 0.9 * variance + 0.1 * r ** 2
+            expected.append(variance)
+        np.testing.assert_allclose(result, np.sqrt(expected) * np.sqrt(252))
+    
+    def test_invalid_parameters_raise_error(self):
+        with pytest.raises(ValueError):
+            rolling_volatility([1.0, 2.0], 0)
+        with pytest.raises(ValueError):
+            ewma_volatility([1.0, 2.0], decay=1.5)
+    
+    def test_series_skips_windows_longer_than_data(self):
+        result = volatility_series([None] + [1.0] * 30, windows=(20, 60))
+        
+        assert set(result) == {'20d', 'EWMA (0.94)'}
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
\ No newline at end of file
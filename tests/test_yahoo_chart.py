@@ -0,0 +1,153 @@
+import asyncio
+import gzip
+import pandas as pd
+import pytest
+import yfinance
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.price_cache import yfinance_fetch
+from INF1002_Stock_Market_Trend_Analysis.src.analysis.yahoo_chart import (fetch_chart, chart_url, parse_chart,
+                                                                          _read_response)
+from INF1002_Stock_Market_Trend_Analysis.tests.conftest import chart_payload
+
+
+def read(raw):
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await _read_response(reader)
+    return asyncio.run(run())
+
+
+class TestParseChart:
+    def test_bars_dated_by_session_in_exchange_timezone(self):
+        data = parse_chart(chart_payload("TEST", days=30))
+
+        assert len(data) == 30
+        assert str(data.index.tz) == "America/New_York"
+        assert (data.index == data.index.normalize()).all()
+        assert data.index[-1] <= pd.Timestamp.now(tz="America/New_York")
+
+    def test_prices_adjusted_and_events(self):
+        payload = chart_payload("TEST", days=30)
+        result = payload["chart"]["result"][0]
+        result["indicators"]["adjclose"][0]["adjclose"] = [price / 2 for price in result["indicators"]["quote"][0]["close"]]
+
+        data = parse_chart(payload)
+
+        assert data["Close"].iloc[0] == pytest.approx(result["indicators"]["quote"][0]["close"][0] / 2)
+        assert data["Open"].iloc[0] == pytest.approx(result["indicators"]["quote"][0]["open"][0] / 2)
+        assert data["Dividends"].iloc[-20] == 0.5
+        assert data["Dividends"].sum() == 0.5
+        assert (data["Stock Splits"] == 0).all()
+
+    def test_missing_values_and_empty_results(self):
+        payload = chart_payload("TEST", days=25)
+        payload["chart"]["result"][0]["indicators"]["quote"][0]["close"][2] = None
+        del payload["chart"]["result"][0]["indicators"]["adjclose"]
+
+        assert pd.isna(parse_chart(payload)["Close"].iloc[2])
+        assert parse_chart({"chart": {"result": None, "error": {"code": "Not Found"}}}).empty
+
+
+class FakeResponse:
+    # The part of a requests response yfinance reads
+    def __init__(self, payload):
+        self.payload = payload
+        self.status_code = 200
+        self.text = ""
+
+    def json(self):
+        return self.payload
+
+
+class NoTimezoneCache:
+    def lookup(self, ticker):
+        return None
+
+    def store(self, ticker, tz):
+        pass
+
+
+@pytest.fixture
+def yfinance_payload(monkeypatch):
+    """
+    Serve one chart payload to yfinance in place of its HTTP requests, so its
+    parsing can be compared with parse_chart offline.
+    """
+    payload = chart_payload("TEST", days=60)
+    result = payload["chart"]["result"][0]
+    result["meta"].update({"currency": "USD", "instrumentType": "EQUITY", "dataGranularity": "1d",
+                           "validRanges": ["1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y", "ytd", "max"]})
+
+    # A dividend adjustment before day 40, a 2:1 split on day 30 and a bar without data
+    quote = result["indicators"]["quote"][0]
+    result["indicators"]["adjclose"][0]["adjclose"] = [price * (0.99 if day < 40 else 1.0)
+                                                       for day, price in enumerate(quote["close"])]
+    day = result["timestamp"][30]
+    result["events"]["splits"] = {str(day): {"date": day, "numerator": 2, "denominator": 1, "splitRatio": "2:1"}}
+    for field in ("open", "high", "low", "close", "volume"):
+        quote[field][10] = None
+    result["indicators"]["adjclose"][0]["adjclose"][10] = None
+
+    serve = lambda self, url, params=None, **kwargs: FakeResponse(payload)
+    monkeypatch.setattr(yfinance.data.YfData, "get", serve)
+    monkeypatch.setattr(yfinance.data.YfData, "cache_get", serve)
+    monkeypatch.setattr(yfinance.cache, "get_tz_cache", NoTimezoneCache)
+    return payload
+
+
+class TestMatchesYfinance:
+    def test_parse_chart_matches_yfinance_fetch(self, yfinance_payload):
+        # Both write into the same price cache, so they must agree bar for bar
+        expected = yfinance_fetch("TEST", period="max")
+
+        data = parse_chart(yfinance_payload)
+
+        assert len(data) == 59
+        pd.testing.assert_frame_equal(data, expected[data.columns], check_freq=False)
+
+
+class TestChartUrl:
+    def test_period_and_range(self):
+        assert "range=1y" in chart_url("AAPL", period="1y", base_url="http://x/")
+        url = chart_url("BRK.B", start="2024-01-01", end="2024-02-01", base_url="http://x/")
+        assert url.startswith("http://x/BRK.B?")
+        assert "period1=1704067200" in url and "period2=1706745600" in url
+
+
+class TestReadResponse:
+    def test_content_length(self):
+        status, headers, body = read(b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nhello")
+        assert (status, headers['content-length'], body) == (200, '5', b"hello")
+
+    def test_chunked_gzip(self):
+        compressed = gzip.compress(b"hello world")
+        raw = (b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\nContent-Encoding: gzip\r\n\r\n"
+               + f"{len(compressed[:10]):x}\r\n".encode() + compressed[:10] + b"\r\n"
+               + f"{len(compressed[10:]):x}\r\n".encode() + compressed[10:] + b"\r\n0\r\n\r\n")
+        assert read(raw)[2] == b"hello world"
+
+    def test_malformed_status(self):
+        with pytest.raises(ConnectionError):
+            read(b"garbage\r\n\r\n")
+
+
+class TestFetchChart:
+    def test_fetch_from_stub(self, yahoo_stub):
+        data = asyncio.run(fetch_chart("AAPL", period="1y"))
+
+        assert len(data) == 300
+        assert yahoo_stub.requests[0][0] == "AAPL"
+        assert yahoo_stub.requests[0][1]["range"] == ["1y"]
+
+    def test_unknown_symbol_is_empty(self, yahoo_stub):
+        assert asyncio.run(fetch_chart("NONEXISTENT", period="1y")).empty
+
+    def test_timeout(self, yahoo_stub):
+        yahoo_stub.delay = 1.0
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(fetch_chart("AAPL", period="1y", timeout=0.1))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,95 @@
+import pytest
+import numpy as np
+import pandas as pd
+from INF1002_Stock_Market_Trend_Analysis.src.visualization.zoom_pyramid import ZoomPyramid
+
+
+def make_series(n=1000):
+    dates = pd.date_range("2020-01-01", periods=n, freq="D")
+    closes = np.sin(np.arange(n) / 20.0) * 10 + 100
+    return dates, closes
+
+
+class TestZoomPyramid:
+
+    def test_levels_shrink_by_factor(self):
+        dates, closes = make_series(1000)
+        pyramid = ZoomPyramid(dates, closes, factor=4)
+        sizes = [len(level['time']) for level in pyramid.levels]
+        assert sizes[0] == 1000
+        assert sizes[1] == 250
+        assert all(later == -(-earlier // 4) for earlier, later in zip(sizes, sizes[1:]))
+        assert sizes[-1] <= 64
+
+    def test_buckets_keep_extremes_and_last_close(self):
+        dates, closes = make_series(1000)
+        pyramid = ZoomPyramid(dates, closes, factor=4)
+        level = pyramid.levels[1]
+        assert level['min'][0] == closes[:4].min()
+        assert level['max'][0] == closes[:4].max()
+        assert level['close'][0] == closes[3]
+        assert level['time'][1] == dates[4].value
+
+    def test_overall_extremes_preserved(self):
+        dates, closes = make_series(1000)
+        pyramid = ZoomPyramid(dates, closes)
+        top = pyramid.levels[-1]
+        assert top['min'].min() == closes.min()
+        assert top['max'].max() == closes.max()
+
+    def test_full_range_uses_coarse_level(self):
+        dates, closes = make_series(1000)
+        result = ZoomPyramid(dates, closes).query(budget=100)
+        assert result['level'] > 0
+        assert len(result['x']) <= 100
+
+    def test_narrow_range_uses_full_resolution(self):
+        dates, closes = make_series(1000)
+        result = ZoomPyramid(dates, closes).query("2020-03-01", "2020-03-31", budget=100)
+        assert result['level'] == 0
+        # One extra bar either side of the window
+        assert result['x'][0] == "2020-02-29"
+        assert result['x'][-1] == "2020-04-01"
+        assert result['close'][1] == pytest.approx(closes[dates.get_loc(pd.Timestamp("2020-03-01"))])
+
+    def test_timezone_aware_dates(self):
+        dates, closes = make_series(100)
+        result = ZoomPyramid(dates.tz_localize("America/New_York"), closes).query("2020-01-10", "2020-01-12")
+        assert result['x'] == ["2020-01-09", "2020-01-10", "2020-01-11", "2020-01-12", "2020-01-13"]
+
+    def test_locate_matches_query(self):
+        dates, closes = make_series(1000)
+        pyramid = ZoomPyramid(dates, closes)
+        number, first, last = pyramid.locate("2020-03-01", "2020-03-31", budget=100)
+
+        result = pyramid.query("2020-03-01", "2020-03-31", budget=100)
+        assert number == result['level']
+        assert last - first == len(result['x'])
+
+    def test_sample_returns_level_zero_positions_of_the_chosen_buckets(self):
+        dates, closes = make_series(1000)
+        pyramid = ZoomPyramid(dates, closes, factor=4)
+
+        first, last, positions = pyramid.sample(budget=300)
+
+        assert (first, last) == (0, 1000)
+        assert positions.tolist() == list(range(0, 1000, 4))
+
+    def test_sample_stays_within_window(self):
+        dates, closes = make_series(1000)
+        pyramid = ZoomPyramid(dates, closes)
+
+        first, last, positions = pyramid.sample("2020-03-01", "2020-03-31", budget=100,
+                                                since="2020-03-05", until="2020-03-20")
+
+        assert (first, last) == (64, 80)
+        assert positions.tolist() == list(range(64, 80))
+
+    def test_invalid_factor(self):
+        dates, closes = make_series(10)
+        with pytest.raises(ValueError):
+            ZoomPyramid(dates, closes, factor=1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])